@@ -5,6 +5,7 @@ from typing import List
 from datetime import date
 from database.database import Database
 from services.auto_scheduler import AutoScheduler
+from services.job_manager import job_manager
 
 router = APIRouter(prefix="/api/auto-schedule", tags=["Auto-Schedule"])
 
@@ -14,6 +15,7 @@ class AutoScheduleRequest(BaseModel):
     end_date: date
     shift_types: List[str]
     staff_per_shift: int = 2
+    bulk: bool = False
 
 @router.post("/generate")
 def generate_auto_schedule(
@@ -39,7 +41,8 @@ def generate_auto_schedule(
             start_date=request.start_date,
             end_date=request.end_date,
             shift_types=request.shift_types,
-            staff_per_shift=request.staff_per_shift
+            staff_per_shift=request.staff_per_shift,
+            bulk=request.bulk
         )
         return result
     except ValueError as e:
@@ -47,6 +50,128 @@ def generate_auto_schedule(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Auto-schedule generation failed: {str(e)}")
 
+@router.post("/preview")
+def preview_auto_schedule(
+    request: AutoScheduleRequest,
+    db: Session = Depends(Database.get_session)
+):
+    """
+    Plan a schedule without writing it, returning the plan and fairness metrics.
+    
+    Args:
+        request: Auto-schedule parameters
+        db: Database session (injected)
+        
+    Returns:
+        Preview token, summary, fairness metrics and full plan
+        
+    Raises:
+        HTTPException: If planning fails
+    """
+    try:
+        service = AutoScheduler(db)
+        return service.preview_schedule(
+            start_date=request.start_date,
+            end_date=request.end_date,
+            shift_types=request.shift_types,
+            staff_per_shift=request.staff_per_shift
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/preview/{token}/commit")
+def commit_auto_schedule_preview(token: str, db: Session = Depends(Database.get_session)):
+    """
+    Write a previously previewed plan.
+    
+    Args:
+        token: Token returned by /preview
+        db: Database session (injected)
+        
+    Returns:
+        Summary of generated schedules and assignments
+        
+    Raises:
+        HTTPException: If the preview is unknown, expired, or stale
+    """
+    try:
+        service = AutoScheduler(db)
+        result = service.commit_plan(token)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if result is None:
+        raise HTTPException(status_code=404, detail="Preview not found or expired")
+    return result
+
+@router.post("/jobs", status_code=202)
+def submit_auto_schedule_job(request: AutoScheduleRequest):
+    """
+    Queue an automatic schedule generation and return immediately.
+    
+    The job always writes with bulk inserts; poll /jobs/{job_id} for progress.
+    
+    Args:
+        request: Auto-schedule parameters
+        
+    Returns:
+        Job ID and initial status
+        
+    Raises:
+        HTTPException: If too many jobs are pending
+    """
+    try:
+        job = job_manager.submit(
+            start_date=request.start_date,
+            end_date=request.end_date,
+            shift_types=request.shift_types,
+            staff_per_shift=request.staff_per_shift
+        )
+    except RuntimeError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    return job.to_dict()
+
+@router.get("/jobs/{job_id}")
+def get_auto_schedule_job(job_id: str):
+    """
+    Get status and progress of an auto-schedule job.
+    
+    Args:
+        job_id: Job ID
+        
+    Returns:
+        Job status with schedules written / total
+        
+    Raises:
+        HTTPException: If job not found
+    """
+    job = job_manager.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job.to_dict()
+
+@router.get("/jobs/{job_id}/result")
+def get_auto_schedule_job_result(job_id: str):
+    """
+    Get the generation summary of a finished auto-schedule job.
+    
+    Args:
+        job_id: Job ID
+        
+    Returns:
+        Summary of generated schedules and assignments
+        
+    Raises:
+        HTTPException: If job not found, still running, or failed
+    """
+    job = job_manager.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    if job.status == 'failed':
+        raise HTTPException(status_code=400, detail=job.error)
+    if job.status != 'completed':
+        raise HTTPException(status_code=409, detail=f"Job {job_id} is {job.status}")
+    return job.result
+
 @router.get("/recommendations")
 def get_recommendations(
     days: int,
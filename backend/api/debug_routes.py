@@ -0,0 +1,15 @@
+from fastapi import APIRouter
+from monitoring.sql_profiler import sql_profiler
+
+router = APIRouter(prefix="/debug", tags=["Debug"])
+
+@router.get("/sql")
+def get_sql_summary():
+    """
+    Get SQL statistics of the most recent requests.
+    
+    Returns:
+        Per-route query counts and database time, most expensive and
+        slowest statements, and repeated-statement (N+1) patterns
+    """
+    return sql_profiler.summary()
@@ -0,0 +1,101 @@
+"""
+Conditional GET support for read endpoints.
+ETags are derived from the change versions of the tables a response
+depends on, so a matching If-None-Match is answered with 304 before any
+service query runs.
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Optional, Tuple
+from fastapi import Depends, HTTPException, Request, Response
+from sqlalchemy.orm import Session
+from database.database import Database
+from services.change_tracker import ChangeTracker
+
+def conditional_get(*tables: str) -> Callable:
+    """
+    Build a route dependency that answers conditional GET requests.
+    
+    Args:
+        tables: Tracked tables the route's response depends on
+    
+    Returns:
+        Dependency returning the response ETag
+    
+    Raises:
+        HTTPException: 304 if the client's copy is still current
+    """
+    def dependency(request: Request, response: Response, db: Session = Depends(Database.get_session)) -> str:
+        versions = ChangeTracker(db).version(*tables)
+        etag = make_etag(request, versions)
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            raise HTTPException(status_code=304, headers=headers)
+        
+        response.headers.update(headers)
+        return etag
+    
+    return dependency
+
+def make_etag(request: Request, versions: Tuple[int, ...]) -> str:
+    """
+    Build a weak ETag for a request URL at the given data versions.
+    
+    Args:
+        request: Incoming request (path and query string select the representation)
+        versions: Change versions of the tables the response depends on
+    
+    Returns:
+        Weak ETag header value
+    """
+    key = f"{request.url.path}?{request.url.query}|{','.join(map(str, versions))}"
+    return f'W/"{hashlib.sha1(key.encode()).hexdigest()[:20]}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag (weak comparison).
+    
+    Args:
+        if_none_match: Header value, may list several ETags or be "*"
+        etag: Current ETag
+    
+    Returns:
+        True if the client's copy is current
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    
+    current = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == current:
+            return True
+    return False
+
+def not_modified_since(if_modified_since: Optional[str], last_modified: datetime) -> bool:
+    """
+    Check an If-Modified-Since header against a modification time.
+    
+    Args:
+        if_modified_since: Header value (HTTP date)
+        last_modified: Naive UTC modification time of the resource
+    
+    Returns:
+        True if the client's copy is current; malformed dates never match
+    """
+    if not if_modified_since:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    # HTTP dates have whole-second precision
+    return last_modified.replace(microsecond=0, tzinfo=timezone.utc) <= since
@@ -1,14 +1,21 @@
-from fastapi import APIRouter, Depends, Query, HTTPException
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import Optional
-from datetime import date
-from database.database import Database
+from typing import IO, Callable, Iterator, Optional
+from datetime import date, datetime
+from database.database import Database, SessionLocal
 from services.export_service import ExportService
+from services.export_cache import CachedExportService
+from monitoring.metrics import export_duration, export_rows
 import os
+import time
 
 router = APIRouter(prefix="/api/export", tags=["Export"])
 
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+PARQUET_MEDIA_TYPE = "application/vnd.apache.parquet"
+CHUNK_SIZE = 64 * 1024
+
 @router.get("/excel")
 def export_to_excel(
     start_date: Optional[date] = Query(None),
@@ -22,18 +29,151 @@ def export_to_excel(
         start_date: Start date filter (optional)
         end_date: End date filter (optional)
         db: Database session (injected)
-        
+    
     Returns:
         Excel file download
     """
-    service = ExportService(db)
-    filepath = service.export_to_excel(start_date=start_date, end_date=end_date)
+    service = CachedExportService(db)
+    output = service.export_to_excel(start_date=start_date, end_date=end_date)
+    
+    return _file_response(output, "xlsx", XLSX_MEDIA_TYPE)
+
+@router.get("/csv")
+def export_to_csv(
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None)
+):
+    """
+    Stream raw schedule rows as CSV.
     
-    if not os.path.exists(filepath):
-        raise HTTPException(status_code=500, detail="Failed to generate Excel file")
+    Args:
+        start_date: Start date filter (optional)
+        end_date: End date filter (optional)
     
-    return FileResponse(
-        path=filepath,
-        filename=os.path.basename(filepath),
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    Returns:
+        CSV download, one row per assignment
+    """
+    return StreamingResponse(
+        _stream_export("csv", lambda service: service.export_to_csv(start_date=start_date, end_date=end_date)),
+        media_type="text/csv; charset=utf-8",
+        headers={"Content-Disposition": f'attachment; filename="{_export_filename("csv")}"'}
     )
+
+@router.get("/ndjson")
+def export_to_ndjson(
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None)
+):
+    """
+    Stream raw schedule rows as newline-delimited JSON.
+    
+    Args:
+        start_date: Start date filter (optional)
+        end_date: End date filter (optional)
+    
+    Returns:
+        NDJSON download, one object per assignment
+    """
+    return StreamingResponse(
+        _stream_export("ndjson", lambda service: service.export_to_ndjson(start_date=start_date, end_date=end_date)),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{_export_filename("ndjson")}"'}
+    )
+
+@router.get("/parquet")
+def export_to_parquet(
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    db: Session = Depends(Database.get_session)
+):
+    """
+    Export raw schedule rows to a Parquet file.
+    
+    Args:
+        start_date: Start date filter (optional)
+        end_date: End date filter (optional)
+        db: Database session (injected)
+    
+    Returns:
+        Parquet file download
+    """
+    service = CachedExportService(db)
+    output = service.export_to_parquet(start_date=start_date, end_date=end_date)
+    return _file_response(output, "parquet", PARQUET_MEDIA_TYPE)
+
+@router.get("/roster")
+def export_roster(
+    start_date: date = Query(...),
+    end_date: date = Query(...),
+    db: Session = Depends(Database.get_session)
+):
+    """
+    Export a staff x date roster matrix to Excel.
+    
+    Args:
+        start_date: First roster day
+        end_date: Last roster day
+        db: Database session (injected)
+    
+    Returns:
+        Excel file download
+    
+    Raises:
+        HTTPException: If the date range is invalid
+    """
+    try:
+        service = CachedExportService(db)
+        output = service.export_roster(start_date=start_date, end_date=end_date)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return _file_response(output, "xlsx", XLSX_MEDIA_TYPE, prefix="schedule_roster")
+
+def _export_filename(extension: str, prefix: str = "schedule_export") -> str:
+    """Build a timestamped download filename."""
+    return f"{prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}"
+
+def _file_response(file: IO[bytes], extension: str, media_type: str, prefix: str = "schedule_export") -> StreamingResponse:
+    """Stream a generated export file as a download."""
+    return StreamingResponse(
+        _iter_file(file),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="{_export_filename(extension, prefix)}"',
+            "Content-Length": str(_file_size(file))
+        }
+    )
+
+def _stream_export(export_format: str, render: Callable[[ExportService], Iterator[str]]) -> Iterator[str]:
+    """
+    Yield a text export produced by an ExportService method.
+    
+    Uses its own session because the response body is produced after the
+    request's dependencies have finished.
+    """
+    started = time.perf_counter()
+    db = SessionLocal()
+    service = ExportService(db)
+    try:
+        yield from render(service)
+    finally:
+        db.close()
+        export_duration.observe(time.perf_counter() - started, export_format, 'stream')
+        export_rows.inc(export_format, amount=service.rows_exported)
+
+def _file_size(file: IO[bytes]) -> int:
+    """Get the size of a seekable file without moving its position."""
+    position = file.tell()
+    size = file.seek(0, os.SEEK_END)
+    file.seek(position)
+    return size
+
+def _iter_file(file: IO[bytes]) -> Iterator[bytes]:
+    """Yield a file in chunks and close (delete) it once sent."""
+    try:
+        while True:
+            chunk = file.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        file.close()
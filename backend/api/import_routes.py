@@ -0,0 +1,65 @@
+from fastapi import APIRouter, Body, Depends, File, HTTPException, UploadFile
+from sqlalchemy.orm import Session
+from typing import Any, List
+from database.database import Database
+from services.import_service import ImportService
+from services.staff_service import StaffService
+
+router = APIRouter(prefix="/api/import", tags=["Import"])
+
+@router.post("/excel")
+def import_from_excel(file: UploadFile = File(...), db: Session = Depends(Database.get_session)):
+    """
+    Import schedules from an Excel file in the export layout.
+    
+    Args:
+        file: Uploaded XLSX file
+        db: Database session (injected)
+    
+    Returns:
+        Import report with row counts and per-row errors
+    
+    Raises:
+        HTTPException: If the file cannot be read as a schedule sheet
+    """
+    try:
+        service = ImportService(db)
+        return service.import_excel(file.file)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/staff")
+def import_staff(records: List[Any] = Body(...), db: Session = Depends(Database.get_session)):
+    """
+    Add staff members from a JSON array of {name, age, position} objects.
+    
+    Args:
+        records: Staff records
+        db: Database session (injected)
+    
+    Returns:
+        Import report with the new ID of each row and per-row errors
+    """
+    service = StaffService(db)
+    return service.import_staff(records)
+
+@router.post("/staff/csv")
+def import_staff_from_csv(file: UploadFile = File(...), db: Session = Depends(Database.get_session)):
+    """
+    Add staff members from a CSV file with a name, age, position header.
+    
+    Args:
+        file: Uploaded CSV file
+        db: Database session (injected)
+    
+    Returns:
+        Import report with the new ID of each row and per-row errors
+    
+    Raises:
+        HTTPException: If the file is not UTF-8 or lacks a required column
+    """
+    try:
+        service = StaffService(db)
+        return service.import_staff_csv(file.file)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
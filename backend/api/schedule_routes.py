@@ -1,13 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List, Optional
-from datetime import date
-from database.database import Database
+from typing import Iterator, List, Optional, Tuple
+from datetime import date, timezone
+from email.utils import format_datetime
+import json
+from database.database import Database, SessionLocal
+from api.etag import conditional_get, etag_matches, not_modified_since
+from services.calendar_service import CalendarService
+from services.change_tracker import ChangeTracker
 from services.schedule_service import ScheduleService
-from schemas import ScheduleCreate, ScheduleResponse, AssignmentCreate, AssignmentResponse, AssignmentStatusUpdate
+from schemas import ScheduleCreate, ScheduleResponse, AssignmentCreate, BulkAssignmentCreate, AssignmentResponse, AssignmentStatusUpdate, BulkAssignmentStatusUpdate
 
 router = APIRouter(prefix="/api/schedules", tags=["Schedules"])
 
+# Schedule responses embed assignments and staff names
+schedule_etag = conditional_get(ChangeTracker.SCHEDULE, ChangeTracker.ASSIGNMENT, ChangeTracker.STAFF)
+assignment_etag = conditional_get(ChangeTracker.ASSIGNMENT, ChangeTracker.STAFF)
+
 @router.post("/", response_model=ScheduleResponse, status_code=201)
 def create_schedule(schedule_data: ScheduleCreate, db: Session = Depends(Database.get_session)):
     """
@@ -16,7 +26,7 @@ def create_schedule(schedule_data: ScheduleCreate, db: Session = Depends(Databas
     Args:
         schedule_data: Schedule creation data
         db: Database session (injected)
-        
+    
     Returns:
         Created schedule
     """
@@ -30,54 +40,98 @@ def create_schedule(schedule_data: ScheduleCreate, db: Session = Depends(Databas
 
 @router.get("/", response_model=List[ScheduleResponse])
 def get_schedules(
+    response: Response,
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = Query(None),
+    stream: bool = Query(False),
+    etag: str = Depends(schedule_etag),
     db: Session = Depends(Database.get_session)
 ):
     """
     Get schedules within a date range.
     
+    Passing `limit` or `cursor` returns a single keyset-paginated page; the
+    cursor for the next page is sent in the X-Next-Cursor header. Passing
+    `stream=true` streams all matching schedules as newline-delimited JSON.
+    A request whose If-None-Match is still current gets 304 without
+    querying schedules.
+    
     Args:
+        response: Outgoing response (for pagination headers)
         start_date: Start date filter
         end_date: End date filter
+        limit: Page size
+        cursor: Cursor returned by the previous page
+        stream: Stream results as NDJSON
+        etag: Response ETag (injected)
         db: Database session (injected)
-        
+    
     Returns:
         List of schedules
+    
+    Raises:
+        HTTPException: If the cursor is malformed
     """
+    after = _decode_cursor(cursor) if cursor else None
+    
+    if stream:
+        return StreamingResponse(
+            _stream_schedules(start_date, end_date, after),
+            media_type="application/x-ndjson",
+            headers={"ETag": etag, "Cache-Control": "no-cache"}
+        )
+    
     service = ScheduleService(db)
-    schedules = service.get_schedules(start_date=start_date, end_date=end_date)
-    
-    # Explicitly build response with assignments
-    result = []
-    for s in schedules:
-        schedule_dict = {
-            'id': s.id,
-            'schedule_date': s.schedule_date.isoformat() if s.schedule_date else None,
-            'shift_type': s.shift_type,
-            'created_at': s.created_at.isoformat() if s.created_at else None,
-            'created_by': s.created_by,
-            'assignments_count': len(s.get_assignments()),
-            'assignments': [
-                {
-                    'id': a.id,
-                    'staff_id': a.staff_id,
-                    'staff': {
-                        'id': a.staff.id,
-                        'name': a.staff.name,
-                        'position': a.staff.position
-                    } if a.staff else None,
-                    'status': a.status,
-                    'notes': a.notes
-                }
-                for a in s.get_assignments()
-            ]
-        }
-        result.append(schedule_dict)
-    
-    return result
+    if limit is None and after is None:
+        return service.get_schedules_with_assignments(start_date=start_date, end_date=end_date)
+    
+    page, next_key = service.get_schedules_page(
+        start_date=start_date,
+        end_date=end_date,
+        after=after,
+        limit=limit or DEFAULT_PAGE_SIZE
+    )
+    if next_key:
+        response.headers["X-Next-Cursor"] = _encode_cursor(next_key)
+    return page
+
+DEFAULT_PAGE_SIZE = 100
+
+def _encode_cursor(key: Tuple[date, int]) -> str:
+    """Encode a (schedule_date, id) keyset position as a cursor string."""
+    return f"{key[0].isoformat()}_{key[1]}"
+
+def _decode_cursor(cursor: str) -> Tuple[date, int]:
+    """
+    Decode a cursor string into a (schedule_date, id) keyset position.
+    
+    Raises:
+        HTTPException: If the cursor is malformed
+    """
+    try:
+        schedule_date, schedule_id = cursor.split("_", 1)
+        return date.fromisoformat(schedule_date), int(schedule_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid cursor: {cursor}")
+
+def _stream_schedules(start_date: Optional[date], end_date: Optional[date], after: Optional[Tuple[date, int]]) -> Iterator[str]:
+    """
+    Yield schedules as NDJSON, one chunk of lines per keyset page.
+    
+    Uses its own session because the response body is produced after the
+    request's dependencies have finished.
+    """
+    db = SessionLocal()
+    try:
+        service = ScheduleService(db)
+        for page in service.iter_schedules(start_date=start_date, end_date=end_date, after=after):
+            yield "".join(json.dumps(item, ensure_ascii=False) + "\n" for item in page)
+    finally:
+        db.close()
 
-@router.get("/{schedule_id}")
+@router.get("/{schedule_id}", dependencies=[Depends(schedule_etag)])
 def get_schedule_details(schedule_id: int, db: Session = Depends(Database.get_session)):
     """
     Get schedule with assignments.
@@ -85,10 +139,10 @@ def get_schedule_details(schedule_id: int, db: Session = Depends(Database.get_se
     Args:
         schedule_id: Schedule ID
         db: Database session (injected)
-        
+    
     Returns:
         Schedule with assignments
-        
+    
     Raises:
         HTTPException: If schedule not found
     """
@@ -106,10 +160,10 @@ def assign_staff_to_schedule(assignment_data: AssignmentCreate, db: Session = De
     Args:
         assignment_data: Assignment data
         db: Database session (injected)
-        
+    
     Returns:
         List of created assignments
-        
+    
     Raises:
         HTTPException: If validation fails
     """
@@ -124,7 +178,32 @@ def assign_staff_to_schedule(assignment_data: AssignmentCreate, db: Session = De
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-@router.get("/staff/{staff_id}/schedule", response_model=List[AssignmentResponse])
+@router.post("/assign/bulk", response_model=List[AssignmentResponse], status_code=201)
+def bulk_assign_staff(bulk_data: BulkAssignmentCreate, db: Session = Depends(Database.get_session)):
+    """
+    Assign staff to many schedules in one transaction.
+    
+    Args:
+        bulk_data: Schedule / staff pairs to assign
+        db: Database session (injected)
+    
+    Returns:
+        List of created assignments
+    
+    Raises:
+        HTTPException: If any schedule or staff member is invalid (nothing is written)
+    """
+    try:
+        service = ScheduleService(db)
+        assignments = service.bulk_assign_staff([
+            (item.schedule_id, item.staff_ids, item.notes)
+            for item in bulk_data.assignments
+        ])
+        return [a.to_dict() for a in assignments]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/staff/{staff_id}/schedule", response_model=List[AssignmentResponse], dependencies=[Depends(assignment_etag)])
 def get_staff_schedule(
     staff_id: int,
     start_date: Optional[date] = Query(None),
@@ -139,7 +218,7 @@ def get_staff_schedule(
         start_date: Start date filter
         end_date: End date filter
         db: Database session (injected)
-        
+    
     Returns:
         List of assignments for the staff
     """
@@ -147,6 +226,48 @@ def get_staff_schedule(
     assignments = service.get_staff_schedule(staff_id=staff_id, start_date=start_date, end_date=end_date)
     return [a.to_dict() for a in assignments]
 
+@router.get("/staff/{staff_id}/calendar.ics", response_class=Response)
+def get_staff_calendar(staff_id: int, request: Request, db: Session = Depends(Database.get_session)):
+    """
+    Get the duty calendar of a staff member as an iCalendar feed.
+    
+    Feeds are served from a per-staff cache; a client whose If-None-Match
+    (or, without one, If-Modified-Since) is still current gets 304.
+    
+    Args:
+        staff_id: Staff ID
+        request: Incoming request (for conditional headers)
+        db: Database session (injected)
+    
+    Returns:
+        text/calendar response
+    
+    Raises:
+        HTTPException: If the staff member is not found
+    """
+    feed = CalendarService(db).get_feed(staff_id)
+    if feed is None:
+        raise HTTPException(status_code=404, detail="Staff not found")
+    
+    headers = {
+        "ETag": feed.etag,
+        "Last-Modified": format_datetime(feed.last_modified.replace(tzinfo=timezone.utc), usegmt=True),
+        "Cache-Control": "no-cache"
+    }
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        not_modified = etag_matches(if_none_match, feed.etag)
+    else:
+        not_modified = not_modified_since(request.headers.get("if-modified-since"), feed.last_modified)
+    if not_modified:
+        return Response(status_code=304, headers=headers)
+    
+    return Response(
+        content=feed.body,
+        media_type="text/calendar; charset=utf-8",
+        headers={**headers, "Content-Disposition": f'inline; filename="staff_{staff_id}.ics"'}
+    )
+
 @router.patch("/assignment/{assignment_id}/status")
 def update_assignment_status(
     assignment_id: int,
@@ -160,10 +281,10 @@ def update_assignment_status(
         assignment_id: Assignment ID
         status_data: New status
         db: Database session (injected)
-        
+    
     Returns:
         Success message
-        
+    
     Raises:
         HTTPException: If assignment not found
     """
@@ -172,3 +293,37 @@ def update_assignment_status(
     if not success:
         raise HTTPException(status_code=404, detail=f"Assignment with ID {assignment_id} not found")
     return {"message": "Assignment status updated successfully"}
+
+@router.patch("/assignment/status")
+def bulk_update_assignment_status(
+    status_data: BulkAssignmentStatusUpdate,
+    db: Session = Depends(Database.get_session)
+):
+    """
+    Update the status of many assignments at once.
+    
+    Assignments are selected by ID list and/or filters (date range, shift
+    type, staff), combined with AND.
+    
+    Args:
+        status_data: New status and assignment filters
+        db: Database session (injected)
+    
+    Returns:
+        Number of updated assignments
+    
+    Raises:
+        HTTPException: If no filter is given
+    """
+    try:
+        service = ScheduleService(db)
+        return service.bulk_update_assignment_status(
+            status=status_data.status,
+            assignment_ids=status_data.assignment_ids,
+            start_date=status_data.start_date,
+            end_date=status_data.end_date,
+            shift_type=status_data.shift_type,
+            staff_id=status_data.staff_id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
\ No newline at end of file
@@ -2,11 +2,15 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from typing import List
 from database.database import Database
+from api.etag import conditional_get
+from services.change_tracker import ChangeTracker
 from services.staff_service import StaffService
 from schemas import StaffCreate, StaffResponse
 
 router = APIRouter(prefix="/api/staff", tags=["Staff"])
 
+staff_etag = conditional_get(ChangeTracker.STAFF)
+
 @router.post("/", response_model=StaffResponse, status_code=201)
 def create_staff(staff_data: StaffCreate, db: Session = Depends(Database.get_session)):
     """
@@ -33,7 +37,7 @@ def create_staff(staff_data: StaffCreate, db: Session = Depends(Database.get_ses
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-@router.get("/", response_model=List[StaffResponse])
+@router.get("/", response_model=List[StaffResponse], dependencies=[Depends(staff_etag)])
 def get_all_staff(include_inactive: bool = False, db: Session = Depends(Database.get_session)):
     """
     Get all staff members.
@@ -49,7 +53,7 @@ def get_all_staff(include_inactive: bool = False, db: Session = Depends(Database
     staff_list = service.get_all_staff(include_inactive=include_inactive)
     return staff_list
 
-@router.get("/{staff_id}", response_model=StaffResponse)
+@router.get("/{staff_id}", response_model=StaffResponse, dependencies=[Depends(staff_etag)])
 def get_staff(staff_id: int, db: Session = Depends(Database.get_session)):
     """
     Get staff by ID.
@@ -91,7 +95,7 @@ def delete_staff(staff_id: int, db: Session = Depends(Database.get_session)):
         raise HTTPException(status_code=404, detail=f"Staff with ID {staff_id} not found")
     return {"message": "Staff deleted successfully"}
 
-@router.get("/statistics/summary")
+@router.get("/statistics/summary", dependencies=[Depends(staff_etag)])
 def get_staff_statistics(db: Session = Depends(Database.get_session)):
     """
     Get staff statistics.
@@ -3,11 +3,14 @@ from sqlalchemy.orm import Session
 from typing import Optional
 from datetime import date
 from database.database import Database
-from services.statistics_service import StatisticsService
+from api.etag import conditional_get
+from services.statistics_cache import CachedStatisticsService
 
 router = APIRouter(prefix="/api/statistics", tags=["Statistics"])
 
-@router.get("/duty")
+statistics_etag = conditional_get(*CachedStatisticsService.DEPENDS_ON)
+
+@router.get("/duty", dependencies=[Depends(statistics_etag)])
 def get_duty_statistics(
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
@@ -24,10 +27,10 @@ def get_duty_statistics(
     Returns:
         Duty statistics
     """
-    service = StatisticsService(db)
+    service = CachedStatisticsService(db)
     return service.get_duty_statistics(start_date=start_date, end_date=end_date)
 
-@router.get("/workload")
+@router.get("/workload", dependencies=[Depends(statistics_etag)])
 def get_staff_workload(
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
@@ -44,10 +47,10 @@ def get_staff_workload(
     Returns:
         Staff workload statistics
     """
-    service = StatisticsService(db)
+    service = CachedStatisticsService(db)
     return service.get_staff_workload(start_date=start_date, end_date=end_date)
 
-@router.get("/shifts")
+@router.get("/shifts", dependencies=[Depends(statistics_etag)])
 def get_shift_distribution(
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
@@ -64,10 +67,10 @@ def get_shift_distribution(
     Returns:
         Shift distribution statistics
     """
-    service = StatisticsService(db)
+    service = CachedStatisticsService(db)
     return service.get_shift_distribution(start_date=start_date, end_date=end_date)
 
-@router.get("/comprehensive")
+@router.get("/comprehensive", dependencies=[Depends(statistics_etag)])
 def get_comprehensive_report(
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
@@ -84,5 +87,5 @@ def get_comprehensive_report(
     Returns:
         Comprehensive statistics
     """
-    service = StatisticsService(db)
+    service = CachedStatisticsService(db)
     return service.get_comprehensive_report(start_date=start_date, end_date=end_date)
@@ -0,0 +1,71 @@
+"""
+Benchmark AutoScheduler.generate_schedule: per-shift ORM writes vs bulk inserts.
+
+Usage:
+    python -m benchmarks.bench_auto_scheduler [--days 365] [--staff 500] [--staff-per-shift 4]
+"""
+import argparse
+import time
+from datetime import date, timedelta
+from sqlalchemy import func
+from models.schedule_assignment import ScheduleAssignment
+from services.auto_scheduler import AutoScheduler
+from benchmarks.common import QueryCounter, make_engine, make_session, seed
+
+SHIFT_TYPES = ['morning', 'afternoon', 'night']
+
+def run(args, bulk: bool) -> tuple:
+    """
+    Generate a schedule on a fresh database.
+    
+    Returns:
+        Tuple of (seconds, statements executed, generation result)
+    """
+    engine = make_engine(args.url)
+    db = make_session(engine)
+    seed(db, staff_count=args.staff, days=0, shift_types=[], staff_per_shift=0)
+    
+    start_date = date(2025, 1, 1)
+    end_date = start_date + timedelta(days=args.days - 1)
+    with QueryCounter(engine) as counter:
+        started = time.perf_counter()
+        result = AutoScheduler(db).generate_schedule(
+            start_date=start_date,
+            end_date=end_date,
+            shift_types=SHIFT_TYPES,
+            staff_per_shift=args.staff_per_shift,
+            bulk=bulk
+        )
+        elapsed = time.perf_counter() - started
+    
+    written = db.query(func.count(ScheduleAssignment.id)).scalar()
+    assert written == result['summary']['total_assignments']
+    db.close()
+    engine.dispose()
+    return elapsed, counter.count, result
+
+def main():
+    """Main execution."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--staff', type=int, default=500)
+    parser.add_argument('--staff-per-shift', type=int, default=4)
+    parser.add_argument('--url', default='sqlite://', help='Database URL (must be empty)')
+    args = parser.parse_args()
+    
+    orm_time, orm_queries, orm_result = run(args, bulk=False)
+    bulk_time, bulk_queries, bulk_result = run(args, bulk=True)
+    
+    if orm_result != bulk_result:
+        raise SystemExit("❌ Bulk generation produced a different schedule")
+    
+    summary = bulk_result['summary']
+    print(f"{args.days} days × {len(SHIFT_TYPES)} shifts × {args.staff} staff: "
+          f"{summary['total_schedules']} schedules, {summary['total_assignments']} assignments")
+    print(f"{'mode':<6} {'seconds':>9} {'statements':>11}")
+    print(f"{'orm':<6} {orm_time:>9.2f} {orm_queries:>11}")
+    print(f"{'bulk':<6} {bulk_time:>9.2f} {bulk_queries:>11}")
+    print(f"speedup: {orm_time / bulk_time:.1f}x")
+
+if __name__ == "__main__":
+    main()
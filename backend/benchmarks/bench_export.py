@@ -0,0 +1,78 @@
+"""
+Benchmark export throughput and peak memory for every export format.
+The roster matrix covers the last (up to) 365 seeded days.
+
+Usage:
+    python -m benchmarks.bench_export [--staff 200] [--years 2] [--staff-per-shift 4]
+"""
+import argparse
+import time
+import tracemalloc
+from datetime import timedelta
+from typing import Callable, Tuple
+from services.export_service import ExportService
+from benchmarks.common import make_engine, make_session, seed
+
+SHIFT_TYPES = ['morning', 'afternoon', 'night']
+
+def measure(run: Callable[[], int]) -> Tuple[float, int, float]:
+    """
+    Run an export twice: once for wall time, once under tracemalloc.
+    
+    Args:
+        run: Callable producing the export and returning its size in bytes
+    
+    Returns:
+        Tuple of (seconds, bytes produced, peak traced memory in MB)
+    """
+    started = time.perf_counter()
+    size = run()
+    elapsed = time.perf_counter() - started
+    
+    # tracemalloc slows allocation-heavy code down, so it gets its own run
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, size, peak / 1e6
+
+def streamed_size(chunks) -> int:
+    """Consume a text export stream and return its encoded size."""
+    return sum(len(chunk.encode()) for chunk in chunks)
+
+def file_size(file) -> int:
+    """Measure and close a generated export file."""
+    with file:
+        return file.seek(0, 2)
+
+def main():
+    """Main execution."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--staff', type=int, default=200)
+    parser.add_argument('--years', type=int, default=2)
+    parser.add_argument('--staff-per-shift', type=int, default=4)
+    parser.add_argument('--url', default='sqlite://', help='Database URL (must be empty)')
+    args = parser.parse_args()
+    
+    engine = make_engine(args.url)
+    db = make_session(engine)
+    start, end = seed(db, args.staff, args.years * 365, SHIFT_TYPES, args.staff_per_shift)
+    rows = args.years * 365 * len(SHIFT_TYPES) * args.staff_per_shift
+    service = ExportService(db)
+    
+    exports = {
+        'xlsx': lambda: file_size(service.export_to_excel()),
+        'csv': lambda: streamed_size(service.export_to_csv()),
+        'ndjson': lambda: streamed_size(service.export_to_ndjson()),
+        'roster': lambda: file_size(service.export_roster(max(start, end - timedelta(days=364)), end)),
+        'parquet': lambda: file_size(service.export_to_parquet())
+    }
+    
+    print(f"{rows} rows")
+    print(f"{'format':<8} {'seconds':>8} {'rows/s':>10} {'MB':>8} {'peak MB':>8}")
+    for name, run in exports.items():
+        elapsed, size, peak = measure(run)
+        print(f"{name:<8} {elapsed:>8.2f} {rows / elapsed:>10.0f} {size / 1e6:>8.2f} {peak:>8.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Compare query plans and timings of the hot queries with and without indexes.
+
+Runs the date-range and per-staff queries issued by ScheduleService and
+ExportService against a synthetic dataset, first with the indexes
+declared on the models and then with them dropped. Statistics are served
+from daily_duty_rollup (keyed by its primary key) and are not covered.
+
+Usage:
+    python -m benchmarks.bench_indexes [--staff 300] [--years 6] [--staff-per-shift 8]
+"""
+import argparse
+from datetime import timedelta
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from database.database import Base
+from services.export_service import ExportService
+from services.schedule_service import ScheduleService
+from benchmarks.common import QueryCounter, make_engine, make_session, seed, timed
+
+SHIFT_TYPES = ['morning', 'afternoon', 'night']
+
+def build_workloads(start, end):
+    """
+    Build the (name, callable) pairs exercised by the benchmark.
+    
+    Args:
+        start: First date of the dataset
+        end: Last date of the dataset
+    
+    Returns:
+        List of (name, callable taking a session) tuples
+    """
+    month_start = end - timedelta(days=30)
+    return [
+        ('roster matrix (month)', lambda db: ExportService(db).export_roster(month_start, end)),
+        ('staff schedule (month)', lambda db: ScheduleService(db).get_staff_schedule(7, month_start, end)),
+        ('schedule listing (month)', lambda db: ScheduleService(db).get_schedules_with_assignments(month_start, end)),
+        ('schedule listing page', lambda db: ScheduleService(db).get_schedules_page(month_start, end, limit=50)),
+    ]
+
+def explain(engine: Engine, statement: str, parameters, label: str) -> list:
+    """
+    Return the query plan lines for a statement.
+    
+    The label is embedded as a comment so the driver's prepared statement
+    cache cannot hand back a plan compiled before the indexes were dropped.
+    """
+    prefix = 'EXPLAIN QUERY PLAN ' if engine.dialect.name == 'sqlite' else 'EXPLAIN '
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(f"{prefix}/* {label} */ {statement}", parameters).all()
+    return [str(row[-1]) for row in rows]
+
+def run_phase(engine: Engine, workloads, label: str) -> dict:
+    """
+    Time every workload and print the plans of the statements it issues.
+    
+    Returns:
+        Dictionary of workload name to best time in seconds
+    """
+    print("=" * 70)
+    print(f"📊 {label}")
+    print("=" * 70)
+    db = make_session(engine)
+    timings = {}
+    for name, fn in workloads:
+        with QueryCounter(engine) as counter:
+            fn(db)
+        db.expunge_all()
+        
+        def run():
+            fn(db)
+            db.expunge_all()
+        
+        timings[name] = timed(run)
+        print(f"\n{name}: {timings[name] * 1000:.1f} ms")
+        for statement, parameters in counter.statements:
+            for line in explain(engine, statement, parameters, label):
+                print(f"    {line}")
+    db.close()
+    print("")
+    return timings
+
+def drop_indexes(engine: Engine):
+    """Drop every index declared on the models."""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.drop(bind=engine, checkfirst=True)
+
+def main():
+    """Main execution."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--staff', type=int, default=300)
+    parser.add_argument('--years', type=int, default=6)
+    parser.add_argument('--staff-per-shift', type=int, default=8)
+    parser.add_argument('--url', default='sqlite://', help='Database URL (must be empty)')
+    args = parser.parse_args()
+    
+    engine = make_engine(args.url)
+    db = make_session(engine)
+    start, end = seed(db, args.staff, args.years * 365, SHIFT_TYPES, args.staff_per_shift)
+    db.close()
+    if engine.dialect.name == 'sqlite':
+        with engine.begin() as conn:
+            conn.execute(text('ANALYZE'))
+    
+    workloads = build_workloads(start, end)
+    indexed = run_phase(engine, workloads, 'WITH INDEXES')
+    drop_indexes(engine)
+    unindexed = run_phase(engine, workloads, 'WITHOUT INDEXES')
+    
+    print(f"{'query':<30} {'indexed ms':>11} {'no index ms':>12} {'speedup':>8}")
+    for name, _ in workloads:
+        print(f"{name:<30} {indexed[name] * 1000:>11.2f} {unindexed[name] * 1000:>12.2f} {unindexed[name] / indexed[name]:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark the schedule listing path and verify its query count.
+
+The eager-loaded listing must use a fixed number of queries however many
+schedules fall inside the date range; the script exits non-zero otherwise.
+
+Usage:
+    python -m benchmarks.bench_schedule_listing
+"""
+import sys
+from datetime import timedelta
+from services.schedule_service import ScheduleService
+from benchmarks.common import QueryCounter, make_engine, make_session, seed, timed
+
+MAX_QUERIES = 2
+
+def lazy_listing(service: ScheduleService, start_date, end_date) -> list:
+    """Listing as built before eager loading (one query per schedule and assignment)."""
+    return [s.to_dict() for s in service.get_schedules(start_date=start_date, end_date=end_date)]
+
+def main():
+    """Main execution."""
+    engine = make_engine()
+    db = make_session(engine)
+    start, end = seed(db, staff_count=40, days=90, shift_types=['morning', 'afternoon', 'night'], staff_per_shift=4)
+    
+    failed = False
+    print(f"{'days':>6} {'lazy queries':>13} {'eager queries':>14} {'lazy ms':>9} {'eager ms':>9}")
+    for days in (1, 7, 30, 90):
+        range_end = start + timedelta(days=days - 1)
+        
+        db.expunge_all()
+        with QueryCounter(engine) as lazy:
+            expected = lazy_listing(ScheduleService(db), start, range_end)
+        db.expunge_all()
+        with QueryCounter(engine) as eager:
+            result = ScheduleService(db).get_schedules_with_assignments(start_date=start, end_date=range_end)
+        
+        if result != expected:
+            print(f"❌ Eager listing differs from lazy listing for {days} days")
+            failed = True
+        if eager.count > MAX_QUERIES:
+            print(f"❌ Eager listing ran {eager.count} queries for {days} days (limit {MAX_QUERIES})")
+            failed = True
+        
+        def run_lazy():
+            db.expunge_all()
+            lazy_listing(ScheduleService(db), start, range_end)
+        
+        def run_eager():
+            db.expunge_all()
+            ScheduleService(db).get_schedules_with_assignments(start_date=start, end_date=range_end)
+        
+        print(f"{days:>6} {lazy.count:>13} {eager.count:>14} {timed(run_lazy) * 1000:>9.1f} {timed(run_eager) * 1000:>9.1f}")
+    
+    db.close()
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Scaling benchmark for auto-scheduler staff selection.
+
+Compares the original sort-per-shift selection with WorkloadQueue across
+roster sizes and checks that both pick exactly the same staff.
+
+Usage:
+    python -m benchmarks.bench_staff_selection [--shifts 1095] [--staff-per-shift 4]
+"""
+import argparse
+import random
+import time
+from types import SimpleNamespace
+from typing import Dict, List
+from services.workload_queue import WorkloadQueue
+
+def select_by_sorting(staff_list: List, workload: Dict[int, int], count: int, shift_day_index: int) -> List:
+    """Original selection: full sort of the roster for every shift."""
+    staff_workload = [(staff, workload[staff.id]) for staff in staff_list]
+    staff_workload.sort(key=lambda x: x[1])
+    selected = [staff for staff, _ in staff_workload[:count]]
+    
+    min_workload = staff_workload[0][1]
+    staff_with_min = [s for s, w in staff_workload if w == min_workload]
+    
+    if len(staff_with_min) > count:
+        rotation_offset = shift_day_index % len(staff_with_min)
+        rotated = staff_with_min[rotation_offset:] + staff_with_min[:rotation_offset]
+        selected = rotated[:count]
+    
+    return selected
+
+def run_sorting(staff_list, initial, shifts, count) -> tuple:
+    """Fill `shifts` shifts with the sort-based selection."""
+    workload = dict(initial)
+    picks = []
+    started = time.perf_counter()
+    for shift_day_index in range(shifts):
+        selected = select_by_sorting(staff_list, workload, count, shift_day_index)
+        for staff in selected:
+            workload[staff.id] += 1
+        picks.append([s.id for s in selected])
+    return time.perf_counter() - started, picks
+
+def run_queue(staff_list, initial, shifts, count) -> tuple:
+    """Fill `shifts` shifts with WorkloadQueue."""
+    queue = WorkloadQueue(staff_list, initial)
+    picks = []
+    started = time.perf_counter()
+    for shift_day_index in range(shifts):
+        picks.append([s.id for s in queue.select(count, shift_day_index)])
+    return time.perf_counter() - started, picks
+
+def main():
+    """Main execution."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--shifts', type=int, default=365 * 3)
+    parser.add_argument('--staff-per-shift', type=int, default=4)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 50, 200, 1000, 5000, 20000])
+    args = parser.parse_args()
+    
+    rng = random.Random(42)
+    print(f"{'staff':>7} {'start':>8} {'sort ms':>10} {'queue ms':>10} {'speedup':>8}")
+    for size in args.sizes:
+        staff_list = [SimpleNamespace(id=i + 1) for i in range(size)]
+        for start in ('zero', 'random'):
+            if start == 'zero':
+                initial = {s.id: 0 for s in staff_list}
+            else:
+                initial = {s.id: rng.randint(0, 3) for s in staff_list}
+            
+            sort_time, sort_picks = run_sorting(staff_list, initial, args.shifts, args.staff_per_shift)
+            queue_time, queue_picks = run_queue(staff_list, initial, args.shifts, args.staff_per_shift)
+            if sort_picks != queue_picks:
+                raise SystemExit(f"❌ Selections differ for {size} staff ({start} start)")
+            
+            print(f"{size:>7} {start:>8} {sort_time * 1000:>10.1f} {queue_time * 1000:>10.1f} {sort_time / queue_time:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
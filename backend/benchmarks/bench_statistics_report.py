@@ -0,0 +1,55 @@
+"""
+Benchmark the comprehensive statistics report against its per-section queries.
+
+Usage:
+    python -m benchmarks.bench_statistics_report [--staff 300] [--years 6] [--staff-per-shift 8]
+"""
+import argparse
+from datetime import timedelta
+from services.statistics_service import StatisticsService
+from benchmarks.common import QueryCounter, make_engine, make_session, seed, timed
+
+SHIFT_TYPES = ['morning', 'afternoon', 'night']
+
+def report_by_sections(service: StatisticsService, start_date, end_date) -> dict:
+    """The report as assembled from the three per-section methods."""
+    return {
+        'duty_statistics': service.get_duty_statistics(start_date, end_date),
+        'staff_workload': service.get_staff_workload(start_date, end_date),
+        'shift_distribution': service.get_shift_distribution(start_date, end_date)
+    }
+
+def main():
+    """Main execution."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--staff', type=int, default=300)
+    parser.add_argument('--years', type=int, default=6)
+    parser.add_argument('--staff-per-shift', type=int, default=8)
+    parser.add_argument('--url', default='sqlite://', help='Database URL (must be empty)')
+    args = parser.parse_args()
+    
+    engine = make_engine(args.url)
+    db = make_session(engine)
+    start, end = seed(db, args.staff, args.years * 365, SHIFT_TYPES, args.staff_per_shift)
+    service = StatisticsService(db)
+    
+    print(f"{'range':<8} {'sections q':>11} {'single q':>9} {'sections ms':>12} {'single ms':>10} {'speedup':>8}")
+    for label, days in (('week', 7), ('month', 30), ('year', 365), ('all', None)):
+        range_start = end - timedelta(days=days - 1) if days else None
+        
+        with QueryCounter(engine) as sections:
+            expected = report_by_sections(service, range_start, end)
+        with QueryCounter(engine) as single:
+            report = service.get_comprehensive_report(range_start, end)
+        
+        expected['staff_workload'].sort(key=lambda w: w['staff_id'])
+        if report != expected:
+            raise SystemExit(f"❌ Single-scan report differs for range '{label}'")
+        
+        sections_time = timed(lambda: report_by_sections(service, range_start, end))
+        single_time = timed(lambda: service.get_comprehensive_report(range_start, end))
+        print(f"{label:<8} {sections.count:>11} {single.count:>9} {sections_time * 1000:>12.1f} "
+              f"{single_time * 1000:>10.1f} {sections_time / single_time:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Shared helpers for the benchmark scripts.
+
+Run benchmarks from the backend directory, e.g.:
+    python -m benchmarks.bench_schedule_listing
+"""
+import time
+from datetime import date, timedelta
+from typing import Callable, List, Tuple
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+from database.database import Base
+from models.staff import Staff
+from models.schedule import Schedule
+from models.schedule_assignment import ScheduleAssignment
+from services.rollup_service import RollupService
+
+def make_engine(url: str = 'sqlite://') -> Engine:
+    """
+    Create an engine with all tables for benchmarking.
+    
+    Args:
+        url: Database URL (in-memory SQLite by default)
+    
+    Returns:
+        SQLAlchemy engine
+    """
+    if url == 'sqlite://':
+        engine = create_engine(url, connect_args={'check_same_thread': False}, poolclass=StaticPool)
+    else:
+        engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+def make_session(engine: Engine) -> Session:
+    """Create a session bound to the given engine."""
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+
+class QueryCounter:
+    """
+    Context manager counting SQL statements executed on an engine.
+    
+    Attributes:
+        count: Number of statements executed inside the block
+        statements: The executed (SQL, parameters) pairs
+    """
+    
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.count = 0
+        self.statements: List[Tuple[str, tuple]] = []
+    
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+        self.statements.append((statement, parameters))
+    
+    def __enter__(self):
+        event.listen(self.engine, 'before_cursor_execute', self._before_cursor_execute)
+        return self
+    
+    def __exit__(self, *exc):
+        event.remove(self.engine, 'before_cursor_execute', self._before_cursor_execute)
+        return False
+
+def seed(
+    db: Session,
+    staff_count: int,
+    days: int,
+    shift_types: List[str],
+    staff_per_shift: int,
+    start: date = date(2024, 1, 1)
+) -> Tuple[date, date]:
+    """
+    Insert staff, schedules and assignments for a benchmark run.
+    
+    Args:
+        db: Database session
+        staff_count: Number of staff members
+        days: Number of days to cover
+        shift_types: Shift types created per day
+        staff_per_shift: Staff assigned to each shift
+        start: First date of the seeded range
+    
+    Returns:
+        Tuple of (start_date, end_date) covered by the data
+    """
+    staff_rows = [
+        {'id': i + 1, 'name': f"Staff {i}", 'age': 20 + i % 40, 'position': "工程师", 'is_active': True}
+        for i in range(staff_count)
+    ]
+    schedule_rows = []
+    assignment_rows = []
+    slot = 0
+    for day in range(days):
+        duty_date = start + timedelta(days=day)
+        for shift_type in shift_types:
+            schedule_id = len(schedule_rows) + 1
+            schedule_rows.append({
+                'id': schedule_id,
+                'schedule_date': duty_date,
+                'shift_type': shift_type,
+                'created_by': 'benchmark'
+            })
+            for _ in range(staff_per_shift):
+                assignment_rows.append({
+                    'staff_id': slot % staff_count + 1,
+                    'schedule_id': schedule_id,
+                    'duty_date': duty_date,
+                    'shift_type': shift_type,
+                    'status': 'scheduled'
+                })
+                slot += 1
+    
+    for model, rows in ((Staff, staff_rows), (Schedule, schedule_rows), (ScheduleAssignment, assignment_rows)):
+        if rows:
+            db.execute(insert(model), rows)
+    RollupService(db).rebuild()
+    return start, start + timedelta(days=days - 1)
+
+def timed(fn: Callable, repeat: int = 5) -> float:
+    """
+    Run a callable several times and return the best wall time.
+    
+    Args:
+        fn: Callable to time
+        repeat: Number of runs
+    
+    Returns:
+        Best run time in seconds
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
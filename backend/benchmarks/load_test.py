@@ -0,0 +1,357 @@
+"""
+Load-test the API endpoints and gate on latency regressions.
+Starts main:app under uvicorn on localhost against a freshly generated
+database (or targets --target), drives each scenario at the given
+concurrency and reports p50/p95/p99 latency and throughput of the median
+of several rounds. Every round sends its own requests, so response
+caches warmed by earlier rounds do not hide the cost of cold requests.
+With a stored baseline, exits with status 1 if any scenario's p95 grows
+or its throughput drops by more than the tolerance.
+
+The client runs in the server's process when the server is started
+here, so absolute numbers include client overhead; compare runs made
+the same way on the same machine.
+
+Usage:
+    python -m benchmarks.load_test [--staff 300] [--years 2] [--concurrency 8] [--requests 200]
+    python -m benchmarks.load_test --save-baseline           # record benchmarks/baselines/load_test.json
+    python -m benchmarks.load_test --scenarios schedules,report --tolerance 0.3
+    python -m benchmarks.load_test --target http://127.0.0.1:8000 --no-baseline
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+SHIFT_TYPES = ('morning', 'afternoon', 'night')
+DATA_START = date(2024, 1, 1)
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines', 'load_test.json')
+# p95 changes smaller than this are noise, whatever the tolerance
+MIN_P95_DELTA_MS = 5.0
+
+Request = Tuple[str, str, Optional[dict]]
+
+def scenarios(staff_count: int, days: int) -> Dict[str, Callable[[random.Random], Request]]:
+    """
+    Request builders per scenario; each picks its parameters from the
+    generated data range with the given random generator.
+    
+    Args:
+        staff_count: Staff in the generated data
+        days: Days covered by the generated data
+    
+    Returns:
+        Dictionary of scenario name -> builder returning (method, path, JSON body)
+    """
+    def window(rng: random.Random, length: int) -> Tuple[date, date]:
+        start = DATA_START + timedelta(days=rng.randrange(max(1, days - length)))
+        return start, start + timedelta(days=length - 1)
+    
+    def schedules(rng):
+        start, end = window(rng, 30)
+        return 'GET', f"/api/schedules/?start_date={start}&end_date={end}", None
+    
+    def schedules_page(rng):
+        start, _ = window(rng, 1)
+        return 'GET', f"/api/schedules/?start_date={start}&limit=100", None
+    
+    def staff_schedule(rng):
+        start, end = window(rng, 90)
+        return 'GET', f"/api/schedules/staff/{rng.randint(1, staff_count)}/schedule?start_date={start}&end_date={end}", None
+    
+    def report(rng):
+        start, end = window(rng, 90)
+        return 'GET', f"/api/statistics/comprehensive?start_date={start}&end_date={end}", None
+    
+    def export_excel(rng):
+        start, end = window(rng, 30)
+        return 'GET', f"/api/export/excel?start_date={start}&end_date={end}", None
+    
+    def export_csv(rng):
+        start, end = window(rng, 30)
+        return 'GET', f"/api/export/csv?start_date={start}&end_date={end}", None
+    
+    def auto_schedule(rng):
+        start, end = window(rng, 14)
+        body = {
+            'start_date': start.isoformat(),
+            'end_date': end.isoformat(),
+            'shift_types': list(SHIFT_TYPES),
+            'staff_per_shift': 3
+        }
+        return 'POST', "/api/auto-schedule/preview", body
+    
+    return {
+        'schedules': schedules,
+        'schedules_page': schedules_page,
+        'staff_schedule': staff_schedule,
+        'report': report,
+        'export_excel': export_excel,
+        'export_csv': export_csv,
+        'auto_schedule': auto_schedule
+    }
+
+class Client:
+    """
+    Keep-alive HTTP client with one connection per thread.
+    """
+    
+    def __init__(self, base_url: str):
+        """
+        Initialize Client.
+        
+        Args:
+            base_url: Server URL, e.g. http://127.0.0.1:8000
+        """
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.local = threading.local()
+    
+    def request(self, method: str, path: str, body: Optional[dict] = None) -> Tuple[int, float]:
+        """
+        Send a request and read the whole response.
+        
+        Returns:
+            Tuple of (status code, seconds); status 0 on connection errors
+        """
+        payload = json.dumps(body).encode() if body is not None else None
+        headers = {'Content-Type': 'application/json'} if body is not None else {}
+        started = time.perf_counter()
+        try:
+            connection = self._connection()
+            connection.request(method, path, body=payload, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            status = response.status
+        except (OSError, http.client.HTTPException):
+            self.local.connection = None
+            status = 0
+        return status, time.perf_counter() - started
+    
+    def _connection(self) -> http.client.HTTPConnection:
+        connection = getattr(self.local, 'connection', None)
+        if connection is None:
+            connection = self.local.connection = http.client.HTTPConnection(self.host, self.port, timeout=120)
+        return connection
+
+def run_scenario(
+    client: Client,
+    build: Callable[[random.Random], Request],
+    requests: int,
+    concurrency: int,
+    warmup: int,
+    seed: int
+) -> Dict:
+    """
+    Drive one scenario and summarize its latencies.
+    
+    Args:
+        client: HTTP client
+        build: Request builder of the scenario
+        requests: Measured requests
+        concurrency: Requests in flight at once
+        warmup: Unmeasured requests sent first
+        seed: Seed for the request parameters
+    
+    Returns:
+        Dictionary with request/error counts, latency percentiles (ms) and throughput
+    """
+    rng = random.Random(seed)
+    plan = [build(rng) for _ in range(warmup + requests)]
+    
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(lambda request: client.request(*request), plan[:warmup]))
+        started = time.perf_counter()
+        results = list(pool.map(lambda request: client.request(*request), plan[warmup:]))
+        elapsed = time.perf_counter() - started
+    
+    latencies = sorted(seconds * 1000 for _, seconds in results)
+    return {
+        'requests': requests,
+        'errors': sum(1 for status, _ in results if not 200 <= status < 400),
+        'p50_ms': round(percentile(latencies, 50), 2),
+        'p95_ms': round(percentile(latencies, 95), 2),
+        'p99_ms': round(percentile(latencies, 99), 2),
+        'rps': round(requests / elapsed, 1)
+    }
+
+def percentile(values: List[float], percent: float) -> float:
+    """Nearest-rank percentile of sorted values."""
+    if not values:
+        return 0.0
+    rank = max(1, -(-len(values) * percent // 100))
+    return values[int(rank) - 1]
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], tolerance: float) -> List[str]:
+    """
+    Compare results with a baseline.
+    
+    Args:
+        results: Scenario results of this run
+        baseline: Scenario results of the baseline run
+        tolerance: Allowed relative p95 increase and throughput decrease
+    
+    Returns:
+        Descriptions of the regressions found
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if result['p95_ms'] > base['p95_ms'] * (1 + tolerance) and result['p95_ms'] - base['p95_ms'] > MIN_P95_DELTA_MS:
+            regressions.append(f"{name}: p95 {base['p95_ms']}ms -> {result['p95_ms']}ms")
+        if result['rps'] < base['rps'] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {base['rps']}/s -> {result['rps']}/s")
+        if result['errors'] > base['errors']:
+            regressions.append(f"{name}: errors {base['errors']} -> {result['errors']}")
+    return regressions
+
+def start_server(staff_count: int, days: int, staff_per_shift: int, seed: int, workdir: str) -> Tuple[str, Callable[[], None]]:
+    """
+    Generate a database and serve main:app on a free localhost port.
+    
+    Returns:
+        Tuple of (base URL, function stopping the server)
+    """
+    # Configure the app before its modules read the environment
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'load_test.db')}"
+    os.environ['EXPORT_CACHE_DIR'] = os.path.join(workdir, 'export_cache')
+    os.environ.setdefault('PROFILE_DIR', os.path.join(workdir, 'profiles'))
+    
+    import uvicorn
+    from database.database import Database, SessionLocal
+    from services.data_generator import DataGenerator
+    
+    Database.migrate()
+    db = SessionLocal()
+    try:
+        summary = DataGenerator(db).generate(
+            staff_count=staff_count,
+            start_date=DATA_START,
+            days=days,
+            shift_types=SHIFT_TYPES,
+            staff_per_shift=staff_per_shift,
+            seed=seed
+        )
+    finally:
+        db.close()
+    print(f"{summary['staff']} staff, {summary['schedules']} schedules, {summary['assignments']} assignments")
+    
+    import main as app_module
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        port = probe.getsockname()[1]
+    
+    server = uvicorn.Server(uvicorn.Config(app_module.app, host='127.0.0.1', port=port, log_level='warning', access_log=False))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        if not thread.is_alive():
+            raise RuntimeError("Server failed to start")
+        time.sleep(0.05)
+    
+    def stop():
+        server.should_exit = True
+        thread.join()
+    
+    return f"http://127.0.0.1:{port}", stop
+
+def main():
+    """Main execution."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--staff', type=int, default=300)
+    parser.add_argument('--years', type=int, default=2)
+    parser.add_argument('--staff-per-shift', type=int, default=4)
+    parser.add_argument('--seed', type=int, default=42, help='Seed for the data and request parameters')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=200, help='Measured requests per scenario')
+    parser.add_argument('--warmup', type=int, default=20, help='Unmeasured requests per scenario')
+    parser.add_argument('--rounds', type=int, default=3, help='Runs per scenario, each with its own requests; the median one counts')
+    parser.add_argument('--scenarios', default=None, help='Comma-separated scenarios (default all)')
+    parser.add_argument('--target', default=None, help='Test a running server instead (must hold matching data)')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true', help='Store this run as the baseline')
+    parser.add_argument('--no-baseline', action='store_true', help='Report only, do not compare')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed relative regression')
+    args = parser.parse_args()
+    
+    days = args.years * 365
+    available = scenarios(args.staff, days)
+    names = args.scenarios.split(',') if args.scenarios else list(available)
+    unknown = [name for name in names if name not in available]
+    if unknown:
+        parser.error(f"unknown scenario(s) {', '.join(unknown)}; choose from {', '.join(available)}")
+    
+    config = {key: getattr(args, key) for key in ('staff', 'years', 'staff_per_shift', 'seed', 'concurrency', 'requests', 'rounds')}
+    
+    with tempfile.TemporaryDirectory(prefix='load_test_') as workdir:
+        if args.target:
+            base_url, stop = args.target, lambda: None
+        else:
+            base_url, stop = start_server(args.staff, days, args.staff_per_shift, args.seed, workdir)
+        
+        client = Client(base_url)
+        results = {}
+        print(f"concurrency {args.concurrency}, {args.requests} requests per scenario")
+        print(f"{'scenario':<16} {'errors':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'req/s':>8}")
+        try:
+            for index, name in enumerate(names):
+                rounds = sorted(
+                    (run_scenario(client, available[name], args.requests, args.concurrency, args.warmup, args.seed + 1000 * round_number + index)
+                     for round_number in range(max(1, args.rounds))),
+                    key=lambda round_result: round_result['p95_ms']
+                )
+                result = rounds[len(rounds) // 2]
+                results[name] = result
+                print(f"{name:<16} {result['errors']:>6} {result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f} {result['p99_ms']:>9.2f} {result['rps']:>8.1f}")
+        finally:
+            stop()
+    
+    if args.save_baseline:
+        stored = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as file:
+                stored = json.load(file)
+        if stored.get('config') != config:
+            stored = {'config': config, 'scenarios': {}}
+        stored['scenarios'].update(results)
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, 'w') as file:
+            json.dump(stored, file, indent=2, sort_keys=True)
+        print(f"✅ Baseline saved to {args.baseline}")
+        return
+    
+    if args.no_baseline:
+        return
+    if not os.path.exists(args.baseline):
+        print(f"ℹ️  No baseline at {args.baseline}; run with --save-baseline to create one")
+        return
+    
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    if baseline.get('config') != config:
+        print(f"⚠️  Baseline was recorded with {baseline.get('config')}, not comparing")
+        return
+    
+    regressions = compare(results, baseline['scenarios'], args.tolerance)
+    if regressions:
+        print(f"❌ Regressed beyond {args.tolerance:.0%}:")
+        for regression in regressions:
+            print(f"   {regression}")
+        sys.exit(1)
+    print(f"✅ Within {args.tolerance:.0%} of the baseline")
+
+if __name__ == "__main__":
+    main()
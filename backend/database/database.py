@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect
 from sqlalchemy.orm import sessionmaker, DeclarativeBase, Session
 from typing import Generator
 import os
@@ -11,20 +11,46 @@ class Base(DeclarativeBase):
 
 DATABASE_URL = os.getenv('DATABASE_URL', 'sqlite:///./shift_management.db')
 
+# Statement logging is for local debugging only (SQL_ECHO=true)
+SQL_ECHO = os.getenv('SQL_ECHO', 'false').lower() in ('1', 'true', 'yes')
+
 engine = create_engine(
     DATABASE_URL,
     connect_args={'check_same_thread': False} if 'sqlite' in DATABASE_URL else {},
-    echo=True
+    echo=SQL_ECHO
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ALEMBIC_INI = os.path.join(BACKEND_DIR, 'alembic.ini')
+BASELINE_REVISION = '0001'
+
 class Database:
     @staticmethod
     def create_tables():
         """Create all database tables."""
         Base.metadata.create_all(bind=engine)
     
+    @staticmethod
+    def migrate():
+        """
+        Upgrade the database schema to the latest Alembic revision.
+        
+        Databases created by create_tables() before migrations existed are
+        stamped with the baseline revision first, so only later migrations run.
+        """
+        from alembic import command
+        from alembic.config import Config
+        
+        config = Config(ALEMBIC_INI)
+        config.attributes['configure_logger'] = False
+        
+        tables = inspect(engine).get_table_names()
+        if 'alembic_version' not in tables and 'staff' in tables:
+            command.stamp(config, BASELINE_REVISION)
+        command.upgrade(config, 'head')
+    
     @staticmethod
     def drop_tables():
         """Drop all database tables (for testing)."""
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Generate Data - Bulk-load deterministic synthetic data.
+Appends staff, schedules and assignments to the configured database
+(DATABASE_URL) and rebuilds the statistics rollup. The same options and
+seed always produce the same data.
+
+Usage:
+    python generate_data.py                                  # 200 staff, 1 year
+    python generate_data.py --staff 500 --years 3 --seed 7
+    python generate_data.py --reset --shifts morning,night --staff-per-shift 4
+    python generate_data.py --status-mix completed=0.9,cancelled=0.05,scheduled=0.05 --as-of 2025-06-30
+"""
+import argparse
+import time
+from datetime import date
+from typing import Dict
+from database.database import Database, SessionLocal
+from services.data_generator import DataGenerator
+
+def parse_status_mix(value: str) -> Dict[str, float]:
+    """Parse status=weight pairs separated by commas."""
+    mix = {}
+    for pair in value.split(','):
+        status, _, weight = pair.partition('=')
+        if status.strip() not in ('scheduled', 'completed', 'cancelled'):
+            raise argparse.ArgumentTypeError(f"Unknown status: {status}")
+        mix[status.strip()] = float(weight)
+    return mix
+
+def main():
+    """Main execution."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--staff', type=int, default=200, help='staff members to create')
+    parser.add_argument('--years', type=float, default=1, help='years of schedules')
+    parser.add_argument('--start', type=date.fromisoformat, default=date(2024, 1, 1), help='first scheduled day (YYYY-MM-DD)')
+    parser.add_argument('--shifts', default='morning,afternoon,night', help='comma-separated shift types per day')
+    parser.add_argument('--staff-per-shift', type=int, default=3)
+    parser.add_argument('--status-mix', type=parse_status_mix, default=None, help='e.g. completed=0.85,cancelled=0.05,scheduled=0.1')
+    parser.add_argument('--as-of', type=date.fromisoformat, default=None, help='no completed assignments after this day')
+    parser.add_argument('--inactive-ratio', type=float, default=0.05)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--reset', action='store_true', help='drop all data first (python reset_database.py)')
+    args = parser.parse_args()
+    
+    if args.reset:
+        from reset_database import reset_database
+        reset_database()
+    else:
+        Database.migrate()
+    
+    print("=" * 50)
+    print("🏭 GENERATING SYNTHETIC DATA")
+    print("=" * 50)
+    
+    db = SessionLocal()
+    started = time.perf_counter()
+    try:
+        summary = DataGenerator(db).generate(
+            staff_count=args.staff,
+            start_date=args.start,
+            days=max(1, round(args.years * 365)),
+            shift_types=tuple(shift.strip() for shift in args.shifts.split(',') if shift.strip()),
+            staff_per_shift=args.staff_per_shift,
+            status_mix=args.status_mix,
+            as_of=args.as_of,
+            inactive_ratio=args.inactive_ratio,
+            seed=args.seed
+        )
+    except Exception as e:
+        print(f"❌ Generation failed: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+    
+    print(f"✅ {summary['staff']} staff, {summary['schedules']} schedules, {summary['assignments']} assignments")
+    print(f"   {summary['start_date']} to {summary['end_date']} (seed {summary['seed']}) in {time.perf_counter() - started:.1f}s")
+
+if __name__ == "__main__":
+    main()
@@ -2,14 +2,25 @@
 from dotenv import load_dotenv
 load_dotenv()
 
+import os
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
-from database.database import Database
+from database.database import BACKEND_DIR, Database, engine
+from monitoring.metrics import MetricsMiddleware, instrument_engine, metrics
+from monitoring.request_profiler import ProfileStore, ProfilingMiddleware
+from monitoring.sql_profiler import SqlProfilerMiddleware, sql_profiler
 from api.staff_routes import router as staff_router
 from api.schedule_routes import router as schedule_router
 from api.statistics_routes import router as statistics_router
 from api.export_routes import router as export_router
 from api.auto_schedule_routes import router as auto_schedule_router
+from api.import_routes import router as import_router
+from api.debug_routes import router as debug_router
+
+# Debug mode adds per-request SQL statistics to response headers and
+# serves the /debug/sql summary
+DEBUG = os.getenv('DEBUG', 'false').lower() in ('1', 'true', 'yes')
 
 # Create FastAPI app
 app = FastAPI(
@@ -25,6 +36,30 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Pagination cursors are always readable; SQL statistics only in debug mode
+    expose_headers=["X-Next-Cursor"] + (["X-DB-Query-Count", "X-DB-Time-Ms", "X-DB-Repeated-Statements", "Server-Timing"] if DEBUG else []),
+)
+
+# Profile SQL per request
+sql_profiler.instrument(engine)
+app.add_middleware(SqlProfilerMiddleware, profiler=sql_profiler, expose_headers=DEBUG)
+
+# Request, connection pool and background work metrics
+instrument_engine(engine)
+app.add_middleware(MetricsMiddleware)
+
+# Opt-in request profiling: send X-Profile-Token: $PROFILE_TOKEN, or set
+# PROFILE_SAMPLE_RATE to profile a random fraction of requests
+app.add_middleware(
+    ProfilingMiddleware,
+    store=ProfileStore(
+        directory=os.getenv('PROFILE_DIR', os.path.join(BACKEND_DIR, 'profiles')),
+        max_files=int(os.getenv('PROFILE_MAX_FILES', 200)),
+        max_bytes=int(os.getenv('PROFILE_MAX_MB', 50)) * 1024 * 1024
+    ),
+    token=os.getenv('PROFILE_TOKEN') or None,
+    sample_rate=float(os.getenv('PROFILE_SAMPLE_RATE', 0)),
+    interval=float(os.getenv('PROFILE_INTERVAL_MS', 5)) / 1000
 )
 
 # Include routers
@@ -33,12 +68,16 @@ app.include_router(schedule_router)
 app.include_router(statistics_router)
 app.include_router(export_router)
 app.include_router(auto_schedule_router)
+app.include_router(import_router)
+# The SQL summary exposes statement text, so it is only served in debug mode
+if DEBUG:
+    app.include_router(debug_router)
 
 @app.on_event("startup")
 def startup_event():
     """Initialize database on startup."""
-    Database.create_tables()
-    print("✅ Database tables created")
+    Database.migrate()
+    print("✅ Database migrated")
 
 @app.get("/")
 def root():
@@ -54,8 +93,12 @@ def health_check():
     """Health check endpoint."""
     return {"status": "healthy"}
 
+@app.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    """Metrics in the Prometheus text exposition format."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 if __name__ == "__main__":
     import uvicorn
-    import os
     port = int(os.environ.get("PORT", 8000))
     uvicorn.run("app:app", host="0.0.0.0", port=port)
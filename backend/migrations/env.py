@@ -0,0 +1,47 @@
+"""
+Alembic environment.
+Runs migrations against the engine configured in database/database.py.
+"""
+from logging.config import fileConfig
+from alembic import context
+from database.database import Base, engine, DATABASE_URL
+from models.staff import Staff
+from models.schedule import Schedule
+from models.schedule_assignment import ScheduleAssignment
+from models.duty_rollup import DailyDutyRollup
+from models.change_version import ChangeVersion
+
+config = context.config
+
+# Keep the application's logging untouched when migrations run on startup
+if config.config_file_name is not None and config.attributes.get('configure_logger', True):
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+def run_migrations_offline():
+    """Emit migration SQL without connecting to the database."""
+    context.configure(
+        url=DATABASE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        render_as_batch=True
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+def run_migrations_online():
+    """Run migrations on a live connection."""
+    with engine.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            render_as_batch=True
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,58 @@
+"""Baseline schema: staff, schedule and schedule_assignment tables
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'staff',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('age', sa.Integer(), nullable=False),
+        sa.Column('position', sa.String(length=100), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.Column('created_at', sa.DateTime()),
+        sa.Column('updated_at', sa.DateTime()),
+    )
+    op.create_table(
+        'schedule',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('schedule_date', sa.Date(), nullable=False),
+        sa.Column('shift_type', sa.String(length=50), nullable=False),
+        sa.Column('created_at', sa.DateTime()),
+        sa.Column('created_by', sa.String(length=100)),
+    )
+    op.create_table(
+        'schedule_assignment',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('staff_id', sa.Integer(), sa.ForeignKey('staff.id'), nullable=False),
+        sa.Column('schedule_id', sa.Integer(), sa.ForeignKey('schedule.id'), nullable=False),
+        sa.Column('duty_date', sa.Date(), nullable=False),
+        sa.Column('shift_type', sa.String(length=50), nullable=False),
+        sa.Column('status', sa.String(length=20)),
+        sa.Column('notes', sa.Text()),
+        sa.Column('created_at', sa.DateTime()),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('schedule_assignment')
+    op.drop_table('schedule')
+    op.drop_table('staff')
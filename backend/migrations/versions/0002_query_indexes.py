@@ -0,0 +1,38 @@
+"""Indexes for date-range and per-staff queries
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Schedule listing, keyset pagination and export: range on schedule_date ordered by (schedule_date, id)
+    op.create_index('ix_schedule_schedule_date', 'schedule', ['schedule_date', 'id'])
+    # Statistics: range on duty_date grouped by status / shift_type / staff_id (covering)
+    op.create_index('ix_schedule_assignment_duty_date', 'schedule_assignment', ['duty_date', 'status', 'shift_type', 'staff_id'])
+    # ScheduleService.get_staff_schedule: staff_id equality, duty_date range and order
+    op.create_index('ix_schedule_assignment_staff_id_duty_date', 'schedule_assignment', ['staff_id', 'duty_date'])
+    # Loading assignments per schedule (listing, detail, export)
+    op.create_index('ix_schedule_assignment_schedule_id', 'schedule_assignment', ['schedule_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_schedule_assignment_schedule_id', table_name='schedule_assignment')
+    op.drop_index('ix_schedule_assignment_staff_id_duty_date', table_name='schedule_assignment')
+    op.drop_index('ix_schedule_assignment_duty_date', table_name='schedule_assignment')
+    op.drop_index('ix_schedule_schedule_date', table_name='schedule')
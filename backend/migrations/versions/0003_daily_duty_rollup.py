@@ -0,0 +1,42 @@
+"""Daily duty rollup table for statistics
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'daily_duty_rollup',
+        sa.Column('duty_date', sa.Date(), primary_key=True),
+        sa.Column('staff_id', sa.Integer(), primary_key=True),
+        sa.Column('shift_type', sa.String(length=50), primary_key=True),
+        sa.Column('status', sa.String(length=20), primary_key=True),
+        sa.Column('assignment_count', sa.Integer(), nullable=False),
+    )
+    # Backfill from existing assignments
+    op.execute(
+        "INSERT INTO daily_duty_rollup (duty_date, staff_id, shift_type, status, assignment_count) "
+        "SELECT duty_date, staff_id, shift_type, COALESCE(status, 'scheduled'), COUNT(*) "
+        "FROM schedule_assignment "
+        "GROUP BY duty_date, staff_id, shift_type, COALESCE(status, 'scheduled')"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('daily_duty_rollup')
@@ -0,0 +1,39 @@
+"""Change version counters for cache invalidation
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 00:00:00
+
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    change_version = op.create_table(
+        'change_version',
+        sa.Column('name', sa.String(length=100), primary_key=True),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime()),
+    )
+    now = datetime.utcnow()
+    op.bulk_insert(change_version, [
+        {'name': name, 'version': 1, 'updated_at': now}
+        for name in ('staff', 'schedule', 'schedule_assignment')
+    ])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('change_version')
@@ -0,0 +1,31 @@
+"""Narrow the duty_date index now that statistics read the rollup
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, Sequence[str], None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_index('ix_schedule_assignment_duty_date', table_name='schedule_assignment')
+    # Roster export and bulk status updates: range on duty_date only
+    op.create_index('ix_schedule_assignment_duty_date', 'schedule_assignment', ['duty_date'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_schedule_assignment_duty_date', table_name='schedule_assignment')
+    op.create_index('ix_schedule_assignment_duty_date', 'schedule_assignment', ['duty_date', 'status', 'shift_type', 'staff_id'])
@@ -0,0 +1,26 @@
+from datetime import datetime
+from database.database import Base
+from sqlalchemy import Column, Integer, String, DateTime
+
+class ChangeVersion(Base):
+    """
+    ChangeVersion entity class - monotonically increasing change counter.
+    
+    One row per tracked table; write paths bump the counter in the same
+    transaction as their change so caches can detect stale entries cheaply.
+    
+    Attributes:
+        name: Tracked table name
+        version: Change counter
+        updated_at: Time of the last bump
+    """
+    
+    __tablename__ = 'change_version'
+    
+    name = Column(String(100), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        """String representation of ChangeVersion object."""
+        return f'<ChangeVersion {self.name}: {self.version}>'
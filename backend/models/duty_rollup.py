@@ -0,0 +1,29 @@
+from database.database import Base
+from sqlalchemy import Column, Integer, String, Date
+
+class DailyDutyRollup(Base):
+    """
+    DailyDutyRollup entity class - pre-aggregated assignment counts.
+    
+    Maintained by every write path that creates assignments or changes
+    their status, so statistics never have to scan schedule_assignment.
+    
+    Attributes:
+        duty_date: Date of duty
+        staff_id: Staff member ID
+        shift_type: Type of shift
+        status: Assignment status
+        assignment_count: Number of assignments with this key
+    """
+    
+    __tablename__ = 'daily_duty_rollup'
+    
+    duty_date = Column(Date, primary_key=True)
+    staff_id = Column(Integer, primary_key=True)
+    shift_type = Column(String(50), primary_key=True)
+    status = Column(String(20), primary_key=True)
+    assignment_count = Column(Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        """String representation of DailyDutyRollup object."""
+        return f'<DailyDutyRollup {self.duty_date} Staff:{self.staff_id} {self.shift_type}/{self.status}: {self.assignment_count}>'
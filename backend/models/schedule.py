@@ -1,6 +1,6 @@
 from datetime import datetime
 from database.database import Base
-from sqlalchemy import Column, Integer, String, Date, DateTime
+from sqlalchemy import Column, Integer, String, Date, DateTime, Index
 from sqlalchemy.orm import relationship
 
 class Schedule(Base):
@@ -16,6 +16,9 @@ class Schedule(Base):
     """
     
     __tablename__ = 'schedule'
+    __table_args__ = (
+        Index('ix_schedule_schedule_date', 'schedule_date', 'id'),
+    )
     
     id = Column(Integer, primary_key=True)
     schedule_date = Column(Date, nullable=False)
@@ -39,14 +42,18 @@ class Schedule(Base):
         self.shift_type = shift_type
         self.created_by = created_by
     
-    def to_dict(self) -> dict:
+    def to_dict(self, assignments=None) -> dict:
         """
         Convert schedule object to dictionary.
         
+        Args:
+            assignments: Preloaded assignments (loaded from the database if omitted)
+        
         Returns:
             Dictionary representation of schedule with assignments
         """
-        assignments = self.get_assignments()
+        if assignments is None:
+            assignments = self.get_assignments()
         
         return {
             'id': self.id,
@@ -1,6 +1,6 @@
 from datetime import datetime
 from database.database import Base
-from sqlalchemy import Column, Integer, String, Date, DateTime, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, Date, DateTime, Text, ForeignKey, Index
 from sqlalchemy.orm import relationship
 
 class ScheduleAssignment(Base):
@@ -19,6 +19,11 @@ class ScheduleAssignment(Base):
     """
     
     __tablename__ = 'schedule_assignment'
+    __table_args__ = (
+        Index('ix_schedule_assignment_duty_date', 'duty_date'),
+        Index('ix_schedule_assignment_staff_id_duty_date', 'staff_id', 'duty_date'),
+        Index('ix_schedule_assignment_schedule_id', 'schedule_id'),
+    )
     
     id = Column(Integer, primary_key=True)
     staff_id = Column(Integer, ForeignKey('staff.id'), nullable=False)
@@ -51,11 +51,26 @@ class Staff(Base):
         Raises:
             ValueError: If validation fails
         """
-        if not self.name or len(self.name.strip()) == 0:
+        self.validate_fields(self.name, self.age, self.position)
+    
+    @staticmethod
+    def validate_fields(name: str, age: int, position: str):
+        """
+        Validate staff field values without building a Staff object.
+        
+        Args:
+            name: Staff member's name
+            age: Staff member's age
+            position: Job position
+        
+        Raises:
+            ValueError: If validation fails
+        """
+        if not name or len(name.strip()) == 0:
             raise ValueError("Name cannot be empty")
-        if self.age < 18 or self.age > 60:
+        if age < 18 or age > 60:
             raise ValueError("Age must be between 18 and 60")
-        if not self.position or len(self.position.strip()) == 0:
+        if not position or len(position.strip()) == 0:
             raise ValueError("Position cannot be empty")
     
     def to_dict(self) -> dict:
@@ -0,0 +1,357 @@
+"""
+Metrics - In-process counters, gauges and histograms rendered in the
+Prometheus text exposition format.
+Updates take one lock and a dictionary lookup, so instrumenting hot paths
+is cheap; gauges backed by callbacks are only evaluated when scraped.
+"""
+import bisect
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+LabelValues = Tuple[str, ...]
+
+# Seconds; covers fast API calls up to long exports and scheduler runs
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+class Metric:
+    """
+    Base class of a named metric family with fixed label names.
+    """
+    
+    TYPE = 'untyped'
+    
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        """
+        Initialize Metric.
+        
+        Args:
+            name: Metric name
+            documentation: HELP text
+            labelnames: Names of the labels every sample carries
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.lock = threading.Lock()
+    
+    def render(self) -> List[str]:
+        """Exposition lines of the metric family."""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.TYPE}"]
+        for suffix, labels, value in self.samples():
+            lines.append(f"{self.name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+        return lines
+    
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        """(name suffix, labels, value) of every sample."""
+        raise NotImplementedError
+    
+    def _labels(self, values: LabelValues) -> Dict[str, str]:
+        return dict(zip(self.labelnames, values))
+
+class Counter(Metric):
+    """
+    Monotonically increasing count per label combination.
+    """
+    
+    TYPE = 'counter'
+    
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        # Unlabeled counters report 0 before their first increment
+        self.values: Dict[LabelValues, float] = {} if self.labelnames else {(): 0}
+    
+    def inc(self, *labelvalues: str, amount: float = 1):
+        """
+        Increase the count of a label combination.
+        
+        Args:
+            labelvalues: Label values in labelnames order
+            amount: Non-negative increment
+        """
+        with self.lock:
+            self.values[labelvalues] = self.values.get(labelvalues, 0) + amount
+    
+    def samples(self):
+        with self.lock:
+            return [('', self._labels(values), value) for values, value in self.values.items()]
+
+class Gauge(Metric):
+    """
+    Current value per label combination, either set directly or read
+    from a callback at scrape time.
+    """
+    
+    TYPE = 'gauge'
+    
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        callback: Optional[Callable[[], Dict[LabelValues, float]]] = None
+    ):
+        """
+        Initialize Gauge.
+        
+        Args:
+            name: Metric name
+            documentation: HELP text
+            labelnames: Names of the labels every sample carries
+            callback: Returns {label values: value} when scraped
+        """
+        super().__init__(name, documentation, labelnames)
+        self.values: Dict[LabelValues, float] = {}
+        self.callback = callback
+    
+    def set(self, value: float, *labelvalues: str):
+        """Set the value of a label combination."""
+        with self.lock:
+            self.values[labelvalues] = value
+    
+    def inc(self, *labelvalues: str, amount: float = 1):
+        """Add to the value of a label combination."""
+        with self.lock:
+            self.values[labelvalues] = self.values.get(labelvalues, 0) + amount
+    
+    def dec(self, *labelvalues: str, amount: float = 1):
+        """Subtract from the value of a label combination."""
+        self.inc(*labelvalues, amount=-amount)
+    
+    def samples(self):
+        values = self.callback() if self.callback else None
+        if values is None:
+            with self.lock:
+                values = dict(self.values)
+        return [('', self._labels(labelvalues), value) for labelvalues, value in values.items()]
+
+class Histogram(Metric):
+    """
+    Distribution of observed values in cumulative buckets.
+    """
+    
+    TYPE = 'histogram'
+    
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """
+        Initialize Histogram.
+        
+        Args:
+            name: Metric name
+            documentation: HELP text
+            labelnames: Names of the labels every sample carries
+            buckets: Increasing bucket upper bounds (+Inf is implicit)
+        """
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+        # Label values -> [per-bucket counts (last is +Inf), sum]
+        self.values: Dict[LabelValues, list] = {}
+    
+    def observe(self, value: float, *labelvalues: str):
+        """
+        Record one observation.
+        
+        Args:
+            value: Observed value
+            labelvalues: Label values in labelnames order
+        """
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            entry = self.values.get(labelvalues)
+            if entry is None:
+                entry = self.values[labelvalues] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+    
+    def samples(self):
+        with self.lock:
+            values = [(labelvalues, list(counts), total) for labelvalues, (counts, total) in self.values.items()]
+        
+        samples = []
+        for labelvalues, counts, total in values:
+            labels = self._labels(labelvalues)
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                samples.append(('_bucket', {**labels, 'le': _format_value(bound)}, cumulative))
+            samples.append(('_sum', labels, total))
+            samples.append(('_count', labels, cumulative))
+        return samples
+
+class MetricsRegistry:
+    """
+    Named collection of metrics rendered together.
+    """
+    
+    def __init__(self):
+        """Initialize an empty registry."""
+        self.metrics: Dict[str, Metric] = {}
+        self.lock = threading.Lock()
+    
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Register (or get the registered) counter."""
+        return self._register(Counter(name, documentation, labelnames))
+    
+    def gauge(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        callback: Optional[Callable[[], Dict[LabelValues, float]]] = None
+    ) -> Gauge:
+        """Register (or get the registered) gauge."""
+        return self._register(Gauge(name, documentation, labelnames, callback))
+    
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        """Register (or get the registered) histogram."""
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+    
+    def render(self) -> str:
+        """
+        Render all metrics.
+        
+        Returns:
+            Prometheus text exposition format (version 0.0.4)
+        """
+        with self.lock:
+            metrics = list(self.metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+    
+    def _register(self, metric: Metric) -> Metric:
+        """Add a metric unless one with the same name exists (module reloads)."""
+        with self.lock:
+            return self.metrics.setdefault(metric.name, metric)
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    """Render a label set, escaping values."""
+    if not labels:
+        return ""
+    pairs = (f'{name}="{_escape_label(str(value))}"' for name, value in labels.items())
+    return "{" + ",".join(pairs) + "}"
+
+def _escape_label(value: str) -> str:
+    """Escape a label value."""
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_value(value: float) -> str:
+    """Render a sample value."""
+    if value == float('inf'):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+metrics = MetricsRegistry()
+
+http_requests = metrics.counter(
+    'http_requests_total', 'HTTP requests by route and status.', ('method', 'route', 'status')
+)
+http_request_duration = metrics.histogram(
+    'http_request_duration_seconds', 'HTTP request latency until the last body chunk was sent.', ('method', 'route')
+)
+http_requests_in_progress = metrics.gauge(
+    'http_requests_in_progress', 'HTTP requests currently being served.'
+)
+
+db_pool_checkout_wait = metrics.histogram(
+    'db_pool_checkout_wait_seconds', 'Time spent waiting for a pooled database connection.',
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30)
+)
+db_pool_checkout_timeouts = metrics.counter(
+    'db_pool_checkout_timeouts_total', 'Connection checkouts that timed out waiting for the pool.'
+)
+
+auto_schedule_duration = metrics.histogram(
+    'auto_schedule_duration_seconds', 'Auto-scheduler run time by operation.', ('operation',)
+)
+auto_schedule_schedules = metrics.counter(
+    'auto_schedule_schedules_total', 'Schedules planned or written by the auto-scheduler.', ('operation',)
+)
+auto_schedule_assignments = metrics.counter(
+    'auto_schedule_assignments_total', 'Assignments planned or written by the auto-scheduler.', ('operation',)
+)
+
+export_duration = metrics.histogram(
+    'export_duration_seconds', 'Export generation time by format and cache outcome (hit/miss/stream).', ('format', 'cache')
+)
+export_rows = metrics.counter(
+    'export_rows_total', 'Rows written by generated exports.', ('format',)
+)
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request counts and latencies per route.
+    Requests that match no route share the route label "unmatched" so
+    scanning for URLs cannot grow the label set.
+    """
+    
+    def __init__(self, app):
+        """
+        Initialize MetricsMiddleware.
+        
+        Args:
+            app: ASGI application
+        """
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        
+        started = time.perf_counter()
+        status = 500
+        
+        async def send_with_status(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            await send(message)
+        
+        http_requests_in_progress.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_requests_in_progress.dec()
+            route = getattr(scope.get('route'), 'path', 'unmatched')
+            http_request_duration.observe(time.perf_counter() - started, scope['method'], route)
+            http_requests.inc(scope['method'], route, str(status))
+
+def instrument_engine(engine: Engine):
+    """
+    Export connection pool state and checkout wait times of an engine.
+    
+    Connection checkouts are timed by wrapping Engine.raw_connection,
+    which survives Engine.dispose() replacing the pool.
+    
+    Args:
+        engine: Engine to instrument
+    """
+    def pool_stat(method: str) -> Callable[[], Dict[LabelValues, float]]:
+        # Only QueuePool reports sizes; other pools export nothing
+        def read():
+            stat = getattr(engine.pool, method, None)
+            return {(): max(stat(), 0)} if stat else {}
+        return read
+    
+    metrics.gauge('db_pool_size', 'Configured size of the connection pool.', callback=pool_stat('size'))
+    metrics.gauge('db_pool_checked_out', 'Connections currently checked out.', callback=pool_stat('checkedout'))
+    metrics.gauge('db_pool_checked_in', 'Idle connections in the pool.', callback=pool_stat('checkedin'))
+    metrics.gauge('db_pool_overflow', 'Connections open beyond the pool size.', callback=pool_stat('overflow'))
+    
+    raw_connection = engine.raw_connection
+    
+    def timed_raw_connection():
+        started = time.perf_counter()
+        try:
+            return raw_connection()
+        except PoolTimeoutError:
+            db_pool_checkout_timeouts.inc()
+            raise
+        finally:
+            db_pool_checkout_wait.observe(time.perf_counter() - started)
+    
+    engine.raw_connection = timed_raw_connection
@@ -0,0 +1,235 @@
+"""
+Request Profiler - Opt-in sampling profiles of individual requests.
+A request is profiled when it carries the configured profile token or is
+picked by the sample rate. A background thread then samples the stacks
+of the threads serving requests and writes them in the collapsed-stack
+format read by flamegraph.pl and speedscope.
+"""
+import hmac
+import os
+import random
+import re
+import sys
+import tempfile
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Optional
+import anyio
+
+# Threads whose stacks are sampled besides the event loop thread
+WORKER_THREAD_PREFIX = 'AnyIO worker thread'
+# Modules whose frames on top of the stack mean the thread is idle
+IDLE_MODULES = {'threading', 'selectors', 'queue', 'concurrent.futures.thread'}
+
+class StackSampler(threading.Thread):
+    """
+    Thread sampling other threads' stacks at a fixed interval.
+    Because worker threads are shared, requests running concurrently with
+    the profiled one also contribute samples; idle threads never do.
+    """
+    
+    def __init__(self, loop_thread_id: int, interval: float):
+        """
+        Initialize StackSampler.
+        
+        Args:
+            loop_thread_id: Ident of the event loop thread serving the request
+            interval: Seconds between samples
+        """
+        super().__init__(name='request-profiler', daemon=True)
+        self.loop_thread_id = loop_thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.stopped = threading.Event()
+    
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            self.sample()
+    
+    def stop(self):
+        """Stop sampling and wait for the thread to finish."""
+        self.stopped.set()
+        self.join()
+    
+    def sample(self):
+        """Record the current stack of every busy request thread."""
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        self.samples += 1
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == self.loop_thread_id:
+                root = 'event-loop'
+            elif names.get(thread_id, '').startswith(WORKER_THREAD_PREFIX):
+                root = 'worker'
+            else:
+                continue
+            if frame.f_globals.get('__name__') in IDLE_MODULES:
+                continue
+            
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{frame.f_globals.get('__name__', '?')}:{getattr(code, 'co_qualname', code.co_name)}:{code.co_firstlineno}")
+                frame = frame.f_back
+            stack.append(root)
+            self.stacks[';'.join(reversed(stack))] += 1
+
+class ProfileStore:
+    """
+    Directory of profile files capped by file count and total size;
+    the oldest files are removed first.
+    """
+    
+    def __init__(self, directory: str, max_files: int, max_bytes: int):
+        """
+        Initialize ProfileStore.
+        
+        Args:
+            directory: Profile directory (created on first write)
+            max_files: Maximum number of profile files kept
+            max_bytes: Maximum total size of the profile files
+        """
+        self.directory = directory
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+    
+    def write(self, name: str, content: str) -> str:
+        """
+        Write a profile file and evict old ones.
+        
+        Args:
+            name: File name
+            content: File contents
+        
+        Returns:
+            Path of the written file
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, name)
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as file:
+            file.write(content)
+        os.replace(temp_path, path)
+        self._evict(keep=path)
+        return path
+    
+    def _evict(self, keep: str):
+        """Remove the oldest files until the directory fits both caps."""
+        with self.lock:
+            entries = []
+            for entry in os.scandir(self.directory):
+                if entry.is_file() and not entry.name.endswith('.tmp'):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+            
+            count = len(entries)
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if count <= self.max_files and total <= self.max_bytes:
+                    break
+                if path == keep:
+                    continue
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                count -= 1
+                total -= size
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware profiling selected requests.
+    Unselected requests cost one header lookup (and one random number
+    when sampling is enabled). One request is profiled at a time; others
+    selected meanwhile run unprofiled. Token-triggered responses name the
+    profile file in the X-Profile header.
+    """
+    
+    HEADER = b'x-profile-token'
+    
+    def __init__(
+        self,
+        app,
+        store: ProfileStore,
+        token: Optional[str] = None,
+        sample_rate: float = 0.0,
+        interval: float = 0.005
+    ):
+        """
+        Initialize ProfilingMiddleware.
+        
+        Args:
+            app: ASGI application
+            store: Where profiles are written
+            token: Value of the X-Profile-Token header that requests a
+                profile (None disables header triggering)
+            sample_rate: Fraction of requests profiled at random
+            interval: Seconds between stack samples
+        """
+        self.app = app
+        self.store = store
+        self.token = token.encode() if token else None
+        self.sample_rate = sample_rate
+        self.interval = interval
+        self.busy = threading.Lock()
+    
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        
+        requested = self._requested(scope)
+        if not (requested or (self.sample_rate and random.random() < self.sample_rate)):
+            await self.app(scope, receive, send)
+            return
+        if not self.busy.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+        
+        # The file name is fixed before the response starts so it can be sent
+        name = self._file_name(scope)
+        
+        async def send_with_header(message):
+            if message['type'] == 'http.response.start' and requested:
+                message['headers'] = list(message.get('headers', [])) + [(b'x-profile', name.encode())]
+            await send(message)
+        
+        sampler = StackSampler(threading.get_ident(), self.interval)
+        try:
+            sampler.start()
+            await self.app(scope, receive, send_with_header)
+        finally:
+            # Joining the sampler and writing the file block, so they run in a
+            # worker thread; shielded so a cancelled request still releases
+            # the profiler
+            with anyio.CancelScope(shield=True):
+                await anyio.to_thread.run_sync(self._finish, sampler, name)
+    
+    def _finish(self, sampler: StackSampler, name: str):
+        """Stop the sampler, release the profiler and write the profile."""
+        try:
+            if sampler.is_alive():
+                sampler.stop()
+        finally:
+            self.busy.release()
+        self.store.write(name, self._render(sampler))
+    
+    def _requested(self, scope) -> bool:
+        """Whether the request carries the profile token."""
+        if self.token is None:
+            return False
+        for header, value in scope['headers']:
+            if header == self.HEADER:
+                return hmac.compare_digest(value, self.token)
+        return False
+    
+    def _file_name(self, scope) -> str:
+        """Profile file name from the time, method and request path."""
+        path = re.sub(r'[^A-Za-z0-9]+', '_', scope['path']).strip('_') or 'root'
+        return f"{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}_{scope['method']}_{path[:80]}.folded"
+    
+    def _render(self, sampler: StackSampler) -> str:
+        """Collapsed stacks, most frequent first."""
+        return "".join(f"{stack} {count}\n" for stack, count in sampler.stacks.most_common())
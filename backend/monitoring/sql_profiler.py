@@ -0,0 +1,304 @@
+"""
+SQL Profiler - Per-request statement statistics from engine events.
+Each request gets a profile (query count, database time, slowest
+statements, repeated statement signatures) through a context variable,
+and the last requests are kept for a rolling summary.
+"""
+import heapq
+import os
+import re
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_current_profile: ContextVar[Optional["RequestProfile"]] = ContextVar('sql_profile', default=None)
+
+# Connection.info key holding the start times of running statements
+_STARTED = 'sql_profiler.started'
+
+_WHITESPACE = re.compile(r'\s+')
+_PLACEHOLDER_LIST = re.compile(r'\(\s*(\?|%\(\w+\)s|:\w+)(\s*,\s*(\?|%\(\w+\)s|:\w+))+\s*\)')
+_REPEATED_GROUPS = re.compile(r'(\(\?\.\.\.\))(\s*,\s*\(\?\.\.\.\))+')
+
+@lru_cache(maxsize=2048)
+def statement_signature(statement: str) -> str:
+    """
+    Normalize a statement so executions differing only in the length of
+    IN lists or VALUES rows share a signature.
+    
+    Args:
+        statement: SQL as sent to the driver
+    
+    Returns:
+        Normalized SQL
+    """
+    signature = _WHITESPACE.sub(' ', statement).strip()
+    signature = _PLACEHOLDER_LIST.sub('(?...)', signature)
+    return _REPEATED_GROUPS.sub(r'\1, ...', signature)
+
+class RequestProfile:
+    """
+    Statement statistics of one request.
+    
+    Attributes:
+        method: HTTP method
+        path: Route template (or raw path if no route matched)
+        query_count: Statements executed
+        db_time: Seconds spent executing statements
+        statements: Signature -> [executions, seconds]
+        slowest: Min-heap of the slowest (seconds, signature) pairs
+    """
+    
+    __slots__ = ('method', 'path', 'query_count', 'db_time', 'statements', 'slowest', 'max_slowest', 'lock')
+    
+    def __init__(self, method: str, path: str, max_slowest: int = 5):
+        self.method = method
+        self.path = path
+        self.query_count = 0
+        self.db_time = 0.0
+        self.statements: Dict[str, List] = {}
+        self.slowest: List[Tuple[float, str]] = []
+        self.max_slowest = max_slowest
+        # Statements of one request may run in several threads (streaming)
+        self.lock = threading.Lock()
+    
+    def record(self, signature: str, duration: float):
+        """Add one executed statement."""
+        with self.lock:
+            self.query_count += 1
+            self.db_time += duration
+            stats = self.statements.get(signature)
+            if stats is None:
+                self.statements[signature] = [1, duration]
+            else:
+                stats[0] += 1
+                stats[1] += duration
+            
+            if len(self.slowest) < self.max_slowest:
+                heapq.heappush(self.slowest, (duration, signature))
+            elif duration > self.slowest[0][0]:
+                heapq.heapreplace(self.slowest, (duration, signature))
+    
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """
+        Find likely N+1 patterns: SELECTs executed at least threshold times.
+        
+        Args:
+            threshold: Minimum executions of one signature
+        
+        Returns:
+            (signature, executions) pairs, most executed first
+        """
+        with self.lock:
+            found = [
+                (signature, count) for signature, (count, _) in self.statements.items()
+                if count >= threshold and signature[:6].upper() == 'SELECT'
+            ]
+        return sorted(found, key=lambda item: -item[1])
+
+class SqlProfiler:
+    """
+    Collects statement timings from an engine into request profiles and
+    keeps a rolling window of finished profiles.
+    """
+    
+    def __init__(self, window: int = 500, repeat_threshold: int = 5, max_slowest: int = 5):
+        """
+        Initialize SqlProfiler.
+        
+        Args:
+            window: Number of recent requests kept for the summary
+            repeat_threshold: Executions of one SELECT signature in a
+                request that flag an N+1 pattern
+            max_slowest: Slowest statements kept per request and in the summary
+        """
+        self.repeat_threshold = repeat_threshold
+        self.max_slowest = max_slowest
+        self.recent: deque = deque(maxlen=window)
+        self.lock = threading.Lock()
+    
+    def instrument(self, engine: Engine):
+        """
+        Listen to statement execution on an engine.
+        
+        Args:
+            engine: Engine to profile
+        """
+        event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+        event.listen(engine, 'handle_error', self._handle_error)
+    
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if _current_profile.get() is not None:
+            conn.info.setdefault(_STARTED, []).append(time.perf_counter())
+    
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        profile = _current_profile.get()
+        started = conn.info.get(_STARTED)
+        if profile is None or not started:
+            return
+        profile.record(statement_signature(statement), time.perf_counter() - started.pop())
+    
+    def _handle_error(self, exception_context):
+        connection = exception_context.connection
+        if connection is not None and connection.info.get(_STARTED):
+            connection.info[_STARTED].pop()
+    
+    def start(self, method: str, path: str):
+        """
+        Start profiling the current request.
+        
+        Args:
+            method: HTTP method
+            path: Request path
+        
+        Returns:
+            Token to pass to finish()
+        """
+        return _current_profile.set(RequestProfile(method, path, self.max_slowest))
+    
+    def current(self) -> Optional[RequestProfile]:
+        """Profile of the current request, if any."""
+        return _current_profile.get()
+    
+    def finish(self, token, route: Optional[str] = None) -> RequestProfile:
+        """
+        Stop profiling the current request and add it to the window.
+        
+        Args:
+            token: Value returned by start()
+            route: Matched route template, used instead of the raw path
+        
+        Returns:
+            The finished profile
+        """
+        profile = _current_profile.get()
+        _current_profile.reset(token)
+        if route:
+            profile.path = route
+        with self.lock:
+            self.recent.append(profile)
+        return profile
+    
+    def summary(self) -> Dict:
+        """
+        Summarize the requests in the window.
+        
+        Returns:
+            Per-route query counts and database time, the most expensive
+            statement signatures, the slowest statements and N+1 patterns
+        """
+        with self.lock:
+            profiles = list(self.recent)
+        
+        routes = {}
+        statements = {}
+        slowest = []
+        repeated = {}
+        for profile in profiles:
+            key = f"{profile.method} {profile.path}"
+            route = routes.setdefault(key, {'requests': 0, 'queries': 0, 'max_queries': 0, 'db_time': 0.0, 'max_db_time': 0.0})
+            route['requests'] += 1
+            route['queries'] += profile.query_count
+            route['max_queries'] = max(route['max_queries'], profile.query_count)
+            route['db_time'] += profile.db_time
+            route['max_db_time'] = max(route['max_db_time'], profile.db_time)
+            
+            with profile.lock:
+                for signature, (count, seconds) in profile.statements.items():
+                    stats = statements.setdefault(signature, [0, 0.0])
+                    stats[0] += count
+                    stats[1] += seconds
+                slowest.extend(profile.slowest)
+            
+            for signature, count in profile.repeated(self.repeat_threshold):
+                pattern = repeated.setdefault((key, signature), {'requests': 0, 'max_executions': 0})
+                pattern['requests'] += 1
+                pattern['max_executions'] = max(pattern['max_executions'], count)
+        
+        return {
+            'requests': len(profiles),
+            'routes': {
+                key: {
+                    'requests': route['requests'],
+                    'avg_queries': round(route['queries'] / route['requests'], 2),
+                    'max_queries': route['max_queries'],
+                    'avg_db_ms': round(route['db_time'] * 1000 / route['requests'], 3),
+                    'max_db_ms': round(route['max_db_time'] * 1000, 3)
+                }
+                for key, route in sorted(routes.items(), key=lambda item: -item[1]['db_time'])
+            },
+            'top_statements': [
+                {'statement': signature, 'executions': count, 'total_ms': round(seconds * 1000, 3)}
+                for signature, (count, seconds) in sorted(statements.items(), key=lambda item: -item[1][1])[:20]
+            ],
+            'slowest_statements': [
+                {'statement': signature, 'ms': round(seconds * 1000, 3)}
+                for seconds, signature in heapq.nlargest(self.max_slowest, slowest)
+            ],
+            'n_plus_one': [
+                {'route': key, 'statement': signature, **pattern}
+                for (key, signature), pattern in sorted(repeated.items(), key=lambda item: -item[1]['max_executions'])
+            ]
+        }
+
+sql_profiler = SqlProfiler(
+    window=int(os.getenv('SQL_PROFILE_WINDOW', 500)),
+    repeat_threshold=int(os.getenv('SQL_REPEAT_THRESHOLD', 5))
+)
+
+class SqlProfilerMiddleware:
+    """
+    ASGI middleware profiling the SQL of each HTTP request.
+    With expose_headers, responses carry X-DB-Query-Count, X-DB-Time-Ms,
+    X-DB-Repeated-Statements and a Server-Timing entry; statements run
+    while a streaming body is sent still count towards the summary.
+    """
+    
+    def __init__(self, app, profiler: SqlProfiler, expose_headers: bool = False):
+        """
+        Initialize SqlProfilerMiddleware.
+        
+        Args:
+            app: ASGI application
+            profiler: Profiler collecting the statements
+            expose_headers: Add the request's statistics to response headers
+        """
+        self.app = app
+        self.profiler = profiler
+        self.expose_headers = expose_headers
+    
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        
+        token = self.profiler.start(scope['method'], scope['path'])
+        profile = self.profiler.current()
+        
+        async def send_with_headers(message):
+            if message['type'] == 'http.response.start' and self.expose_headers:
+                message['headers'] = list(message.get('headers', [])) + self._headers(profile)
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            route = scope.get('route')
+            self.profiler.finish(token, getattr(route, 'path', None))
+    
+    def _headers(self, profile: RequestProfile) -> List[Tuple[bytes, bytes]]:
+        """Response headers describing the statements executed so far."""
+        db_ms = profile.db_time * 1000
+        repeated = profile.repeated(self.profiler.repeat_threshold)
+        return [
+            (b'x-db-query-count', str(profile.query_count).encode()),
+            (b'x-db-time-ms', f"{db_ms:.3f}".encode()),
+            (b'x-db-repeated-statements', str(len(repeated)).encode()),
+            (b'server-timing', f'db;dur={db_ms:.3f};desc="{profile.query_count} queries"'.encode())
+        ]
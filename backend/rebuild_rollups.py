@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Rebuild Rollups - Recompute statistics rollups from raw assignments.
+Use after bulk-loading data outside the API or if the rollup drifts.
+
+Usage:
+    python rebuild_rollups.py
+"""
+from database.database import SessionLocal
+from services.rollup_service import RollupService
+
+def main():
+    """Main execution."""
+    print("=" * 50)
+    print("🔄 REBUILDING DAILY DUTY ROLLUP")
+    print("=" * 50)
+    
+    db = SessionLocal()
+    try:
+        rows = RollupService(db).rebuild()
+        print(f"✅ Wrote {rows} rollup rows")
+    except Exception as e:
+        print(f"❌ Rebuild failed: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
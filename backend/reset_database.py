@@ -9,10 +9,10 @@ Usage:
 """
 import os
 import sys
-from database.database import Database, Base, engine
-from models.staff import Staff
-from models.schedule import Schedule
-from models.schedule_assignment import ScheduleAssignment
+from sqlalchemy import text
+from database.database import Database, SessionLocal, engine
+from services.schedule_service import ScheduleService
+from services.staff_service import StaffService
 from datetime import date, timedelta
 
 def reset_database():
@@ -21,16 +21,23 @@ def reset_database():
     print("🗑️  RESETTING DATABASE")
     print("=" * 50)
     
-    # Delete SQLite database file
-    db_file = "shift_management.db"
-    if os.path.exists(db_file):
-        os.remove(db_file)
-        print(f"✅ Deleted {db_file}")
+    if engine.url.get_backend_name() == 'sqlite':
+        # Delete SQLite database file (the one DATABASE_URL points at)
+        db_file = engine.url.database
+        engine.dispose()
+        if db_file and os.path.exists(db_file):
+            os.remove(db_file)
+            print(f"✅ Deleted {db_file}")
+        else:
+            print(f"ℹ️  No existing database found")
     else:
-        print(f"ℹ️  No existing database found")
+        Database.drop_tables()
+        with engine.begin() as connection:
+            connection.execute(text("DROP TABLE IF EXISTS alembic_version"))
+        print("✅ Dropped all tables")
     
     # Recreate all tables
-    Base.metadata.create_all(bind=engine)
+    Database.migrate()
     print("✅ Recreated all tables")
     print("")
 
@@ -40,58 +47,45 @@ def seed_sample_data():
     print("🌱 SEEDING SAMPLE DATA")
     print("=" * 50)
     
-    db = Database.SessionLocal()
+    db = SessionLocal()
     
     try:
+        # Seed through the services so the daily rollup and change versions
+        # (statistics, ETag, export and calendar caches) see the data
+        staff_service = StaffService(db)
+        schedule_service = ScheduleService(db)
+        
         # Create sample staff
         staff_data = [
-            Staff(name="张三", age=28, position="工程师"),
-            Staff(name="李四", age=32, position="经理"),
-            Staff(name="王五", age=25, position="助理"),
-            Staff(name="赵六", age=30, position="主管"),
+            staff_service.add_staff(name="张三", age=28, position="工程师"),
+            staff_service.add_staff(name="李四", age=32, position="经理"),
+            staff_service.add_staff(name="王五", age=25, position="助理"),
+            staff_service.add_staff(name="赵六", age=30, position="主管"),
         ]
-        
-        for staff in staff_data:
-            db.add(staff)
-        
-        db.commit()
         print(f"✅ Created {len(staff_data)} staff members")
         
         # Create sample schedules
         today = date.today()
         shift_types = ["morning", "afternoon", "night", "全天"]
         
-        schedules = []
-        for i in range(7):
-            schedule = Schedule(
+        schedules = [
+            schedule_service.create_schedule(
                 schedule_date=today + timedelta(days=i),
                 shift_type=shift_types[i % len(shift_types)],
                 created_by="seed_script"
             )
-            db.add(schedule)
-            schedules.append(schedule)
-        
-        db.commit()
+            for i in range(7)
+        ]
         print(f"✅ Created {len(schedules)} schedules")
         
         # Create sample assignments
         # Assign first 2 staff to each schedule
-        assignments = []
-        for schedule in schedules:
-            for staff in staff_data[:2]:
-                assignment = ScheduleAssignment(
-                    staff_id=staff.id,
-                    schedule_id=schedule.id,
-                    duty_date=schedule.schedule_date,
-                    shift_type=schedule.shift_type,
-                    notes="Sample assignment"
-                )
-                db.add(assignment)
-                assignments.append(assignment)
-        
-        db.commit()
+        assignments = schedule_service.bulk_assign_staff([
+            (schedule.id, [staff.id for staff in staff_data[:2]], "Sample assignment")
+            for schedule in schedules
+        ])
         print(f"✅ Created {len(assignments)} assignments")
-        
+    
     except Exception as e:
         print(f"❌ Seeding failed: {e}")
         db.rollback()
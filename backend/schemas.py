@@ -54,6 +54,9 @@ class AssignmentCreate(BaseModel):
     staff_ids: List[int]
     notes: Optional[str] = None
 
+class BulkAssignmentCreate(BaseModel):
+    assignments: List[AssignmentCreate] = Field(..., min_length=1)
+
 class AssignmentResponse(BaseModel):
     id: int
     staff_id: int
@@ -69,3 +72,11 @@ class AssignmentResponse(BaseModel):
 
 class AssignmentStatusUpdate(BaseModel):
     status: str = Field(..., pattern="^(scheduled|completed|cancelled)$")
+
+class BulkAssignmentStatusUpdate(BaseModel):
+    status: str = Field(..., pattern="^(scheduled|completed|cancelled)$")
+    assignment_ids: Optional[List[int]] = None
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    shift_type: Optional[str] = None
+    staff_id: Optional[int] = None
\ No newline at end of file
@@ -2,15 +2,26 @@
 Auto-Scheduler Service - Intelligent automatic shift scheduling.
 Demonstrates Algorithm Design and Fair Distribution Logic.
 """
-from typing import List, Dict
+from typing import Callable, List, Dict, Optional, Tuple
+import time
 from datetime import date, timedelta
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from models.staff import Staff
 from models.schedule import Schedule
 from models.schedule_assignment import ScheduleAssignment
-from collections import defaultdict
+from services.workload_queue import WorkloadQueue
+from services.plan_cache import plan_cache
+from services.rollup_service import RollupService
+from services.change_tracker import ChangeTracker
+from monitoring.metrics import auto_schedule_assignments, auto_schedule_duration, auto_schedule_schedules
+from collections import defaultdict, deque, namedtuple
+from itertools import islice
 import random
 
+# Snapshot of a staff member kept in cached plans (outlives the session)
+PlannedStaff = namedtuple('PlannedStaff', ['id', 'name'])
+
 class AutoScheduler:
     """
     Service class for automatic schedule generation.
@@ -23,6 +34,11 @@ class AutoScheduler:
         'night': 1
     }
     
+    ASSIGNMENT_NOTES = "自动排班生成"
+    
+    # Schedules written per set-based insert in bulk mode
+    BULK_CHUNK_SIZE = 1000
+    
     def __init__(self, db: Session):
         """
         Initialize AutoScheduler with database session.
@@ -38,7 +54,9 @@ class AutoScheduler:
         end_date: date,
         shift_types: List[str],
         staff_per_shift: int = 2,
-        created_by: str = 'auto-scheduler'
+        created_by: str = 'auto-scheduler',
+        bulk: bool = False,
+        progress_callback: Optional[Callable[[int, int], None]] = None
     ) -> Dict:
         """
         Generate automatic schedule with fair distribution.
@@ -55,11 +73,153 @@ class AutoScheduler:
             shift_types: List of shift types to create
             staff_per_shift: Number of staff per shift
             created_by: Creator identifier
-            
+            bulk: Write the plan with set-based inserts instead of one flush per shift
+            progress_callback: Called with (schedules written, total schedules)
+        
         Returns:
             Dictionary with created schedules and assignments
         """
-        # Get all active staff
+        started = time.perf_counter()
+        staff_list = self._get_active_staff(staff_per_shift)
+        
+        plan, workload = self._plan_schedule(
+            staff_list=staff_list,
+            start_date=start_date,
+            end_date=end_date,
+            shift_types=shift_types,
+            staff_per_shift=staff_per_shift
+        )
+        
+        progress = progress_callback or (lambda written, total: None)
+        progress(0, len(plan))
+        
+        self._persist_plan(plan, created_by, bulk, progress)
+        
+        # Build the summary before commit expires the loaded staff
+        result = self._build_result(plan, staff_list, workload, start_date, end_date)
+        
+        # Commit all changes
+        self.db.commit()
+        
+        self._record_metrics('generate', started, plan)
+        return result
+    
+    def preview_schedule(
+        self,
+        start_date: date,
+        end_date: date,
+        shift_types: List[str],
+        staff_per_shift: int = 2,
+        created_by: str = 'auto-scheduler'
+    ) -> Dict:
+        """
+        Plan a schedule fully in memory without writing to the database.
+        
+        The plan is cached under a token so it can be written later with
+        commit_plan() without being recomputed.
+        
+        Args:
+            start_date: Start date of schedule period
+            end_date: End date of schedule period
+            shift_types: List of shift types to create
+            staff_per_shift: Number of staff per shift
+            created_by: Creator identifier used when the plan is committed
+        
+        Returns:
+            Dictionary with token, summary, fairness metrics and the full plan
+        """
+        started = time.perf_counter()
+        staff_list = [
+            PlannedStaff(id=staff.id, name=staff.name)
+            for staff in self._get_active_staff(staff_per_shift)
+        ]
+        
+        plan, workload = self._plan_schedule(
+            staff_list=staff_list,
+            start_date=start_date,
+            end_date=end_date,
+            shift_types=shift_types,
+            staff_per_shift=staff_per_shift
+        )
+        
+        result = self._build_result(plan, staff_list, workload, start_date, end_date)
+        token = plan_cache.put({
+            'plan': plan,
+            'staff_list': staff_list,
+            'workload': workload,
+            'start_date': start_date,
+            'end_date': end_date,
+            'created_by': created_by
+        })
+        
+        self._record_metrics('preview', started, plan)
+        return {
+            'token': token,
+            'expires_in': plan_cache.ttl_seconds,
+            'summary': result['summary'],
+            'fairness': self._fairness_metrics(workload),
+            'workload_distribution': result['workload_distribution'],
+            'plan': [
+                {
+                    'date': duty_date.isoformat(),
+                    'shift_type': shift_type,
+                    'staff': [{'id': staff.id, 'name': staff.name} for staff in selected_staff]
+                }
+                for duty_date, shift_type, selected_staff in plan
+            ]
+        }
+    
+    def commit_plan(self, token: str) -> Optional[Dict]:
+        """
+        Write a previewed plan with bulk inserts.
+        
+        A plan can be committed once; it is removed from the cache whether or
+        not the commit succeeds.
+        
+        Args:
+            token: Token returned by preview_schedule()
+        
+        Returns:
+            Dictionary with created schedules and assignments, or None if the
+            token is unknown or expired
+        
+        Raises:
+            ValueError: If planned staff are no longer active
+        """
+        started = time.perf_counter()
+        cached = plan_cache.pop(token)
+        if cached is None:
+            return None
+        
+        staff_ids = [staff.id for staff in cached['staff_list']]
+        active_ids = {
+            staff_id for (staff_id,) in self.db.query(Staff.id)
+            .filter(Staff.id.in_(staff_ids), Staff.is_active == True)
+        }
+        inactive = [staff.name for staff in cached['staff_list'] if staff.id not in active_ids]
+        if inactive:
+            raise ValueError(f"Staff no longer active, preview again: {', '.join(inactive)}")
+        
+        plan = cached['plan']
+        self._persist_plan(plan, cached['created_by'], True, lambda written, total: None)
+        self.db.commit()
+        
+        self._record_metrics('commit', started, plan)
+        return self._build_result(plan, cached['staff_list'], cached['workload'], cached['start_date'], cached['end_date'])
+    
+    def _get_active_staff(self, staff_per_shift: int) -> List[Staff]:
+        """
+        Get all active staff, checking there are enough to fill a shift.
+        
+        Args:
+            staff_per_shift: Number of staff per shift
+        
+        Returns:
+            List of active Staff objects
+        
+        Raises:
+            ValueError: If there are not enough active staff
+        """
         staff_list = self.db.query(Staff).filter(Staff.is_active == True).all()
         
         if len(staff_list) == 0:
@@ -68,13 +228,34 @@ class AutoScheduler:
         if len(staff_list) < staff_per_shift:
             raise ValueError(f"Need at least {staff_per_shift} staff members, only {len(staff_list)} available")
         
-        # Initialize workload tracker
-        workload = defaultdict(int)
-        for staff in staff_list:
-            workload[staff.id] = 0
+        return staff_list
+    
+    def _plan_schedule(
+        self,
+        staff_list: List[Staff],
+        start_date: date,
+        end_date: date,
+        shift_types: List[str],
+        staff_per_shift: int
+    ) -> Tuple[List[Tuple[date, str, List[Staff]]], Dict[int, int]]:
+        """
+        Compute the whole schedule in memory without touching the database.
+        
+        Args:
+            staff_list: Active staff to distribute
+            start_date: Start date of schedule period
+            end_date: End date of schedule period
+            shift_types: List of shift types to create
+            staff_per_shift: Number of staff per shift
         
-        created_schedules = []
-        created_assignments = []
+        Returns:
+            Tuple of (plan as (date, shift_type, selected staff) entries,
+            final workload per staff ID)
+        """
+        # Staff bucketed by workload, updated incrementally as shifts are filled
+        queue = WorkloadQueue(staff_list)
+        
+        plan = []
         
         # Iterate through date range
         current_date = start_date
@@ -83,120 +264,236 @@ class AutoScheduler:
         while current_date <= end_date:
             # For each shift type
             for shift_type in shift_types:
-                # Create schedule
-                schedule = Schedule(
-                    schedule_date=current_date,
-                    shift_type=shift_type,
-                    created_by=created_by
-                )
-                self.db.add(schedule)
-                self.db.flush()  # Get the schedule ID
-                
-                # Select staff for this shift using simple fair distribution
-                selected_staff = self._select_staff_simple(
-                    staff_list=staff_list,
-                    workload=workload,
-                    count=staff_per_shift,
-                    shift_day_index=shift_day_index
-                )
-                
-                # Create assignments
-                for staff in selected_staff:
-                    assignment = ScheduleAssignment(
-                        staff_id=staff.id,
-                        schedule_id=schedule.id,
-                        duty_date=current_date,
-                        shift_type=shift_type,
-                        notes="自动排班生成"
-                    )
-                    self.db.add(assignment)
-                    
-                    # Update workload (simple increment)
-                    workload[staff.id] += 1
-                    
-                    created_assignments.append({
-                        'staff_name': staff.name,
-                        'date': current_date.isoformat(),
-                        'shift_type': shift_type
-                    })
-                
-                created_schedules.append({
-                    'date': current_date.isoformat(),
-                    'shift_type': shift_type,
-                    'staff_count': len(selected_staff)
-                })
+                # Select the least-worked staff, rotating through ties
+                selected_staff = queue.select(count=staff_per_shift, shift_day_index=shift_day_index)
                 
+                plan.append((current_date, shift_type, selected_staff))
                 shift_day_index += 1
             
             current_date += timedelta(days=1)
         
-        # Commit all changes
-        self.db.commit()
+        return plan, queue.workload()
+    
+    def _record_metrics(self, operation: str, started: float, plan: List[Tuple[date, str, List[Staff]]]):
+        """
+        Record the duration and size of a finished run.
         
-        # Calculate final workload distribution
-        workload_stats = {
-            staff.name: workload[staff.id]
-            for staff in staff_list
-        }
+        Args:
+            operation: generate, preview or commit
+            started: time.perf_counter() at the start of the run
+            plan: Planned (date, shift_type, selected staff) entries
+        """
+        auto_schedule_duration.observe(time.perf_counter() - started, operation)
+        auto_schedule_schedules.inc(operation, amount=len(plan))
+        auto_schedule_assignments.inc(operation, amount=sum(len(selected_staff) for _, _, selected_staff in plan))
+    
+    def _persist_plan(
+        self,
+        plan: List[Tuple[date, str, List[Staff]]],
+        created_by: str,
+        bulk: bool,
+        progress: Callable[[int, int], None]
+    ):
+        """
+        Write a plan, update the statistics rollup and bump change versions
+        (does not commit).
+        
+        Args:
+            plan: Planned (date, shift_type, selected staff) entries
+            created_by: Creator identifier
+            bulk: Use set-based inserts instead of one flush per shift
+            progress: Called with (schedules written, total schedules)
+        """
+        if bulk:
+            self._write_plan_bulk(plan, created_by, progress)
+        else:
+            self._write_plan(plan, created_by, progress)
+        
+        RollupService(self.db).add_assignments(
+            (duty_date, staff.id, shift_type, 'scheduled')
+            for duty_date, shift_type, selected_staff in plan
+            for staff in selected_staff
+        )
+        ChangeTracker(self.db).bump(
+            ChangeTracker.SCHEDULE,
+            *ChangeTracker.assignment_keys(staff.id for _, _, selected_staff in plan for staff in selected_staff)
+        )
+    
+    def _write_plan(self, plan: List[Tuple[date, str, List[Staff]]], created_by: str, progress: Callable[[int, int], None]):
+        """
+        Write a plan through the ORM, flushing each schedule to get its ID.
+        
+        Args:
+            plan: Planned (date, shift_type, selected staff) entries
+            created_by: Creator identifier
+            progress: Called with (schedules written, total schedules)
+        """
+        for written, (duty_date, shift_type, selected_staff) in enumerate(plan, start=1):
+            # Create schedule
+            schedule = Schedule(
+                schedule_date=duty_date,
+                shift_type=shift_type,
+                created_by=created_by
+            )
+            self.db.add(schedule)
+            self.db.flush()  # Get the schedule ID
+            
+            # Create assignments
+            for staff in selected_staff:
+                assignment = ScheduleAssignment(
+                    staff_id=staff.id,
+                    schedule_id=schedule.id,
+                    duty_date=duty_date,
+                    shift_type=shift_type,
+                    notes=self.ASSIGNMENT_NOTES
+                )
+                self.db.add(assignment)
+            
+            progress(written, len(plan))
+    
+    def _write_plan_bulk(self, plan: List[Tuple[date, str, List[Staff]]], created_by: str, progress: Callable[[int, int], None]):
+        """
+        Write a plan with set-based inserts, BULK_CHUNK_SIZE schedules at a time.
+        
+        Args:
+            plan: Planned (date, shift_type, selected staff) entries
+            created_by: Creator identifier
+            progress: Called with (schedules written, total schedules)
+        """
+        for offset in range(0, len(plan), self.BULK_CHUNK_SIZE):
+            chunk = plan[offset:offset + self.BULK_CHUNK_SIZE]
+            self._insert_chunk(chunk, created_by)
+            progress(offset + len(chunk), len(plan))
+    
+    def _insert_chunk(self, plan: List[Tuple[date, str, List[Staff]]], created_by: str):
+        """
+        Insert schedules and assignments for part of a plan.
+        
+        Schedule IDs come back through a batched INSERT ... RETURNING where the
+        dialect supports it, otherwise from one insert per schedule.
+        
+        Args:
+            plan: Planned (date, shift_type, selected staff) entries
+            created_by: Creator identifier
+        """
+        schedule_rows = [
+            {'schedule_date': duty_date, 'shift_type': shift_type, 'created_by': created_by}
+            for duty_date, shift_type, _ in plan
+        ]
+        
+        # RETURNING order is not guaranteed for batched inserts, so IDs are
+        # matched back to plan entries by (date, shift_type); entries sharing
+        # a key are interchangeable.
+        if self.db.get_bind().dialect.insert_executemany_returning:
+            inserted = self.db.execute(
+                insert(Schedule).returning(Schedule.id, Schedule.schedule_date, Schedule.shift_type),
+                schedule_rows
+            ).all()
+        else:
+            inserted = [
+                (self.db.execute(insert(Schedule).values(**row)).inserted_primary_key[0], row['schedule_date'], row['shift_type'])
+                for row in schedule_rows
+            ]
+        
+        ids_by_key = defaultdict(deque)
+        for schedule_id, schedule_date, shift_type in inserted:
+            ids_by_key[(schedule_date, shift_type)].append(schedule_id)
+        schedule_ids = [ids_by_key[(duty_date, shift_type)].popleft() for duty_date, shift_type, _ in plan]
+        
+        assignment_rows = [
+            {
+                'staff_id': staff.id,
+                'schedule_id': schedule_id,
+                'duty_date': duty_date,
+                'shift_type': shift_type,
+                'notes': self.ASSIGNMENT_NOTES
+            }
+            for schedule_id, (duty_date, shift_type, selected_staff) in zip(schedule_ids, plan)
+            for staff in selected_staff
+        ]
+        if assignment_rows:
+            self.db.execute(insert(ScheduleAssignment), assignment_rows)
+    
+    def _fairness_metrics(self, workload: Dict[int, int]) -> Dict:
+        """
+        Summarize how evenly shifts are spread across staff.
+        
+        Args:
+            workload: Shifts per staff ID
+        
+        Returns:
+            Dictionary with min, max, spread, mean and standard deviation
+        """
+        counts = list(workload.values())
+        mean = sum(counts) / len(counts)
+        variance = sum((count - mean) ** 2 for count in counts) / len(counts)
         
         return {
-            'summary': {
-                'total_schedules': len(created_schedules),
-                'total_assignments': len(created_assignments),
-                'date_range': f"{start_date.isoformat()} to {end_date.isoformat()}",
-                'staff_count': len(staff_list)
-            },
-            'workload_distribution': workload_stats,
-            'schedules': created_schedules[:10],  # Return first 10 as sample
-            'assignments': created_assignments[:20]  # Return first 20 as sample
+            'min_shifts': min(counts),
+            'max_shifts': max(counts),
+            'spread': max(counts) - min(counts),
+            'mean_shifts': round(mean, 2),
+            'std_dev': round(variance ** 0.5, 2)
         }
     
-    def _select_staff_simple(
+    def _build_result(
         self,
+        plan: List[Tuple[date, str, List[Staff]]],
         staff_list: List[Staff],
         workload: Dict[int, int],
-        count: int,
-        shift_day_index: int
-    ) -> List[Staff]:
+        start_date: date,
+        end_date: date
+    ) -> Dict:
         """
-        Select staff members using simple fair distribution algorithm.
-        
-        Algorithm:
-        1. Sort staff by current workload (ascending)
-        2. Add rotation to avoid predictable patterns
-        3. Select the least-worked staff members
+        Build the generation summary returned to the caller.
         
         Args:
-            staff_list: List of all available staff
-            workload: Current workload per staff
-            count: Number of staff to select
-            shift_day_index: Index of current shift for rotation
-            
+            plan: Written (date, shift_type, selected staff) entries
+            staff_list: Staff that were scheduled
+            workload: Final workload per staff ID
+            start_date: Start date of schedule period
+            end_date: End date of schedule period
+        
         Returns:
-            List of selected Staff objects
+            Dictionary with summary, workload distribution and samples
         """
-        # Create list of (staff, workload) tuples
-        staff_workload = [(staff, workload[staff.id]) for staff in staff_list]
+        created_schedules = [
+            {
+                'date': duty_date.isoformat(),
+                'shift_type': shift_type,
+                'staff_count': len(selected_staff)
+            }
+            for duty_date, shift_type, selected_staff in plan
+        ]
+        total_assignments = sum(len(selected_staff) for _, _, selected_staff in plan)
         
-        # Sort by workload (ascending) - least worked first
-        staff_workload.sort(key=lambda x: x[1])
+        created_assignments = (
+            {
+                'staff_name': staff.name,
+                'date': duty_date.isoformat(),
+                'shift_type': shift_type
+            }
+            for duty_date, shift_type, selected_staff in plan
+            for staff in selected_staff
+        )
         
-        # Take the staff with lowest workload
-        selected = [staff for staff, _ in staff_workload[:count]]
-        
-        # Add rotation to avoid always picking same people
-        # If multiple staff have the same workload, rotate through them
-        min_workload = staff_workload[0][1]
-        staff_with_min = [s for s, w in staff_workload if w == min_workload]
-        
-        if len(staff_with_min) > count:
-            # More staff with minimum workload than needed
-            # Rotate selection based on shift index
-            rotation_offset = shift_day_index % len(staff_with_min)
-            rotated = staff_with_min[rotation_offset:] + staff_with_min[:rotation_offset]
-            selected = rotated[:count]
+        # Calculate final workload distribution
+        workload_stats = {
+            staff.name: workload[staff.id]
+            for staff in staff_list
+        }
         
-        return selected
+        return {
+            'summary': {
+                'total_schedules': len(created_schedules),
+                'total_assignments': total_assignments,
+                'date_range': f"{start_date.isoformat()} to {end_date.isoformat()}",
+                'staff_count': len(staff_list)
+            },
+            'workload_distribution': workload_stats,
+            'schedules': created_schedules[:10],  # Return first 10 as sample
+            'assignments': list(islice(created_assignments, 20))  # Return first 20 as sample
+        }
     
     def get_recommended_distribution(self, days: int, shift_types: List[str]) -> Dict:
         """
@@ -205,7 +502,7 @@ class AutoScheduler:
         Args:
             days: Number of days to schedule
             shift_types: List of shift types
-            
+        
         Returns:
             Dictionary with recommendations
         """
@@ -0,0 +1,306 @@
+"""
+Calendar Service - Per-staff iCalendar (RFC 5545) duty feeds.
+Rendered feeds are cached per staff member and dropped as soon as a
+transaction touching that staff member's assignments commits in this
+process; changes made by other processes are picked up by revalidating
+the change versions at most once per revalidation window.
+"""
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from datetime import date, datetime, timedelta
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+from sqlalchemy.orm import Session
+from models.schedule_assignment import ScheduleAssignment
+from models.staff import Staff
+from services.change_tracker import ChangeTracker
+from services.export_service import ExportService
+from services.schedule_service import ScheduleService
+from services.staff_service import StaffService
+
+CalendarFeed = namedtuple('CalendarFeed', ['etag', 'last_modified', 'body'])
+
+class CalendarFeedCache:
+    """
+    Thread-safe LRU cache of rendered feeds keyed by staff ID.
+    Entries carry the change versions they were rendered at and the time
+    they were last checked against the database.
+    """
+    
+    Entry = namedtuple('Entry', ['feed', 'versions', 'feed_date', 'checked_at'])
+    
+    def __init__(self, max_entries: int = 1000, revalidate_seconds: float = 60):
+        """
+        Initialize CalendarFeedCache.
+        
+        Args:
+            max_entries: Maximum number of cached feeds
+            revalidate_seconds: How long an entry is served without
+                checking the change versions
+        """
+        self.max_entries = max_entries
+        self.revalidate_seconds = revalidate_seconds
+        self.entries: "OrderedDict[int, CalendarFeedCache.Entry]" = OrderedDict()
+        self.lock = threading.Lock()
+        # Bumped on invalidation so a render that started before it is not stored
+        self.epoch = 0
+        self.generations: Dict[int, int] = {}
+    
+    def get(self, staff_id: int) -> Optional["CalendarFeedCache.Entry"]:
+        """
+        Get the cached entry of a staff member.
+        
+        Args:
+            staff_id: Staff ID
+        
+        Returns:
+            Cached entry or None on a miss
+        """
+        with self.lock:
+            entry = self.entries.get(staff_id)
+            if entry is not None:
+                self.entries.move_to_end(staff_id)
+            return entry
+    
+    def generation(self, staff_id: int) -> Tuple[int, int]:
+        """
+        Get the invalidation generation of a staff member's entry.
+        
+        Returns:
+            Token to pass to put() for the render about to start
+        """
+        with self.lock:
+            return self.epoch, self.generations.get(staff_id, 0)
+    
+    def put(self, staff_id: int, generation: Tuple[int, int], entry: "CalendarFeedCache.Entry"):
+        """
+        Store an entry unless the staff member was invalidated since its
+        render started.
+        
+        Args:
+            staff_id: Staff ID
+            generation: Value of generation() taken before rendering
+            entry: Entry to cache
+        """
+        with self.lock:
+            if generation != (self.epoch, self.generations.get(staff_id, 0)):
+                return
+            self.entries[staff_id] = entry
+            self.entries.move_to_end(staff_id)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+    
+    def touch(self, staff_id: int, entry: "CalendarFeedCache.Entry"):
+        """Mark an entry as checked now if it is still the cached one."""
+        with self.lock:
+            if self.entries.get(staff_id) is entry:
+                self.entries[staff_id] = entry._replace(checked_at=time.monotonic())
+    
+    def invalidate(self, names: Set[str]):
+        """
+        Drop the feeds affected by committed changes.
+        
+        Args:
+            names: Change counter names bumped by the transaction
+        """
+        with self.lock:
+            if ChangeTracker.STAFF in names:
+                # Staff names appear in every feed
+                self.epoch += 1
+                self.entries.clear()
+                self.generations.clear()
+                return
+            
+            for name in names:
+                staff_id = self._staff_id(name)
+                if staff_id is not None:
+                    # Also for uncached staff, whose feed may be rendering
+                    self.entries.pop(staff_id, None)
+                    self.generations[staff_id] = self.generations.get(staff_id, 0) + 1
+    
+    def clear(self):
+        """Remove all entries."""
+        self.invalidate({ChangeTracker.STAFF})
+    
+    def _staff_id(self, name: str) -> Optional[int]:
+        """Staff ID of a per-staff assignment counter name."""
+        prefix = ChangeTracker.staff_assignments('')
+        if name.startswith(prefix):
+            return int(name[len(prefix):])
+        return None
+
+calendar_feed_cache = CalendarFeedCache(
+    max_entries=int(os.getenv('FEED_CACHE_SIZE', 1000)),
+    revalidate_seconds=float(os.getenv('FEED_REVALIDATE_SECONDS', 60))
+)
+ChangeTracker.subscribe(calendar_feed_cache.invalidate)
+
+class CalendarService:
+    """
+    Service class for staff duty calendar feeds.
+    """
+    
+    PRODID = "-//shift-duty-system//Duty Calendar//ZH"
+    UID_DOMAIN = "shift-duty-system"
+    # Days of past duties included in a feed
+    PAST_DAYS = int(os.getenv('FEED_PAST_DAYS', 90))
+    # Maximum line length in octets, excluding the CRLF
+    LINE_OCTETS = 75
+    
+    def __init__(self, db: Session, cache: CalendarFeedCache = calendar_feed_cache):
+        """
+        Initialize CalendarService with database session.
+        
+        Args:
+            db: Database session
+            cache: Feed cache to use
+        """
+        self.db = db
+        self.tracker = ChangeTracker(db)
+        self.cache = cache
+    
+    def get_feed(self, staff_id: int) -> Optional[CalendarFeed]:
+        """
+        Get the calendar feed of a staff member.
+        
+        A cached feed is returned without touching the database while it
+        is inside the revalidation window; after that, one version query
+        decides whether it can still be used.
+        
+        Args:
+            staff_id: Staff ID
+        
+        Returns:
+            Rendered feed, or None if the staff member does not exist
+        """
+        today = date.today()
+        entry = self.cache.get(staff_id)
+        if entry is not None and entry.feed_date == today:
+            if time.monotonic() - entry.checked_at < self.cache.revalidate_seconds:
+                return entry.feed
+            if self._versions(staff_id) == entry.versions:
+                self.cache.touch(staff_id, entry)
+                return entry.feed
+        
+        generation = self.cache.generation(staff_id)
+        # Versions are read before the data, so a feed is never cached
+        # under versions newer than the data it was rendered from
+        versions = self._versions(staff_id)
+        staff = StaffService(self.db).get_staff_by_id(staff_id)
+        if staff is None:
+            return None
+        
+        assignments = ScheduleService(self.db).get_staff_schedule(
+            staff_id, start_date=today - timedelta(days=self.PAST_DAYS)
+        )
+        feed = self._build_feed(staff, assignments, versions, today)
+        self.cache.put(staff_id, generation, CalendarFeedCache.Entry(feed, versions, today, time.monotonic()))
+        return feed
+    
+    def _versions(self, staff_id: int) -> Tuple[Tuple[int, Optional[datetime]], ...]:
+        """Change versions a staff member's feed depends on, in one query."""
+        return tuple(self.tracker.versions(ChangeTracker.staff_assignments(staff_id), ChangeTracker.STAFF).values())
+    
+    def _build_feed(
+        self,
+        staff: Staff,
+        assignments: List[ScheduleAssignment],
+        versions: Tuple[Hashable, ...],
+        feed_date: date
+    ) -> CalendarFeed:
+        """
+        Render a feed and its validators.
+        
+        Args:
+            staff: Staff member
+            assignments: Assignments to include, ordered by date
+            versions: Change versions the feed was rendered at
+            feed_date: Day the feed window is relative to
+        
+        Returns:
+            Rendered feed
+        """
+        # The window moves daily, so the day is part of both validators
+        changed = [updated_at for _, updated_at in versions if updated_at is not None]
+        last_modified = max(changed + [datetime.combine(feed_date, datetime.min.time())])
+        etag_key = f"{staff.id}|{feed_date.isoformat()}|{versions!r}"
+        etag = f'"{hashlib.sha1(etag_key.encode()).hexdigest()[:20]}"'
+        
+        lines = [
+            "BEGIN:VCALENDAR",
+            "VERSION:2.0",
+            f"PRODID:{self.PRODID}",
+            "CALSCALE:GREGORIAN",
+            "METHOD:PUBLISH",
+            f"X-WR-CALNAME:{self._escape(f'{staff.name} 值班表')}"
+        ]
+        stamp = self._format_datetime(last_modified)
+        for assignment in assignments:
+            lines.extend(self._event_lines(assignment, stamp))
+        lines.append("END:VCALENDAR")
+        
+        body = "".join(self._fold(line) + "\r\n" for line in lines)
+        return CalendarFeed(etag, last_modified, body.encode('utf-8'))
+    
+    def _event_lines(self, assignment: ScheduleAssignment, stamp: str) -> List[str]:
+        """
+        Render one assignment as an all-day VEVENT.
+        
+        Args:
+            assignment: Assignment to render
+            stamp: DTSTAMP value
+        
+        Returns:
+            Unfolded content lines
+        """
+        shift = ExportService.SHIFT_LABELS.get(assignment.shift_type, assignment.shift_type)
+        lines = [
+            "BEGIN:VEVENT",
+            f"UID:assignment-{assignment.id}@{self.UID_DOMAIN}",
+            f"DTSTAMP:{stamp}",
+            f"DTSTART;VALUE=DATE:{assignment.duty_date.strftime('%Y%m%d')}",
+            f"DTEND;VALUE=DATE:{(assignment.duty_date + timedelta(days=1)).strftime('%Y%m%d')}",
+            f"SUMMARY:{self._escape(f'值班：{shift}')}",
+            f"STATUS:{'CANCELLED' if assignment.status == 'cancelled' else 'CONFIRMED'}",
+            "TRANSP:TRANSPARENT"
+        ]
+        if assignment.notes:
+            lines.append(f"DESCRIPTION:{self._escape(assignment.notes)}")
+        lines.append("END:VEVENT")
+        return lines
+    
+    def _escape(self, text: str) -> str:
+        """Escape a TEXT property value."""
+        return text.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")\
+            .replace("\r\n", "\\n").replace("\n", "\\n").replace("\r", "\\n")
+    
+    def _format_datetime(self, value: datetime) -> str:
+        """Format a naive UTC datetime as an iCalendar UTC date-time."""
+        return value.strftime('%Y%m%dT%H%M%SZ')
+    
+    def _fold(self, line: str) -> str:
+        """
+        Fold a content line to at most LINE_OCTETS octets per line
+        without splitting multi-byte characters.
+        """
+        if len(line.encode('utf-8')) <= self.LINE_OCTETS:
+            return line
+        
+        parts = []
+        current = ""
+        # Continuation lines start with a space that counts towards the limit
+        limit = self.LINE_OCTETS
+        size = 0
+        for char in line:
+            char_size = len(char.encode('utf-8'))
+            if size + char_size > limit:
+                parts.append(current)
+                current = ""
+                limit = self.LINE_OCTETS - 1
+                size = 0
+            current += char
+            size += char_size
+        parts.append(current)
+        return "\r\n ".join(parts)
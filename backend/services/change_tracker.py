@@ -0,0 +1,147 @@
+"""
+Change Tracker - Per-table change counters for cache invalidation.
+Write paths bump the counters of the tables they modify; readers compare
+counters to decide whether a cached result is still current. In-process
+caches can also subscribe to the names bumped by each committed transaction.
+"""
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Set, Tuple
+from sqlalchemy import event, insert, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from models.change_version import ChangeVersion
+
+# Session.info key collecting names bumped in the current transaction
+PENDING_CHANGES = 'change_tracker.pending'
+
+_subscribers: List[Callable[[Set[str]], None]] = []
+
+class ChangeTracker:
+    """
+    Service class for change version counters.
+    """
+    
+    STAFF = 'staff'
+    SCHEDULE = 'schedule'
+    ASSIGNMENT = 'schedule_assignment'
+    
+    UPSERT_DIALECTS = {
+        'sqlite': sqlite.insert,
+        'postgresql': postgresql.insert
+    }
+    
+    def __init__(self, db: Session):
+        """
+        Initialize ChangeTracker with database session.
+        
+        Args:
+            db: Database session
+        """
+        self.db = db
+    
+    @classmethod
+    def staff_assignments(cls, staff_id: int) -> str:
+        """Counter name for one staff member's assignments."""
+        return f"{cls.ASSIGNMENT}:staff:{staff_id}"
+    
+    @classmethod
+    def assignment_keys(cls, staff_ids: Iterable[int]) -> List[str]:
+        """
+        Counter names to bump when assignments of the given staff change.
+        
+        Args:
+            staff_ids: Staff whose assignments changed
+        
+        Returns:
+            The assignment table counter plus one counter per staff member
+        """
+        return [cls.ASSIGNMENT] + [cls.staff_assignments(staff_id) for staff_id in sorted(set(staff_ids))]
+    
+    @staticmethod
+    def subscribe(callback: Callable[[Set[str]], None]):
+        """
+        Call a function with the bumped names after every commit that bumped any.
+        
+        Args:
+            callback: Receives the set of bumped counter names
+        """
+        _subscribers.append(callback)
+    
+    def bump(self, *names: str):
+        """
+        Increment the counters of the given tables (does not commit).
+        
+        Call inside the transaction that makes the change so the bump is
+        committed or rolled back together with it. Missing counters start
+        at 1.
+        
+        Args:
+            names: Tracked table names
+        """
+        names = sorted(set(names))
+        now = datetime.utcnow()
+        
+        dialect_insert = self.UPSERT_DIALECTS.get(self.db.get_bind().dialect.name)
+        if dialect_insert:
+            statement = dialect_insert(ChangeVersion)
+            statement = statement.on_conflict_do_update(
+                index_elements=['name'],
+                set_={'version': ChangeVersion.version + 1, 'updated_at': statement.excluded.updated_at}
+            )
+            self.db.execute(statement, [{'name': name, 'version': 1, 'updated_at': now} for name in names])
+        else:
+            result = self.db.execute(
+                update(ChangeVersion)
+                .where(ChangeVersion.name.in_(names))
+                .values(version=ChangeVersion.version + 1, updated_at=now)
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount < len(names):
+                existing = {name for (name,) in self.db.query(ChangeVersion.name).filter(ChangeVersion.name.in_(names))}
+                missing = [{'name': name, 'version': 1, 'updated_at': now} for name in names if name not in existing]
+                self.db.execute(insert(ChangeVersion), missing)
+        
+        self.db.info.setdefault(PENDING_CHANGES, set()).update(names)
+    
+    def versions(self, *names: str) -> Dict[str, Tuple[int, datetime]]:
+        """
+        Read the counters of the given tables in one query.
+        
+        Args:
+            names: Tracked table names
+        
+        Returns:
+            Dictionary mapping table name to (version, updated_at);
+            untracked tables report (0, None)
+        """
+        rows = self.db.query(ChangeVersion.name, ChangeVersion.version, ChangeVersion.updated_at)\
+            .filter(ChangeVersion.name.in_(names))\
+            .all()
+        found = {name: (version, updated_at) for name, version, updated_at in rows}
+        return {name: found.get(name, (0, None)) for name in names}
+    
+    def version(self, *names: str) -> Tuple[int, ...]:
+        """
+        Get a combined version for the given tables.
+        
+        Args:
+            names: Tracked table names
+        
+        Returns:
+            Tuple of counters in the order the names were given
+        """
+        versions = self.versions(*names)
+        return tuple(versions[name][0] for name in names)
+
+@event.listens_for(Session, 'after_commit')
+def _notify_subscribers(session: Session):
+    """Pass the names bumped in the committed transaction to subscribers."""
+    names = session.info.pop(PENDING_CHANGES, None)
+    if names:
+        for callback in _subscribers:
+            callback(names)
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_pending(session: Session):
+    """Forget names bumped in a rolled back transaction."""
+    session.info.pop(PENDING_CHANGES, None)
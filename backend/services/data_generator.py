@@ -0,0 +1,230 @@
+"""
+Data Generator - Deterministic synthetic staff and schedule data.
+Produces production-sized datasets for benchmarks and load tests with
+set-based inserts; the same parameters and seed always produce the same
+rows.
+"""
+import random
+from datetime import date, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+from sqlalchemy import func, insert, text
+from sqlalchemy.orm import Session
+from models.schedule import Schedule
+from models.schedule_assignment import ScheduleAssignment
+from models.staff import Staff
+from services.change_tracker import ChangeTracker
+from services.rollup_service import RollupService
+
+class DataGenerator:
+    """
+    Service class for bulk-loading synthetic data.
+    """
+    
+    SURNAMES = "王李张刘陈杨黄赵吴周徐孙马朱胡郭何高林罗郑梁谢宋唐许韩冯邓曹彭曾肖田董袁潘于蒋蔡余杜叶程苏魏吕丁任沈姚卢姜崔钟谭陆汪范金石廖贾夏韦付方白邹孟熊秦邱江尹薛闫段雷侯龙史陶黎贺顾毛郝龚邵万钱严覃武戴莫孔向汤"
+    GIVEN_NAME_CHARS = "伟芳娜秀敏静丽强磊军洋勇艳杰娟涛明超兰霞平刚桂英华玉萍红建文辉力斌宇浩凯鹏飞欣怡佳琪晨阳雪梅婷雨轩子涵思博晓东海波"
+    POSITIONS = (("护士", 40), ("医生", 25), ("技师", 10), ("药剂师", 8), ("工程师", 7), ("主管", 6), ("经理", 4))
+    NOTES = ("换班", "加班", "顶班", "带教", "培训后上岗")
+    
+    DEFAULT_STATUS_MIX = {'completed': 0.85, 'cancelled': 0.05, 'scheduled': 0.10}
+    # Rows buffered per INSERT executemany
+    CHUNK_SIZE = 10000
+    
+    def __init__(self, db: Session):
+        """
+        Initialize DataGenerator with database session.
+        
+        Args:
+            db: Database session
+        """
+        self.db = db
+    
+    def generate(
+        self,
+        staff_count: int = 200,
+        start_date: date = date(2024, 1, 1),
+        days: int = 365,
+        shift_types: Tuple[str, ...] = ('morning', 'afternoon', 'night'),
+        staff_per_shift: int = 3,
+        status_mix: Optional[Dict[str, float]] = None,
+        as_of: Optional[date] = None,
+        inactive_ratio: float = 0.05,
+        notes_ratio: float = 0.02,
+        seed: int = 42
+    ) -> Dict:
+        """
+        Insert synthetic staff, schedules and assignments and rebuild the rollup.
+        
+        Rows are appended after any existing data. Staff are assigned from
+        a permutation reshuffled every day, so nobody holds two shifts on
+        the same day while there are enough active staff; a shift gets at
+        most as many people as are active.
+        
+        Args:
+            staff_count: Staff members to create
+            start_date: First scheduled day
+            days: Number of scheduled days
+            shift_types: Shift types created per day
+            staff_per_shift: Staff assigned to each shift
+            status_mix: Assignment status weights (default DEFAULT_STATUS_MIX)
+            as_of: If given, assignments after this day that the mix
+                would complete stay scheduled
+            inactive_ratio: Fraction of staff that is soft-deleted
+                (they keep their past assignments only)
+            notes_ratio: Fraction of assignments with a note
+            seed: Random seed
+        
+        Returns:
+            Dictionary with row counts and the covered date range
+        
+        Raises:
+            ValueError: If a parameter is out of range
+        """
+        status_mix = status_mix or self.DEFAULT_STATUS_MIX
+        if staff_count < 1 or days < 1 or staff_per_shift < 0 or not shift_types:
+            raise ValueError("staff_count and days must be positive and shift_types non-empty")
+        if any(weight < 0 for weight in status_mix.values()) or sum(status_mix.values()) <= 0:
+            raise ValueError("status_mix weights must be non-negative and not all zero")
+        
+        rng = random.Random(seed)
+        staff_base = self.db.query(func.coalesce(func.max(Staff.id), 0)).scalar()
+        schedule_base = self.db.query(func.coalesce(func.max(Schedule.id), 0)).scalar()
+        
+        staff_rows = self._staff_rows(rng, staff_count, staff_base, inactive_ratio)
+        self._insert(Staff, staff_rows)
+        
+        # Inactive staff stop being scheduled after a random day
+        active_until = {
+            row['id']: start_date + timedelta(days=rng.randrange(days)) if not row['is_active'] else None
+            for row in staff_rows
+        }
+        schedules = assignments = 0
+        schedule_chunk, assignment_chunk = [], []
+        shifts = self._iter_shifts(
+            rng, start_date, days, shift_types, staff_per_shift, status_mix, as_of, notes_ratio,
+            schedule_base, active_until
+        )
+        for schedule_row, assignment_rows in shifts:
+            schedule_chunk.append(schedule_row)
+            assignment_chunk.extend(assignment_rows)
+            if len(assignment_chunk) >= self.CHUNK_SIZE or len(schedule_chunk) >= self.CHUNK_SIZE:
+                schedules += self._insert(Schedule, schedule_chunk)
+                assignments += self._insert(ScheduleAssignment, assignment_chunk)
+                schedule_chunk, assignment_chunk = [], []
+        schedules += self._insert(Schedule, schedule_chunk)
+        assignments += self._insert(ScheduleAssignment, assignment_chunk)
+        
+        self._sync_sequences()
+        ChangeTracker(self.db).bump(
+            ChangeTracker.STAFF,
+            ChangeTracker.SCHEDULE,
+            *ChangeTracker.assignment_keys(row['id'] for row in staff_rows)
+        )
+        # Commits the whole load together with the rollup
+        RollupService(self.db).rebuild()
+        
+        return {
+            'staff': staff_count,
+            'schedules': schedules,
+            'assignments': assignments,
+            'start_date': start_date.isoformat(),
+            'end_date': (start_date + timedelta(days=days - 1)).isoformat(),
+            'seed': seed
+        }
+    
+    def _staff_rows(self, rng: random.Random, staff_count: int, id_base: int, inactive_ratio: float) -> List[Dict]:
+        """Build staff rows with explicit IDs after id_base."""
+        positions = [position for position, _ in self.POSITIONS]
+        weights = [weight for _, weight in self.POSITIONS]
+        rows = []
+        for index in range(staff_count):
+            given_name = "".join(rng.choice(self.GIVEN_NAME_CHARS) for _ in range(rng.choice((1, 2, 2))))
+            rows.append({
+                'id': id_base + index + 1,
+                'name': rng.choice(self.SURNAMES) + given_name,
+                'age': rng.randint(22, 58),
+                'position': rng.choices(positions, weights)[0],
+                'is_active': rng.random() >= inactive_ratio
+            })
+        return rows
+    
+    def _iter_shifts(
+        self,
+        rng: random.Random,
+        start_date: date,
+        days: int,
+        shift_types: Tuple[str, ...],
+        staff_per_shift: int,
+        status_mix: Dict[str, float],
+        as_of: Optional[date],
+        notes_ratio: float,
+        id_base: int,
+        active_until: Dict[int, Optional[date]]
+    ) -> Iterator[Tuple[Dict, List[Dict]]]:
+        """
+        Build schedule rows with explicit IDs after id_base, day by day.
+        
+        Yields:
+            (schedule row, assignment rows) per shift
+        """
+        statuses = list(status_mix)
+        weights = [status_mix[status] for status in statuses]
+        # Duties after as_of cannot be completed yet; that share stays scheduled
+        future_mix = dict(status_mix)
+        future_mix['scheduled'] = future_mix.get('scheduled', 0) + future_mix.pop('completed', 0)
+        future_statuses = list(future_mix)
+        future_weights = [future_mix[status] for status in future_statuses]
+        
+        schedule_id = id_base
+        for day in range(days):
+            duty_date = start_date + timedelta(days=day)
+            available = [
+                staff_id for staff_id, until in active_until.items()
+                if until is None or until >= duty_date
+            ]
+            rng.shuffle(available)
+            if as_of is not None and duty_date > as_of:
+                day_statuses, day_weights = future_statuses, future_weights
+            else:
+                day_statuses, day_weights = statuses, weights
+            
+            # Shifts are never staffed twice with the same person, so they
+            # stay short when fewer staff are active
+            shift_size = min(staff_per_shift, len(available))
+            slot = 0
+            for shift_type in shift_types:
+                schedule_id += 1
+                assignment_rows = []
+                for _ in range(shift_size):
+                    assignment_rows.append({
+                        'staff_id': available[slot % len(available)],
+                        'schedule_id': schedule_id,
+                        'duty_date': duty_date,
+                        'shift_type': shift_type,
+                        'status': rng.choices(day_statuses, day_weights)[0],
+                        'notes': rng.choice(self.NOTES) if rng.random() < notes_ratio else None
+                    })
+                    slot += 1
+                yield (
+                    {'id': schedule_id, 'schedule_date': duty_date, 'shift_type': shift_type, 'created_by': 'data-generator'},
+                    assignment_rows
+                )
+    
+    def _sync_sequences(self):
+        """Move PostgreSQL ID sequences past the explicitly inserted IDs."""
+        if self.db.get_bind().dialect.name != 'postgresql':
+            return
+        for table in (Staff.__tablename__, Schedule.__tablename__):
+            self.db.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT MAX(id) FROM {table}))"
+            ))
+    
+    def _insert(self, model, rows: List[Dict]) -> int:
+        """
+        Insert rows with one executemany (does not commit).
+        
+        Returns:
+            Number of rows inserted
+        """
+        if rows:
+            self.db.execute(insert(model), rows)
+        return len(rows)
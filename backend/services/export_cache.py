@@ -0,0 +1,209 @@
+"""
+Export Cache - Content-addressed on-disk cache for generated export files.
+Files are keyed by (format, date range, data versions), evicted least
+recently used first once the directory exceeds its size cap, and
+concurrent misses for the same key share a single build.
+"""
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from datetime import date
+from typing import IO, Callable, Dict, Hashable, Optional
+from sqlalchemy.orm import Session
+from database.database import BACKEND_DIR
+from monitoring.metrics import export_duration, export_rows
+from services.change_tracker import ChangeTracker
+from services.export_service import ExportService
+
+class ExportCache:
+    """
+    Thread-safe export file cache in a dedicated directory.
+    File modification times record last use for LRU eviction.
+    """
+    
+    def __init__(self, directory: str, max_bytes: int):
+        """
+        Initialize ExportCache.
+        
+        Args:
+            directory: Cache directory (created on first build)
+            max_bytes: Total size the cached files are evicted down to
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.building: Dict[str, Future] = {}
+    
+    def open(self, key: Hashable, extension: str, build: Callable[[], IO[bytes]]) -> IO[bytes]:
+        """
+        Open the cached file for a key, building it on a miss.
+        
+        Args:
+            key: Cache key; must fully determine the file contents
+            extension: File extension of the export format
+            build: Called on a miss to produce the file contents
+        
+        Returns:
+            Binary file opened for reading; the caller must close it
+        """
+        path = os.path.join(self.directory, f"{hashlib.sha256(repr(key).encode()).hexdigest()}.{extension}")
+        try:
+            file = open(path, 'rb')
+        except FileNotFoundError:
+            return self._build(path, key, extension, build)
+        
+        try:
+            # Mark as recently used
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return file
+    
+    def _build(self, path: str, key: Hashable, extension: str, build: Callable[[], IO[bytes]]) -> IO[bytes]:
+        """
+        Build a missing file, or wait for a build of the same key already running.
+        
+        Raises:
+            Exception: Whatever the build raised (also for coalesced waiters)
+        """
+        with self.lock:
+            future = self.building.get(path)
+            owner = future is None
+            if owner:
+                future = self.building[path] = Future()
+        
+        if not owner:
+            future.result()
+            return self.open(key, extension, build)
+        
+        temp_path = None
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with build() as source:
+                fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+                with os.fdopen(fd, 'wb') as target:
+                    shutil.copyfileobj(source, target)
+            os.replace(temp_path, path)
+            temp_path = None
+            file = open(path, 'rb')
+            future.set_result(None)
+        except BaseException as e:
+            future.set_exception(e)
+            if temp_path:
+                os.remove(temp_path)
+            raise
+        finally:
+            with self.lock:
+                del self.building[path]
+        
+        self._evict(keep=path)
+        return file
+    
+    def _evict(self, keep: Optional[str] = None):
+        """
+        Remove least recently used files until the cache fits its size cap.
+        
+        Args:
+            keep: File that must not be removed (the one just built)
+        """
+        with self.lock:
+            entries = []
+            for entry in os.scandir(self.directory):
+                if entry.is_file() and not entry.name.endswith('.tmp'):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+            
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                if path == keep:
+                    continue
+                try:
+                    # Open handles keep working after removal on POSIX
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+
+export_cache = ExportCache(
+    directory=os.getenv('EXPORT_CACHE_DIR', os.path.join(BACKEND_DIR, 'export_cache')),
+    max_bytes=int(os.getenv('EXPORT_CACHE_MAX_MB', 256)) * 1024 * 1024
+)
+
+class CachedExportService:
+    """
+    ExportService with generated files cached per (format, date range).
+    The data version is read first, so a file is never cached under a
+    version older than the data it was built from. Version timestamps are
+    part of the key because the files outlive the process and counters
+    restart when the database is recreated.
+    """
+    
+    DEPENDS_ON = ExportService.DATA_TABLES
+    
+    def __init__(self, db: Session, cache: ExportCache = export_cache):
+        """
+        Initialize CachedExportService with database session.
+        
+        Args:
+            db: Database session
+            cache: Cache to use
+        """
+        self.service = ExportService(db)
+        self.tracker = ChangeTracker(db)
+        self.cache = cache
+    
+    def export_to_excel(self, start_date: date = None, end_date: date = None) -> IO[bytes]:
+        """Cached ExportService.export_to_excel."""
+        return self._cached('xlsx', 'xlsx', start_date, end_date, self.service.export_to_excel)
+    
+    def export_to_parquet(self, start_date: date = None, end_date: date = None) -> IO[bytes]:
+        """Cached ExportService.export_to_parquet."""
+        return self._cached('parquet', 'parquet', start_date, end_date, self.service.export_to_parquet)
+    
+    def export_roster(self, start_date: date, end_date: date) -> IO[bytes]:
+        """Cached ExportService.export_roster."""
+        return self._cached('roster', 'xlsx', start_date, end_date, self.service.export_roster)
+    
+    def _cached(
+        self,
+        export_format: str,
+        extension: str,
+        start_date: Optional[date],
+        end_date: Optional[date],
+        build: Callable
+    ) -> IO[bytes]:
+        """
+        Open a cached export or build and store it.
+        
+        Args:
+            export_format: Export format
+            extension: File extension of the export format
+            start_date: Start date filter
+            end_date: End date filter
+            build: ExportService method to call on a miss
+        
+        Returns:
+            Binary file opened for reading
+        """
+        started = time.perf_counter()
+        built = False
+        
+        def build_file() -> IO[bytes]:
+            nonlocal built
+            built = True
+            return build(start_date=start_date, end_date=end_date)
+        
+        versions = tuple(self.tracker.versions(*self.DEPENDS_ON).values())
+        key = (export_format, start_date, end_date, versions)
+        file = self.cache.open(key, extension, build_file)
+        
+        export_duration.observe(time.perf_counter() - started, export_format, 'miss' if built else 'hit')
+        if built:
+            export_rows.inc(export_format, amount=self.service.rows_exported)
+        return file
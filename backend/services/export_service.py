@@ -1,23 +1,71 @@
 """
-Export Service - Export schedules to Excel format.
+Export Service - Export schedules to Excel, CSV, NDJSON and Parquet formats,
+plus a staff x date roster matrix.
 Demonstrates File Generation and Data Processing capabilities.
 """
-from typing import List, Optional
-from datetime import date
+from typing import IO, Iterator, List, Optional, Tuple
+from datetime import date, timedelta
+from tempfile import SpooledTemporaryFile
+from sqlalchemy import Row, and_, or_, select
 from sqlalchemy.orm import Session
 from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
+from openpyxl.utils import get_column_letter
+import pyarrow as pa
+import pyarrow.parquet as pq
 from models.schedule import Schedule
 from models.schedule_assignment import ScheduleAssignment
-import os
-from datetime import datetime
+from models.staff import Staff
+from services.change_tracker import ChangeTracker
+import csv
+import io
+import json
 
 class ExportService:
     """
     Service class for exporting schedules to various formats.
-    Currently supports Excel (XLSX) export.
+    Supports a styled Excel (XLSX) report and raw CSV, NDJSON and Parquet
+    rows, all read from the same chunked export query, plus an Excel
+    roster matrix (staff x day).
     """
     
+    # Raw export columns, one row per assignment (or per empty schedule)
+    COLUMNS = ('schedule_id', 'schedule_date', 'shift_type', 'assignment_id', 'staff_id', 'staff_name', 'status', 'notes')
+    
+    # Rows fetched per round trip while streaming the export query
+    YIELD_PER = 1000
+    # Rows per Parquet row group
+    PARQUET_ROW_GROUP_SIZE = 20000
+    # Exports larger than this spill from memory to a temporary file
+    SPOOL_MAX_SIZE = 8 * 1024 * 1024
+    
+    COLUMN_WIDTHS = {'A': 12, 'B': 15, 'C': 20, 'D': 15, 'E': 30}
+    # Excel report column headers and display labels
+    HEADERS = ('日期', '班次', '值班人员', '状态', '备注')
+    SHIFT_LABELS = {
+        'morning': '早班',
+        'afternoon': '中班',
+        'night': '晚班',
+        '全天': '全天'
+    }
+    STATUS_LABELS = {
+        'scheduled': '已排班',
+        'completed': '已完成',
+        'cancelled': '已取消'
+    }
+    # Staff column text for schedules without assignments
+    UNASSIGNED = "未分配"
+    
+    # Roster cell codes; each shift type owns one bit of a cell's mask and
+    # unknown shift types share the last bit
+    ROSTER_CODES = (('morning', '早'), ('afternoon', '中'), ('night', '晚'), ('全天', '全'))
+    ROSTER_OTHER_BIT, ROSTER_OTHER_CODE = 0x80, '*'
+    # Excel's column limit minus the name, position and total columns
+    ROSTER_MAX_DAYS = 16384 - 3
+    # Tables whose last change time is printed in the workbooks
+    DATA_TABLES = (ChangeTracker.SCHEDULE, ChangeTracker.ASSIGNMENT, ChangeTracker.STAFF)
+    
     def __init__(self, db: Session):
         """
         Initialize ExportService with database session.
@@ -26,52 +74,39 @@ class ExportService:
             db: Database session
         """
         self.db = db
+        # Rows produced by this instance's exports (for metrics)
+        self.rows_exported = 0
     
-    def export_to_excel(self, start_date: Optional[date] = None, end_date: Optional[date] = None) -> str:
+    def export_to_excel(self, start_date: Optional[date] = None, end_date: Optional[date] = None) -> IO[bytes]:
         """
-        Export schedules to Excel file.
+        Export schedules to an Excel workbook.
+        
+        Rows are streamed from a single joined query into a write-only
+        worksheet, so memory stays bounded regardless of the date range.
         
         Args:
             start_date: Start date filter
             end_date: End date filter
-            
+        
         Returns:
-            Path to the generated Excel file
+            Temporary file holding the XLSX bytes, positioned at the start;
+            the caller must close it (which also deletes it)
         """
-        # Create workbook
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "排班表"
+        wb = Workbook(write_only=True)
+        self._register_styles(wb)
+        ws = wb.create_sheet("排班表")
         
         # Set column widths
-        ws.column_dimensions['A'].width = 12
-        ws.column_dimensions['B'].width = 15
-        ws.column_dimensions['C'].width = 20
-        ws.column_dimensions['D'].width = 15
-        ws.column_dimensions['E'].width = 30
-        
-        # Define styles
-        header_font = Font(bold=True, color="FFFFFF", size=12)
-        header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-        header_alignment = Alignment(horizontal="center", vertical="center")
-        border = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
-        )
+        for column, width in self.COLUMN_WIDTHS.items():
+            ws.column_dimensions[column].width = width
         
         # Add title
-        ws.merge_cells('A1:E1')
-        title_cell = ws['A1']
-        title_cell.value = "值班排班表"
-        title_cell.font = Font(bold=True, size=16)
-        title_cell.alignment = Alignment(horizontal="center", vertical="center")
+        ws.merged_cells.add('A1:E1')
         ws.row_dimensions[1].height = 30
+        ws.append([self._cell(ws, "值班排班表", 'export_title')])
         
         # Add export info
-        ws.merge_cells('A2:E2')
-        info_cell = ws['A2']
+        ws.merged_cells.add('A2:E2')
         date_range = ""
         if start_date and end_date:
             date_range = f"({start_date.isoformat()} 至 {end_date.isoformat()})"
@@ -79,83 +114,371 @@ class ExportService:
             date_range = f"(从 {start_date.isoformat()})"
         elif end_date:
             date_range = f"(至 {end_date.isoformat()})"
-        info_cell.value = f"导出时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} {date_range}"
-        info_cell.alignment = Alignment(horizontal="center")
+        info = f"数据更新时间: {self._data_updated_at()} {date_range}"
+        ws.append([self._cell(ws, info, 'export_info')])
+        
+        # Add headers
+        headers = self.HEADERS
+        ws.append([self._cell(ws, header, 'export_header') for header in headers])
+        
+        # Add data; append() serializes the row immediately, so one styled
+        # cell per column can be reused for every row
+        cells = [self._cell(ws, None, 'export_cell') for _ in headers]
+        for values in self._iter_rows(start_date, end_date):
+            for cell, value in zip(cells, values):
+                cell.value = value
+            ws.append(cells)
+        
+        output = SpooledTemporaryFile(max_size=self.SPOOL_MAX_SIZE)
+        wb.save(output)
+        output.seek(0)
+        
+        return output
+    
+    def export_to_csv(self, start_date: Optional[date] = None, end_date: Optional[date] = None) -> Iterator[str]:
+        """
+        Stream raw export rows as CSV.
+        
+        Args:
+            start_date: Start date filter
+            end_date: End date filter
+        
+        Yields:
+            CSV text, one chunk per fetched batch (the first includes the header)
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(self.COLUMNS)
+        
+        for chunk in self._iter_record_chunks(start_date, end_date, self.YIELD_PER):
+            writer.writerows(chunk)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        
+        if buffer.tell():
+            yield buffer.getvalue()
+    
+    def export_to_ndjson(self, start_date: Optional[date] = None, end_date: Optional[date] = None) -> Iterator[str]:
+        """
+        Stream raw export rows as newline-delimited JSON.
+        
+        Args:
+            start_date: Start date filter
+            end_date: End date filter
+        
+        Yields:
+            NDJSON text, one chunk per fetched batch
+        """
+        for chunk in self._iter_record_chunks(start_date, end_date, self.YIELD_PER):
+            yield "".join(
+                json.dumps({**row._asdict(), 'schedule_date': row.schedule_date.isoformat()}, ensure_ascii=False) + "\n"
+                for row in chunk
+            )
+    
+    def export_to_parquet(self, start_date: Optional[date] = None, end_date: Optional[date] = None) -> IO[bytes]:
+        """
+        Export raw rows to a Parquet file, one row group per fetched batch.
+        
+        Args:
+            start_date: Start date filter
+            end_date: End date filter
+        
+        Returns:
+            Temporary file holding the Parquet bytes, positioned at the start;
+            the caller must close it (which also deletes it)
+        """
+        schema = pa.schema([
+            ('schedule_id', pa.int64()),
+            ('schedule_date', pa.date32()),
+            ('shift_type', pa.string()),
+            ('assignment_id', pa.int64()),
+            ('staff_id', pa.int64()),
+            ('staff_name', pa.string()),
+            ('status', pa.string()),
+            ('notes', pa.string())
+        ])
+        
+        output = SpooledTemporaryFile(max_size=self.SPOOL_MAX_SIZE)
+        with pq.ParquetWriter(output, schema) as writer:
+            for chunk in self._iter_record_chunks(start_date, end_date, self.PARQUET_ROW_GROUP_SIZE):
+                columns = zip(*chunk)
+                writer.write_table(pa.Table.from_arrays(
+                    [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+                    schema=schema
+                ))
+        output.seek(0)
+        
+        return output
+    
+    def export_roster(self, start_date: date, end_date: date) -> IO[bytes]:
+        """
+        Export a staff x date roster matrix to an Excel workbook.
+        
+        Each cell holds the codes of the staff member's shifts that day
+        (早/中/晚/全); cancelled assignments are left out. The grid is filled
+        from one assignment query into a dense staff x day byte array and
+        written row by row.
+        
+        Args:
+            start_date: First roster day
+            end_date: Last roster day
+        
+        Returns:
+            Temporary file holding the XLSX bytes, positioned at the start;
+            the caller must close it (which also deletes it)
+        
+        Raises:
+            ValueError: If the date range is empty or too long for one sheet
+        """
+        days = (end_date - start_date).days + 1
+        if days < 1:
+            raise ValueError("end_date must not be before start_date")
+        if days > self.ROSTER_MAX_DAYS:
+            raise ValueError(f"Roster range is limited to {self.ROSTER_MAX_DAYS} days")
+        
+        staff, grid, staff_totals, day_totals = self._build_roster_grid(start_date, days)
+        self.rows_exported += len(staff)
+        labels = self._roster_labels()
+        
+        wb = Workbook(write_only=True)
+        self._register_styles(wb)
+        ws = wb.create_sheet("排班矩阵")
+        last_column = get_column_letter(days + 3)
+        
+        # Set column widths
+        ws.column_dimensions['A'].width = 12
+        ws.column_dimensions['B'].width = 12
+        for column in range(3, days + 3):
+            ws.column_dimensions[get_column_letter(column)].width = 6
+        ws.column_dimensions[last_column].width = 8
+        
+        # Add title
+        ws.merged_cells.add(f'A1:{last_column}1')
+        ws.row_dimensions[1].height = 30
+        ws.append([self._cell(ws, "值班排班矩阵", 'export_title')])
+        
+        # Add export info and legend
+        ws.merged_cells.add(f'A2:{last_column}2')
+        legend = " ".join(f"{code}={self._translate_shift_type(shift_type)}" for shift_type, code in self.ROSTER_CODES)
+        info = (f"数据更新时间: {self._data_updated_at()} "
+                f"({start_date.isoformat()} 至 {end_date.isoformat()})  {legend}")
+        ws.append([self._cell(ws, info, 'export_info')])
         
         # Add headers
-        headers = ['日期', '班次', '值班人员', '状态', '备注']
-        for col, header in enumerate(headers, start=1):
-            cell = ws.cell(row=3, column=col)
-            cell.value = header
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = header_alignment
-            cell.border = border
-        
-        # Query schedules
-        query = self.db.query(Schedule)
+        headers = ['姓名', '职位']
+        headers.extend((start_date + timedelta(days=day)).strftime('%m-%d') for day in range(days))
+        headers.append('班次数')
+        ws.append([self._cell(ws, header, 'export_header') for header in headers])
+        
+        # Add one row per staff member, reusing one styled cell per column
+        cells = [self._cell(ws, None, 'export_cell') for _ in headers]
+        for row, (_, name, position) in enumerate(staff):
+            values = [name, position]
+            values.extend(labels[mask] for mask in grid[row * days:(row + 1) * days])
+            values.append(staff_totals[row])
+            for cell, value in zip(cells, values):
+                cell.value = value
+            ws.append(cells)
+        
+        # Add staff on duty per day
+        totals = ['当日人数', None] + day_totals + [sum(staff_totals)]
+        ws.append([self._cell(ws, value, 'export_header') for value in totals])
+        
+        output = SpooledTemporaryFile(max_size=self.SPOOL_MAX_SIZE)
+        wb.save(output)
+        output.seek(0)
+        
+        return output
+    
+    def _build_roster_grid(self, start_date: date, days: int) -> Tuple[List[Tuple[int, str, str]], bytearray, List[int], List[int]]:
+        """
+        Fill the roster grid from a single staff/assignment query.
+        
+        Rows are active staff plus anyone with assignments in the range;
+        both come from one outer join ordered by staff, so the row set and
+        the cells always agree.
+        
+        Args:
+            start_date: First roster day
+            days: Number of roster days
+        
+        Returns:
+            Tuple of (staff rows (id, name, position), shift bitmask per
+            staff x day cell, shifts per staff, staff on duty per day)
+        """
+        end_date = start_date + timedelta(days=days - 1)
+        bits = {shift_type: 1 << i for i, (shift_type, _) in enumerate(self.ROSTER_CODES)}
+        
+        staff = []
+        grid = bytearray()
+        staff_totals = []
+        day_totals = [0] * days
+        
+        rows = self.db.execute(
+            select(
+                Staff.id, Staff.name, Staff.position,
+                ScheduleAssignment.duty_date, ScheduleAssignment.shift_type, ScheduleAssignment.status
+            )
+            .outerjoin(ScheduleAssignment, and_(
+                ScheduleAssignment.staff_id == Staff.id,
+                ScheduleAssignment.duty_date >= start_date,
+                ScheduleAssignment.duty_date <= end_date
+            ))
+            .where(or_(Staff.is_active == True, ScheduleAssignment.id.is_not(None)))
+            .order_by(Staff.id),
+            execution_options={'yield_per': self.YIELD_PER}
+        )
+        last_staff_id = None
+        for staff_id, name, position, duty_date, shift_type, status in rows:
+            if staff_id != last_staff_id:
+                last_staff_id = staff_id
+                staff.append((staff_id, name, position))
+                grid.extend(bytes(days))
+                staff_totals.append(0)
+            if duty_date is None or status == 'cancelled':
+                continue
+            
+            row = len(staff) - 1
+            day = (duty_date - start_date).days
+            cell = row * days + day
+            bit = bits.get(shift_type, self.ROSTER_OTHER_BIT)
+            mask = grid[cell]
+            if mask & bit:
+                continue
+            if not mask:
+                day_totals[day] += 1
+            staff_totals[row] += 1
+            grid[cell] = mask | bit
+        
+        return staff, grid, staff_totals, day_totals
+    
+    def _roster_labels(self) -> List[Optional[str]]:
+        """Cell text for every possible shift bitmask (None for no shifts)."""
+        codes = [(1 << i, code) for i, (_, code) in enumerate(self.ROSTER_CODES)]
+        codes.append((self.ROSTER_OTHER_BIT, self.ROSTER_OTHER_CODE))
+        return [
+            "".join(code for bit, code in codes if mask & bit) or None
+            for mask in range(256)
+        ]
+    
+    def _iter_record_chunks(self, start_date: Optional[date], end_date: Optional[date], chunk_size: int) -> Iterator[List[Row]]:
+        """
+        Stream raw export rows from one schedule/assignment/staff query.
+        
+        Schedules without assignments produce a single row whose assignment
+        columns are None.
+        
+        Args:
+            start_date: Start date filter
+            end_date: End date filter
+            chunk_size: Rows fetched per batch
+        
+        Yields:
+            Lists of rows with the fields in COLUMNS
+        """
+        statement = select(
+            Schedule.id.label('schedule_id'),
+            Schedule.schedule_date,
+            Schedule.shift_type,
+            ScheduleAssignment.id.label('assignment_id'),
+            ScheduleAssignment.staff_id,
+            Staff.name.label('staff_name'),
+            ScheduleAssignment.status,
+            ScheduleAssignment.notes
+        ).outerjoin(ScheduleAssignment, ScheduleAssignment.schedule_id == Schedule.id)\
+            .outerjoin(Staff, Staff.id == ScheduleAssignment.staff_id)
         if start_date:
-            query = query.filter(Schedule.schedule_date >= start_date)
+            statement = statement.where(Schedule.schedule_date >= start_date)
         if end_date:
-            query = query.filter(Schedule.schedule_date <= end_date)
+            statement = statement.where(Schedule.schedule_date <= end_date)
         
-        schedules = query.order_by(Schedule.schedule_date).all()
+        statement = statement.order_by(Schedule.schedule_date, Schedule.id, ScheduleAssignment.id)
+        result = self.db.execute(statement, execution_options={'yield_per': chunk_size})
+        for chunk in result.partitions():
+            self.rows_exported += len(chunk)
+            yield chunk
+    
+    def _iter_rows(self, start_date: Optional[date], end_date: Optional[date]) -> Iterator[Tuple[str, str, str, str, str]]:
+        """
+        Yield Excel report rows with display values.
         
-        # Add data
-        row = 4
-        for schedule in schedules:
-            assignments = schedule.get_assignments()
-            
-            if assignments:
-                for assignment in assignments:
-                    ws.cell(row=row, column=1).value = schedule.schedule_date.isoformat()
-                    ws.cell(row=row, column=2).value = self._translate_shift_type(schedule.shift_type)
-                    ws.cell(row=row, column=3).value = assignment.staff.name if assignment.staff else ""
-                    ws.cell(row=row, column=4).value = self._translate_status(assignment.status)
-                    ws.cell(row=row, column=5).value = assignment.notes or ""
-                    
-                    # Apply borders
-                    for col in range(1, 6):
-                        ws.cell(row=row, column=col).border = border
-                        ws.cell(row=row, column=col).alignment = Alignment(horizontal="center", vertical="center")
-                    
-                    row += 1
-            else:
-                # Empty schedule
-                ws.cell(row=row, column=1).value = schedule.schedule_date.isoformat()
-                ws.cell(row=row, column=2).value = self._translate_shift_type(schedule.shift_type)
-                ws.cell(row=row, column=3).value = "未分配"
-                ws.cell(row=row, column=4).value = "-"
-                ws.cell(row=row, column=5).value = ""
-                
-                for col in range(1, 6):
-                    ws.cell(row=row, column=col).border = border
-                    ws.cell(row=row, column=col).alignment = Alignment(horizontal="center", vertical="center")
-                
-                row += 1
-        
-        # Save file
-        filename = f"schedule_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-        filepath = os.path.join(os.getcwd(), filename)
-        wb.save(filepath)
-        
-        return filepath
+        Args:
+            start_date: Start date filter
+            end_date: End date filter
+        
+        Yields:
+            (date, shift, staff name, status, notes) display values
+        """
+        for chunk in self._iter_record_chunks(start_date, end_date, self.YIELD_PER):
+            for row in chunk:
+                if row.assignment_id is None:
+                    # Empty schedule
+                    yield (row.schedule_date.isoformat(), self._translate_shift_type(row.shift_type), self.UNASSIGNED, "-", "")
+                else:
+                    yield (
+                        row.schedule_date.isoformat(),
+                        self._translate_shift_type(row.shift_type),
+                        row.staff_name or "",
+                        self._translate_status(row.status),
+                        row.notes or ""
+                    )
+    
+    def _data_updated_at(self) -> str:
+        """
+        Last change time of the exported tables, shown instead of the
+        export time so cached workbooks stay accurate.
+        
+        Returns:
+            UTC timestamp, or "-" if the tables were never changed
+        """
+        versions = ChangeTracker(self.db).versions(*self.DATA_TABLES)
+        updated = [updated_at for _, updated_at in versions.values() if updated_at]
+        return f"{max(updated).strftime('%Y-%m-%d %H:%M:%S')} UTC" if updated else "-"
+    
+    def _register_styles(self, wb: Workbook):
+        """
+        Register the named styles shared by all export cells.
+        
+        Args:
+            wb: Workbook to register the styles on
+        """
+        center = Alignment(horizontal="center", vertical="center")
+        side = Side(style='thin')
+        border = Border(left=side, right=side, top=side, bottom=side)
+        
+        wb.add_named_style(NamedStyle(
+            name='export_title',
+            font=Font(bold=True, size=16),
+            alignment=center
+        ))
+        wb.add_named_style(NamedStyle(
+            name='export_info',
+            alignment=Alignment(horizontal="center")
+        ))
+        wb.add_named_style(NamedStyle(
+            name='export_header',
+            font=Font(bold=True, color="FFFFFF", size=12),
+            fill=PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid"),
+            alignment=center,
+            border=border
+        ))
+        wb.add_named_style(NamedStyle(
+            name='export_cell',
+            alignment=center,
+            border=border
+        ))
+    
+    def _cell(self, ws, value: str, style: str) -> WriteOnlyCell:
+        """Create a write-only cell using a registered named style."""
+        cell = WriteOnlyCell(ws, value=value)
+        cell.style = style
+        return cell
     
     def _translate_shift_type(self, shift_type: str) -> str:
         """Translate shift type to Chinese."""
-        translations = {
-            'morning': '早班',
-            'afternoon': '中班',
-            'night': '晚班',
-            '全天': '全天'
-        }
-        return translations.get(shift_type, shift_type)
+        return self.SHIFT_LABELS.get(shift_type, shift_type)
     
     def _translate_status(self, status: str) -> str:
         """Translate status to Chinese."""
-        translations = {
-            'scheduled': '已排班',
-            'completed': '已完成',
-            'cancelled': '已取消'
-        }
-        return translations.get(status, status)
+        return self.STATUS_LABELS.get(status, status)
@@ -0,0 +1,330 @@
+"""
+Import Service - Import schedules from Excel files in the export layout.
+Rows are read in read-only mode and upserted in batched transactions.
+"""
+from collections import Counter, defaultdict, namedtuple
+from datetime import date, datetime
+from typing import IO, Dict, Iterator, List, Optional, Tuple
+from openpyxl import load_workbook
+from sqlalchemy import insert, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from models.schedule import Schedule
+from models.schedule_assignment import ScheduleAssignment
+from models.staff import Staff
+from services.change_tracker import ChangeTracker
+from services.export_service import ExportService
+from services.rollup_service import RollupService
+
+class ImportService:
+    """
+    Service class for importing schedules from Excel.
+    Reads the layout produced by ExportService.export_to_excel: title and
+    info rows, a header row, then one row per assignment.
+    """
+    
+    ImportRow = namedtuple('ImportRow', ['duty_date', 'shift_type', 'staff_id', 'status', 'notes'])
+    
+    # Rows written per transaction
+    BATCH_SIZE = 2000
+    # Rows searched for the header row
+    HEADER_SEARCH_ROWS = 10
+    # Row errors included in the report (all are counted)
+    MAX_REPORTED_ERRORS = 1000
+    
+    # Accept both display labels and raw values
+    SHIFT_TYPES = {
+        **{shift_type: shift_type for shift_type in ExportService.SHIFT_LABELS},
+        **{label: shift_type for shift_type, label in ExportService.SHIFT_LABELS.items()}
+    }
+    STATUSES = {
+        **{status: status for status in ExportService.STATUS_LABELS},
+        **{label: status for status, label in ExportService.STATUS_LABELS.items()}
+    }
+    
+    def __init__(self, db: Session):
+        """
+        Initialize ImportService with database session.
+        
+        Args:
+            db: Database session
+        """
+        self.db = db
+    
+    def import_excel(self, file: IO[bytes], created_by: str = 'import') -> Dict:
+        """
+        Import schedules and assignments from an Excel workbook.
+        
+        Schedules are matched by (date, shift type) and assignments by
+        (schedule, staff); existing assignments get the row's status and
+        notes, everything else is created. Invalid rows are reported and
+        skipped without aborting the import.
+        
+        Args:
+            file: Binary XLSX file
+            created_by: Creator identifier for new schedules
+        
+        Returns:
+            Import report with row counts and per-row errors
+        
+        Raises:
+            ValueError: If the file is not a workbook or has no header row
+        """
+        try:
+            wb = load_workbook(file, read_only=True, data_only=True)
+        except Exception as e:
+            raise ValueError(f"Not a valid Excel file: {e}")
+        
+        report = {
+            'rows': 0,
+            'schedules_created': 0,
+            'assignments_created': 0,
+            'assignments_updated': 0,
+            'error_count': 0,
+            'errors': []
+        }
+        
+        try:
+            ws = wb.active
+            # Don't trust (or compute) the stored sheet size; it is often
+            # missing and computing it means parsing the sheet twice
+            ws.reset_dimensions()
+            rows = enumerate(ws.iter_rows(values_only=True), start=1)
+            self._skip_to_data(rows)
+            staff_ids = self._load_staff_lookup()
+            
+            batch = []
+            for row_number, values in rows:
+                if not any(value not in (None, "") for value in values):
+                    continue
+                report['rows'] += 1
+                try:
+                    batch.append((row_number, self._parse_row(values, staff_ids)))
+                except ValueError as e:
+                    self._add_error(report, row_number, str(e))
+                
+                if len(batch) >= self.BATCH_SIZE:
+                    self._write_batch(batch, created_by, report)
+                    batch = []
+            
+            if batch:
+                self._write_batch(batch, created_by, report)
+        finally:
+            wb.close()
+        
+        return report
+    
+    def _skip_to_data(self, rows: Iterator[Tuple[int, tuple]]):
+        """
+        Advance the row iterator past the header row.
+        
+        Raises:
+            ValueError: If no header row is found near the top of the sheet
+        """
+        for row_number, values in rows:
+            cells = tuple(str(value).strip() if value is not None else "" for value in values[:len(ExportService.HEADERS)])
+            if cells == ExportService.HEADERS:
+                return
+            if row_number >= self.HEADER_SEARCH_ROWS:
+                break
+        raise ValueError(f"Header row ({', '.join(ExportService.HEADERS)}) not found")
+    
+    def _load_staff_lookup(self) -> Dict[str, Optional[int]]:
+        """
+        Map active staff names to IDs in one query.
+        
+        Returns:
+            Dictionary of name -> staff ID (None if the name is ambiguous)
+        """
+        lookup = {}
+        for staff_id, name in self.db.query(Staff.id, Staff.name).filter(Staff.is_active == True):
+            lookup[name] = None if name in lookup else staff_id
+        return lookup
+    
+    def _parse_row(self, values: tuple, staff_ids: Dict[str, Optional[int]]) -> "ImportService.ImportRow":
+        """
+        Validate one sheet row.
+        
+        Args:
+            values: Cell values of the row
+            staff_ids: Staff name lookup
+        
+        Returns:
+            Parsed row (staff_id is None for unassigned schedules, status is
+            None when the cell is empty)
+        
+        Raises:
+            ValueError: If any cell is invalid
+        """
+        raw_date, raw_shift, raw_staff, raw_status, raw_notes = (tuple(values) + (None,) * 5)[:5]
+        
+        duty_date = self._parse_date(raw_date)
+        
+        shift_type = self.SHIFT_TYPES.get(self._text(raw_shift))
+        if not shift_type:
+            raise ValueError(f"Unknown shift type: {raw_shift}")
+        
+        staff_id = None
+        name = self._text(raw_staff)
+        if name and name != ExportService.UNASSIGNED:
+            if name not in staff_ids:
+                raise ValueError(f"Staff '{name}' not found or inactive")
+            staff_id = staff_ids[name]
+            if staff_id is None:
+                raise ValueError(f"Staff name '{name}' is ambiguous")
+        
+        status = None
+        status_text = self._text(raw_status)
+        if staff_id and status_text not in ("", "-"):
+            status = self.STATUSES.get(status_text)
+            if not status:
+                raise ValueError(f"Unknown status: {raw_status}")
+        
+        return self.ImportRow(duty_date, shift_type, staff_id, status, self._text(raw_notes) or None)
+    
+    def _parse_date(self, value) -> date:
+        """
+        Parse a date cell (Excel date or YYYY-MM-DD text).
+        
+        Raises:
+            ValueError: If the cell is empty or not a date
+        """
+        if isinstance(value, datetime):
+            return value.date()
+        if isinstance(value, date):
+            return value
+        text = self._text(value)
+        if not text:
+            raise ValueError("Missing date")
+        try:
+            return date.fromisoformat(text)
+        except ValueError:
+            raise ValueError(f"Invalid date: {text}")
+    
+    def _text(self, value) -> str:
+        """Cell value as stripped text."""
+        return str(value).strip() if value is not None else ""
+    
+    def _write_batch(self, batch: List[Tuple[int, "ImportService.ImportRow"]], created_by: str, report: Dict):
+        """
+        Upsert one batch of parsed rows in a single transaction.
+        
+        Args:
+            batch: (sheet row number, parsed row) pairs
+            created_by: Creator identifier for new schedules
+            report: Import report to update
+        """
+        try:
+            schedules_created, assignments_created, assignments_updated = self._upsert(batch, created_by)
+            self.db.commit()
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            for row_number, _ in batch:
+                self._add_error(report, row_number, f"Batch failed: {e.__class__.__name__}")
+            return
+        
+        report['schedules_created'] += schedules_created
+        report['assignments_created'] += assignments_created
+        report['assignments_updated'] += assignments_updated
+    
+    def _upsert(self, batch: List[Tuple[int, "ImportService.ImportRow"]], created_by: str) -> Tuple[int, int, int]:
+        """
+        Write one batch (does not commit).
+        
+        Returns:
+            Tuple of (schedules created, assignments created, assignments updated)
+        """
+        keys = {(row.duty_date, row.shift_type) for _, row in batch}
+        
+        # Resolve schedules, creating missing ones in one insert
+        schedule_ids = {}
+        existing_schedules = self.db.query(Schedule.id, Schedule.schedule_date, Schedule.shift_type)\
+            .filter(
+                Schedule.schedule_date >= min(duty_date for duty_date, _ in keys),
+                Schedule.schedule_date <= max(duty_date for duty_date, _ in keys),
+                Schedule.shift_type.in_({shift_type for _, shift_type in keys})
+            )\
+            .order_by(Schedule.id)
+        for schedule_id, schedule_date, shift_type in existing_schedules:
+            schedule_ids.setdefault((schedule_date, shift_type), schedule_id)
+        
+        missing = [key for key in keys if key not in schedule_ids]
+        if missing:
+            created = self.db.execute(
+                insert(Schedule).returning(Schedule.id, Schedule.schedule_date, Schedule.shift_type),
+                [{'schedule_date': duty_date, 'shift_type': shift_type, 'created_by': created_by} for duty_date, shift_type in missing]
+            )
+            for schedule_id, schedule_date, shift_type in created:
+                schedule_ids[(schedule_date, shift_type)] = schedule_id
+        
+        # Existing assignments of the touched schedules
+        existing = {}
+        assignments = self.db.query(
+            ScheduleAssignment.id,
+            ScheduleAssignment.schedule_id,
+            ScheduleAssignment.staff_id,
+            ScheduleAssignment.duty_date,
+            ScheduleAssignment.shift_type,
+            ScheduleAssignment.status,
+            ScheduleAssignment.notes
+        ).filter(ScheduleAssignment.schedule_id.in_(set(schedule_ids.values())))
+        for assignment in assignments:
+            existing.setdefault((assignment.schedule_id, assignment.staff_id), assignment)
+        
+        # Later rows for the same (schedule, staff) override earlier ones
+        new_rows = {}
+        changes = {}
+        for _, row in batch:
+            if row.staff_id is None:
+                continue
+            key = (schedule_ids[(row.duty_date, row.shift_type)], row.staff_id)
+            
+            if key in new_rows:
+                new_rows[key].update(status=row.status or new_rows[key]['status'], notes=row.notes)
+            elif key in existing:
+                current = existing[key]
+                status = row.status or changes.get(key, {}).get('status', current.status)
+                if (status, row.notes) == (current.status, current.notes):
+                    changes.pop(key, None)
+                else:
+                    changes[key] = {'id': current.id, 'status': status, 'notes': row.notes}
+            else:
+                new_rows[key] = {
+                    'schedule_id': key[0],
+                    'staff_id': row.staff_id,
+                    'duty_date': row.duty_date,
+                    'shift_type': row.shift_type,
+                    'status': row.status or 'scheduled',
+                    'notes': row.notes
+                }
+        
+        rollups = RollupService(self.db)
+        if new_rows:
+            self.db.execute(insert(ScheduleAssignment), list(new_rows.values()))
+            rollups.add_assignments(
+                (row['duty_date'], row['staff_id'], row['shift_type'], row['status']) for row in new_rows.values()
+            )
+        if changes:
+            self.db.execute(update(ScheduleAssignment), list(changes.values()))
+            
+            moved = defaultdict(Counter)
+            for key, change in changes.items():
+                current = existing[key]
+                if change['status'] != current.status:
+                    moved[(current.status, change['status'])][(current.duty_date, current.staff_id, current.shift_type)] += 1
+            for (old_status, new_status), counts in moved.items():
+                rollups.move_status(counts, old_status=old_status, new_status=new_status)
+        
+        tracker = ChangeTracker(self.db)
+        if missing:
+            tracker.bump(ChangeTracker.SCHEDULE)
+        if new_rows or changes:
+            tracker.bump(*ChangeTracker.assignment_keys(staff_id for _, staff_id in [*new_rows, *changes]))
+        
+        return len(missing), len(new_rows), len(changes)
+    
+    def _add_error(self, report: Dict, row_number: int, message: str):
+        """Record a row error, keeping at most MAX_REPORTED_ERRORS details."""
+        report['error_count'] += 1
+        if len(report['errors']) < self.MAX_REPORTED_ERRORS:
+            report['errors'].append({'row': row_number, 'error': message})
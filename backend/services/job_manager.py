@@ -0,0 +1,217 @@
+"""
+Job Manager - Background auto-schedule generation.
+Runs AutoScheduler on a bounded local worker pool and tracks job progress.
+"""
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional
+from sqlalchemy.orm import Session
+from database.database import SessionLocal
+from monitoring.metrics import metrics
+from services.auto_scheduler import AutoScheduler
+
+class AutoScheduleJob:
+    """
+    State of one background auto-schedule generation.
+    
+    Attributes:
+        id: Job identifier
+        params: Arguments passed to AutoScheduler.generate_schedule
+        status: Job status (queued/running/completed/failed)
+        written: Schedules written so far
+        total: Total schedules to write (None until planning finishes)
+        result: Generation summary once completed
+        error: Error message if the job failed
+        created_at: Submission timestamp
+        finished_at: Completion timestamp
+    """
+    
+    def __init__(self, params: Dict):
+        """
+        Initialize a new queued job.
+        
+        Args:
+            params: Arguments passed to AutoScheduler.generate_schedule
+        """
+        self.id = uuid.uuid4().hex
+        self.params = params
+        self.status = 'queued'
+        self.written = 0
+        self.total = None
+        self.result = None
+        self.error = None
+        self.created_at = datetime.utcnow()
+        self.finished_at = None
+    
+    @property
+    def is_finished(self) -> bool:
+        """Whether the job has completed or failed."""
+        return self.status in ('completed', 'failed')
+    
+    def to_dict(self) -> dict:
+        """
+        Convert job to dictionary (without the result).
+        
+        Returns:
+            Dictionary representation of job status and progress
+        """
+        return {
+            'job_id': self.id,
+            'status': self.status,
+            'progress': {
+                'written': self.written,
+                'total': self.total
+            },
+            'error': self.error,
+            'created_at': self.created_at.isoformat(),
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+class JobManager:
+    """
+    Runs auto-schedule jobs on a bounded thread pool.
+    Each job uses its own database session.
+    """
+    
+    def __init__(
+        self,
+        max_workers: int = 2,
+        max_pending: int = 10,
+        retention_seconds: int = 3600,
+        session_factory: Callable[[], Session] = SessionLocal
+    ):
+        """
+        Initialize JobManager.
+        
+        Args:
+            max_workers: Number of jobs generated concurrently
+            max_pending: Maximum number of queued or running jobs
+            retention_seconds: How long finished jobs stay available
+            session_factory: Callable creating a database session
+        """
+        self.max_pending = max_pending
+        self.retention_seconds = retention_seconds
+        self.session_factory = session_factory
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='auto-schedule')
+        self.jobs: "OrderedDict[str, AutoScheduleJob]" = OrderedDict()
+        self.lock = threading.Lock()
+    
+    def submit(
+        self,
+        start_date: date,
+        end_date: date,
+        shift_types: List[str],
+        staff_per_shift: int = 2,
+        bulk: bool = True
+    ) -> AutoScheduleJob:
+        """
+        Queue an auto-schedule generation.
+        
+        Args:
+            start_date: Start date of schedule period
+            end_date: End date of schedule period
+            shift_types: List of shift types to create
+            staff_per_shift: Number of staff per shift
+            bulk: Write the plan with set-based inserts
+        
+        Returns:
+            The queued job
+        
+        Raises:
+            RuntimeError: If too many jobs are already pending
+        """
+        job = AutoScheduleJob({
+            'start_date': start_date,
+            'end_date': end_date,
+            'shift_types': shift_types,
+            'staff_per_shift': staff_per_shift,
+            'bulk': bulk
+        })
+        
+        with self.lock:
+            self._purge_finished()
+            pending = sum(1 for j in self.jobs.values() if not j.is_finished)
+            if pending >= self.max_pending:
+                raise RuntimeError(f"Too many pending auto-schedule jobs ({pending}), try again later")
+            self.jobs[job.id] = job
+        
+        self.executor.submit(self._run, job)
+        return job
+    
+    def get(self, job_id: str) -> Optional[AutoScheduleJob]:
+        """
+        Get a job by ID.
+        
+        Args:
+            job_id: Job identifier
+        
+        Returns:
+            AutoScheduleJob or None if not found (or expired)
+        """
+        with self.lock:
+            return self.jobs.get(job_id)
+    
+    def status_counts(self) -> Dict[tuple, int]:
+        """
+        Count unfinished jobs by status (for the jobs gauge).
+        
+        Returns:
+            Dictionary mapping (status,) to job count
+        """
+        with self.lock:
+            counts = {('queued',): 0, ('running',): 0}
+            for job in self.jobs.values():
+                if not job.is_finished:
+                    counts[(job.status,)] += 1
+            return counts
+    
+    def _run(self, job: AutoScheduleJob):
+        """Execute a job in a worker thread."""
+        job.status = 'running'
+        
+        def on_progress(written: int, total: int):
+            job.written = written
+            job.total = total
+        
+        db = self.session_factory()
+        try:
+            job.result = AutoScheduler(db).generate_schedule(progress_callback=on_progress, **job.params)
+            status = 'completed'
+        except Exception as e:
+            db.rollback()
+            job.error = str(e)
+            status = 'failed'
+        finally:
+            db.close()
+        
+        # finished_at must be set before the job counts as finished
+        job.finished_at = datetime.utcnow()
+        job.status = status
+        auto_schedule_jobs_finished.inc(status)
+    
+    def _purge_finished(self):
+        """Drop finished jobs older than the retention period (lock must be held)."""
+        cutoff = datetime.utcnow() - timedelta(seconds=self.retention_seconds)
+        expired = [
+            job_id for job_id, job in self.jobs.items()
+            if job.is_finished and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self.jobs[job_id]
+
+job_manager = JobManager(
+    max_workers=int(os.getenv('AUTO_SCHEDULE_WORKERS', 2)),
+    max_pending=int(os.getenv('AUTO_SCHEDULE_MAX_PENDING', 10))
+)
+
+auto_schedule_jobs_finished = metrics.counter(
+    'auto_schedule_jobs_finished_total', 'Background auto-schedule jobs finished, by outcome.', ('status',)
+)
+metrics.gauge(
+    'auto_schedule_jobs', 'Background auto-schedule jobs queued or running.', ('status',),
+    callback=job_manager.status_counts
+)
@@ -0,0 +1,89 @@
+"""
+Plan Cache - Holds auto-schedule previews until they are committed.
+Entries are looked up by an opaque token and expire after a TTL.
+"""
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+class PlanCache:
+    """
+    Thread-safe token -> plan store with TTL expiry and a size cap.
+    The least recently stored entries are evicted first when full.
+    """
+    
+    def __init__(self, ttl_seconds: int = 900, max_entries: int = 50):
+        """
+        Initialize PlanCache.
+        
+        Args:
+            ttl_seconds: Lifetime of a cached plan
+            max_entries: Maximum number of cached plans
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.lock = threading.Lock()
+    
+    def put(self, value: Any) -> str:
+        """
+        Store a plan.
+        
+        Args:
+            value: Plan to store
+        
+        Returns:
+            Token identifying the plan
+        """
+        token = secrets.token_urlsafe(16)
+        with self.lock:
+            self._evict_expired()
+            self.entries[token] = (time.monotonic() + self.ttl_seconds, value)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return token
+    
+    def get(self, token: str) -> Optional[Any]:
+        """
+        Get a plan without removing it.
+        
+        Args:
+            token: Plan token
+        
+        Returns:
+            The plan or None if unknown or expired
+        """
+        with self.lock:
+            self._evict_expired()
+            entry = self.entries.get(token)
+            return entry[1] if entry else None
+    
+    def pop(self, token: str) -> Optional[Any]:
+        """
+        Remove and return a plan, so it can only be used once.
+        
+        Args:
+            token: Plan token
+        
+        Returns:
+            The plan or None if unknown or expired
+        """
+        with self.lock:
+            self._evict_expired()
+            entry = self.entries.pop(token, None)
+            return entry[1] if entry else None
+    
+    def _evict_expired(self):
+        """Drop expired entries (lock must be held)."""
+        now = time.monotonic()
+        expired = [token for token, (expires_at, _) in self.entries.items() if expires_at <= now]
+        for token in expired:
+            del self.entries[token]
+
+plan_cache = PlanCache(
+    ttl_seconds=int(os.getenv('PLAN_CACHE_TTL_SECONDS', 900)),
+    max_entries=int(os.getenv('PLAN_CACHE_MAX_ENTRIES', 50))
+)
@@ -0,0 +1,156 @@
+"""
+Rollup Service - Maintains the daily duty rollup used by statistics.
+Write paths report assignment count changes here inside their own transaction.
+"""
+from collections import Counter
+from datetime import date
+from typing import Dict, Iterable, Tuple
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from models.duty_rollup import DailyDutyRollup
+from models.schedule_assignment import ScheduleAssignment
+from services.change_tracker import ChangeTracker
+
+# (duty_date, staff_id, shift_type, status)
+RollupKey = Tuple[date, int, str, str]
+
+class RollupService:
+    """
+    Service class for the daily duty rollup.
+    Applies count deltas and rebuilds the rollup from raw assignments.
+    """
+    
+    UPSERT_DIALECTS = {
+        'sqlite': sqlite.insert,
+        'postgresql': postgresql.insert
+    }
+    
+    def __init__(self, db: Session):
+        """
+        Initialize RollupService with database session.
+        
+        Args:
+            db: Database session
+        """
+        self.db = db
+    
+    def add_assignments(self, keys: Iterable[RollupKey]):
+        """
+        Count newly created assignments (does not commit).
+        
+        Args:
+            keys: One (duty_date, staff_id, shift_type, status) key per assignment
+        """
+        self.apply(Counter(keys))
+    
+    def move_status(self, counts: Dict[Tuple[date, int, str], int], old_status: str, new_status: str):
+        """
+        Move assignment counts from one status to another (does not commit).
+        
+        Args:
+            counts: Number of moved assignments per (duty_date, staff_id, shift_type)
+            old_status: Previous status
+            new_status: New status
+        """
+        # The rollup counts NULL as scheduled
+        old_status, new_status = old_status or 'scheduled', new_status or 'scheduled'
+        if old_status == new_status:
+            return
+        deltas = Counter()
+        for (duty_date, staff_id, shift_type), count in counts.items():
+            deltas[(duty_date, staff_id, shift_type, old_status)] -= count
+            deltas[(duty_date, staff_id, shift_type, new_status)] += count
+        self.apply(deltas)
+    
+    def apply(self, deltas: Dict[RollupKey, int]):
+        """
+        Add count deltas to the rollup (does not commit).
+        
+        Uses a single multi-row upsert where the dialect supports
+        ON CONFLICT, otherwise an UPDATE followed by an INSERT per missing key.
+        Rows that drop to zero are removed.
+        
+        Args:
+            deltas: Count change per (duty_date, staff_id, shift_type, status)
+        """
+        rows = [
+            {
+                'duty_date': duty_date,
+                'staff_id': staff_id,
+                'shift_type': shift_type,
+                'status': status or 'scheduled',
+                'assignment_count': delta
+            }
+            for (duty_date, staff_id, shift_type, status), delta in deltas.items()
+            if delta
+        ]
+        if not rows:
+            return
+        
+        dialect_insert = self.UPSERT_DIALECTS.get(self.db.get_bind().dialect.name)
+        if dialect_insert:
+            statement = dialect_insert(DailyDutyRollup)
+            statement = statement.on_conflict_do_update(
+                index_elements=['duty_date', 'staff_id', 'shift_type', 'status'],
+                set_={'assignment_count': DailyDutyRollup.assignment_count + statement.excluded.assignment_count}
+            )
+            self.db.execute(statement, rows)
+        else:
+            for row in rows:
+                result = self.db.execute(
+                    update(DailyDutyRollup)
+                    .where(
+                        DailyDutyRollup.duty_date == row['duty_date'],
+                        DailyDutyRollup.staff_id == row['staff_id'],
+                        DailyDutyRollup.shift_type == row['shift_type'],
+                        DailyDutyRollup.status == row['status']
+                    )
+                    .values(assignment_count=DailyDutyRollup.assignment_count + row['assignment_count'])
+                    .execution_options(synchronize_session=False)
+                )
+                if result.rowcount == 0:
+                    self.db.execute(insert(DailyDutyRollup).values(**row))
+        
+        if any(row['assignment_count'] < 0 for row in rows):
+            self.db.execute(
+                delete(DailyDutyRollup)
+                .where(
+                    DailyDutyRollup.assignment_count <= 0,
+                    DailyDutyRollup.duty_date.in_({row['duty_date'] for row in rows})
+                )
+                .execution_options(synchronize_session=False)
+            )
+    
+    def rebuild(self) -> int:
+        """
+        Recompute the whole rollup from schedule_assignment and commit.
+        
+        Returns:
+            Number of rollup rows written
+        """
+        status = func.coalesce(ScheduleAssignment.status, 'scheduled')
+        aggregated = select(
+            ScheduleAssignment.duty_date,
+            ScheduleAssignment.staff_id,
+            ScheduleAssignment.shift_type,
+            status,
+            func.count(ScheduleAssignment.id)
+        ).group_by(
+            ScheduleAssignment.duty_date,
+            ScheduleAssignment.staff_id,
+            ScheduleAssignment.shift_type,
+            status
+        )
+        
+        self.db.execute(delete(DailyDutyRollup))
+        self.db.execute(
+            insert(DailyDutyRollup).from_select(
+                ['duty_date', 'staff_id', 'shift_type', 'status', 'assignment_count'],
+                aggregated
+            )
+        )
+        ChangeTracker(self.db).bump(ChangeTracker.ASSIGNMENT)
+        self.db.commit()
+        
+        return self.db.query(func.count()).select_from(DailyDutyRollup).scalar()
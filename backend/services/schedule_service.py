@@ -1,9 +1,13 @@
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
+from collections import Counter, defaultdict
 from datetime import date, datetime
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, or_, func, insert, update
+from sqlalchemy.orm import Session, joinedload
 from models.schedule import Schedule
 from models.schedule_assignment import ScheduleAssignment
 from models.staff import Staff
+from services.change_tracker import ChangeTracker
+from services.rollup_service import RollupService
 
 class ScheduleService:
     """
@@ -38,6 +42,7 @@ class ScheduleService:
             created_by=created_by
         )
         self.db.add(schedule)
+        ChangeTracker(self.db).bump(ChangeTracker.SCHEDULE)
         self.db.commit()
         self.db.refresh(schedule)
         return schedule
@@ -57,32 +62,72 @@ class ScheduleService:
         Raises:
             ValueError: If schedule not found or staff not found
         """
-        schedule = self.db.query(Schedule).filter(Schedule.id == schedule_id).first()
-        if not schedule:
-            raise ValueError(f"Schedule with ID {schedule_id} not found")
-        
-        assignments = []
-        for staff_id in staff_ids:
-            # Verify staff exists
-            staff = self.db.query(Staff).filter(Staff.id == staff_id, Staff.is_active == True).first()
-            if not staff:
-                raise ValueError(f"Staff with ID {staff_id} not found or inactive")
-            
-            assignment = ScheduleAssignment(
-                staff_id=staff_id,
-                schedule_id=schedule_id,
-                duty_date=schedule.schedule_date,
-                shift_type=schedule.shift_type,
-                notes=notes
-            )
-            self.db.add(assignment)
-            assignments.append(assignment)
+        return self.bulk_assign_staff([(schedule_id, staff_ids, notes)])
+    
+    def bulk_assign_staff(self, items: List[Tuple[int, List[int], Optional[str]]]) -> List[ScheduleAssignment]:
+        """
+        Assign staff to many schedules in one transaction.
+        
+        Schedules and staff are validated with one IN query each and all
+        assignments are written with a single multi-row insert. Nothing is
+        written if any schedule or staff member is invalid.
+        
+        Args:
+            items: (schedule_id, staff_ids, notes) entries
+            
+        Returns:
+            List of created ScheduleAssignment objects with staff loaded
+            
+        Raises:
+            ValueError: If a schedule is not found or a staff member is not found or inactive
+        """
+        schedule_ids = {schedule_id for schedule_id, _, _ in items}
+        schedules = {
+            schedule.id: schedule
+            for schedule in self.db.query(Schedule).filter(Schedule.id.in_(schedule_ids))
+        }
+        
+        staff_ids = {staff_id for _, ids, _ in items for staff_id in ids}
+        active_staff_ids = {
+            staff_id for (staff_id,) in self.db.query(Staff.id)
+            .filter(Staff.id.in_(staff_ids), Staff.is_active == True)
+        }
+        
+        rows = []
+        for schedule_id, ids, notes in items:
+            schedule = schedules.get(schedule_id)
+            if not schedule:
+                raise ValueError(f"Schedule with ID {schedule_id} not found")
+            
+            for staff_id in ids:
+                # Verify staff exists
+                if staff_id not in active_staff_ids:
+                    raise ValueError(f"Staff with ID {staff_id} not found or inactive")
+                
+                rows.append({
+                    'staff_id': staff_id,
+                    'schedule_id': schedule_id,
+                    'duty_date': schedule.schedule_date,
+                    'shift_type': schedule.shift_type,
+                    'notes': notes
+                })
         
+        if not rows:
+            return []
+        
+        assignment_ids = self.db.scalars(insert(ScheduleAssignment).returning(ScheduleAssignment.id), rows).all()
+        RollupService(self.db).add_assignments(
+            (row['duty_date'], row['staff_id'], row['shift_type'], 'scheduled') for row in rows
+        )
+        ChangeTracker(self.db).bump(*ChangeTracker.assignment_keys(row['staff_id'] for row in rows))
         self.db.commit()
-        for assignment in assignments:
-            self.db.refresh(assignment)
         
-        return assignments
+        # Reload created assignments with their staff in one query
+        return self.db.query(ScheduleAssignment)\
+            .options(joinedload(ScheduleAssignment.staff))\
+            .filter(ScheduleAssignment.id.in_(assignment_ids))\
+            .order_by(ScheduleAssignment.id)\
+            .all()
     
     def get_schedules(self, start_date: Optional[date] = None, end_date: Optional[date] = None) -> List[Schedule]:
         """
@@ -102,7 +147,136 @@ class ScheduleService:
         if end_date:
             query = query.filter(Schedule.schedule_date <= end_date)
         
-        return query.order_by(Schedule.schedule_date).all()
+        return query.order_by(Schedule.schedule_date, Schedule.id).all()
+    
+    def get_schedules_with_assignments(self, start_date: Optional[date] = None, end_date: Optional[date] = None) -> List[dict]:
+        """
+        Get schedules within a date range together with their assignments.
+        
+        Schedules, assignments and staff are loaded in two queries regardless
+        of the size of the date range.
+        
+        Args:
+            start_date: Start date (inclusive)
+            end_date: End date (inclusive)
+            
+        Returns:
+            List of schedule dictionaries with assignments
+        """
+        schedules = self.get_schedules(start_date=start_date, end_date=end_date)
+        
+        query = self.db.query(ScheduleAssignment)\
+            .join(Schedule, Schedule.id == ScheduleAssignment.schedule_id)\
+            .options(joinedload(ScheduleAssignment.staff))
+        if start_date:
+            query = query.filter(Schedule.schedule_date >= start_date)
+        if end_date:
+            query = query.filter(Schedule.schedule_date <= end_date)
+        
+        grouped = self._group_by_schedule(query.order_by(ScheduleAssignment.id).all())
+        return [s.to_dict(assignments=grouped.get(s.id, [])) for s in schedules]
+    
+    def get_schedules_page(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        after: Optional[Tuple[date, int]] = None,
+        limit: int = 100
+    ) -> Tuple[List[dict], Optional[Tuple[date, int]]]:
+        """
+        Get one page of schedules with assignments using keyset pagination.
+        
+        Pages are ordered by (schedule_date, id); the cost of a page does not
+        depend on how far into the listing it is.
+        
+        Args:
+            start_date: Start date (inclusive)
+            end_date: End date (inclusive)
+            after: (schedule_date, id) of the last schedule of the previous page
+            limit: Maximum number of schedules in the page
+            
+        Returns:
+            Tuple of (schedule dictionaries, key to pass as `after` for the next
+            page or None if this is the last page)
+        """
+        query = self.db.query(Schedule)
+        
+        if start_date:
+            query = query.filter(Schedule.schedule_date >= start_date)
+        if end_date:
+            query = query.filter(Schedule.schedule_date <= end_date)
+        if after:
+            after_date, after_id = after
+            query = query.filter(or_(
+                Schedule.schedule_date > after_date,
+                and_(Schedule.schedule_date == after_date, Schedule.id > after_id)
+            ))
+        
+        schedules = query.order_by(Schedule.schedule_date, Schedule.id).limit(limit).all()
+        if not schedules:
+            return [], None
+        
+        assignments = self.db.query(ScheduleAssignment)\
+            .options(joinedload(ScheduleAssignment.staff))\
+            .filter(ScheduleAssignment.schedule_id.in_([s.id for s in schedules]))\
+            .order_by(ScheduleAssignment.id)\
+            .all()
+        grouped = self._group_by_schedule(assignments)
+        
+        page = [s.to_dict(assignments=grouped.get(s.id, [])) for s in schedules]
+        last = schedules[-1]
+        next_key = (last.schedule_date, last.id) if len(schedules) == limit else None
+        return page, next_key
+    
+    def iter_schedules(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        after: Optional[Tuple[date, int]] = None,
+        chunk_size: int = 200
+    ) -> Iterator[List[dict]]:
+        """
+        Iterate over schedules with assignments in keyset-paginated chunks.
+        
+        Loaded objects are released after every chunk so memory use stays
+        flat regardless of how many schedules are read.
+        
+        Args:
+            start_date: Start date (inclusive)
+            end_date: End date (inclusive)
+            after: (schedule_date, id) to resume after
+            chunk_size: Number of schedules per chunk
+            
+        Yields:
+            Lists of schedule dictionaries
+        """
+        while True:
+            page, after = self.get_schedules_page(
+                start_date=start_date,
+                end_date=end_date,
+                after=after,
+                limit=chunk_size
+            )
+            self.db.expunge_all()
+            if page:
+                yield page
+            if after is None:
+                break
+    
+    def _group_by_schedule(self, assignments: List[ScheduleAssignment]) -> Dict[int, List[ScheduleAssignment]]:
+        """
+        Group assignments by their schedule ID, preserving order.
+        
+        Args:
+            assignments: Assignments to group
+            
+        Returns:
+            Dictionary mapping schedule ID to its assignments
+        """
+        grouped = defaultdict(list)
+        for assignment in assignments:
+            grouped[assignment.schedule_id].append(assignment)
+        return grouped
     
     def get_staff_schedule(self, staff_id: int, start_date: Optional[date] = None, end_date: Optional[date] = None) -> List[ScheduleAssignment]:
         """
@@ -138,11 +312,100 @@ class ScheduleService:
         """
         assignment = self.db.query(ScheduleAssignment).filter(ScheduleAssignment.id == assignment_id).first()
         if assignment:
+            if assignment.status != status:
+                RollupService(self.db).move_status(
+                    {(assignment.duty_date, assignment.staff_id, assignment.shift_type): 1},
+                    old_status=assignment.status,
+                    new_status=status
+                )
+                ChangeTracker(self.db).bump(*ChangeTracker.assignment_keys([assignment.staff_id]))
             assignment.status = status
             self.db.commit()
             return True
         return False
     
+    def bulk_update_assignment_status(
+        self,
+        status: str,
+        assignment_ids: Optional[List[int]] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        shift_type: Optional[str] = None,
+        staff_id: Optional[int] = None
+    ) -> dict:
+        """
+        Update the status of many assignments with a single UPDATE.
+        
+        Filters are combined with AND; rows already in the target status are
+        left untouched.
+        
+        Args:
+            status: New status (scheduled/completed/cancelled)
+            assignment_ids: Only these assignments
+            start_date: Only duties on or after this date
+            end_date: Only duties on or before this date
+            shift_type: Only this shift type
+            staff_id: Only this staff member
+            
+        Returns:
+            Dictionary with the new status and number of updated assignments
+            
+        Raises:
+            ValueError: If no filter is given
+        """
+        conditions = []
+        if assignment_ids is not None:
+            conditions.append(ScheduleAssignment.id.in_(assignment_ids))
+        if start_date:
+            conditions.append(ScheduleAssignment.duty_date >= start_date)
+        if end_date:
+            conditions.append(ScheduleAssignment.duty_date <= end_date)
+        if shift_type:
+            conditions.append(ScheduleAssignment.shift_type == shift_type)
+        if staff_id is not None:
+            conditions.append(ScheduleAssignment.staff_id == staff_id)
+        
+        if not conditions:
+            raise ValueError("At least one filter is required to update assignments in bulk")
+        
+        # NULL counts as a status other than the target
+        conditions.append(or_(ScheduleAssignment.status.is_(None), ScheduleAssignment.status != status))
+        
+        # One UPDATE ... RETURNING per old status, so the rollup moves by
+        # exactly the rows updated even if others change concurrently
+        old_statuses = [
+            old_status for (old_status,) in
+            self.db.query(ScheduleAssignment.status).filter(*conditions).distinct()
+        ]
+        rollups = RollupService(self.db)
+        updated = 0
+        changed_staff = set()
+        for old_status in old_statuses:
+            if old_status is None:
+                has_old_status = ScheduleAssignment.status.is_(None)
+            else:
+                has_old_status = ScheduleAssignment.status == old_status
+            rows = self.db.execute(
+                update(ScheduleAssignment)
+                .where(*conditions, has_old_status)
+                .values(status=status)
+                .returning(ScheduleAssignment.duty_date, ScheduleAssignment.staff_id, ScheduleAssignment.shift_type)
+                .execution_options(synchronize_session=False)
+            ).all()
+            counts = Counter(tuple(row) for row in rows)
+            rollups.move_status(counts, old_status=old_status, new_status=status)
+            changed_staff.update(row_staff_id for _, row_staff_id, _ in counts)
+            updated += len(rows)
+        
+        if updated:
+            ChangeTracker(self.db).bump(*ChangeTracker.assignment_keys(changed_staff))
+        self.db.commit()
+        
+        return {
+            'status': status,
+            'updated': updated
+        }
+    
     def get_schedule_with_assignments(self, schedule_id: int) -> Optional[dict]:
         """
         Get schedule with all its assignments.
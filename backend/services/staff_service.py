@@ -1,8 +1,26 @@
-from typing import List, Optional
+import codecs
+import csv
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 from models.staff import Staff
+from services.change_tracker import ChangeTracker
 
 class StaffService:
+    # Rows inserted per transaction by import_staff
+    IMPORT_BATCH_SIZE = 500
+    # Row errors included in the import report (all are counted)
+    MAX_REPORTED_ERRORS = 1000
+    # Column width of the name and position fields
+    MAX_FIELD_LENGTH = 100
+    # Accepted CSV header labels
+    CSV_FIELDS = {
+        'name': 'name', '姓名': 'name',
+        'age': 'age', '年龄': 'age',
+        'position': 'position', '职位': 'position'
+    }
+    
     def __init__(self, db: Session):
         """
         Initialize StaffService with database session.
@@ -29,10 +47,176 @@ class StaffService:
         """
         staff = Staff(name=name, age=age, position=position)
         self.db.add(staff)
+        ChangeTracker(self.db).bump(ChangeTracker.STAFF)
         self.db.commit()
         self.db.refresh(staff)
         return staff
     
+    def import_staff(self, records: Iterable[Dict[str, Any]]) -> Dict:
+        """
+        Add many staff members with batched validation and inserts.
+        
+        Each record is checked against the Staff validation rules; valid
+        records are written with one multi-row insert per batch and
+        invalid ones are reported without aborting the import.
+        
+        Args:
+            records: Mappings with name, age and position
+        
+        Returns:
+            Import report: row and error counts, the new ID of each row
+            (None for rows that failed) and per-row errors
+        """
+        report = {
+            'rows': 0,
+            'created': 0,
+            'error_count': 0,
+            'ids': [],
+            'errors': []
+        }
+        
+        batch = []
+        for row_number, record in enumerate(records, start=1):
+            report['rows'] += 1
+            report['ids'].append(None)
+            try:
+                batch.append((row_number, self._parse_staff_record(record)))
+            except ValueError as e:
+                self._add_import_error(report, row_number, str(e))
+            
+            if len(batch) >= self.IMPORT_BATCH_SIZE:
+                self._insert_staff_batch(batch, report)
+                batch = []
+        
+        if batch:
+            self._insert_staff_batch(batch, report)
+        return report
+    
+    def import_staff_csv(self, file: IO[bytes]) -> Dict:
+        """
+        Add staff members from a CSV file.
+        
+        The header row names the columns (name, age, position or
+        姓名, 年龄, 职位); extra columns are ignored.
+        
+        Args:
+            file: Binary UTF-8 CSV file
+        
+        Returns:
+            Import report as returned by import_staff (row numbers count
+            data rows)
+        
+        Raises:
+            ValueError: If the file is not UTF-8 or the header row lacks a
+                required column
+        """
+        # Rows are decoded lazily while batches are committed, so reject
+        # bad encodings before anything is written
+        self._check_utf8(file)
+        reader = csv.reader(codecs.iterdecode(file, 'utf-8-sig'))
+        header = next(reader, None) or []
+        columns = {}
+        for index, label in enumerate(header):
+            field = self.CSV_FIELDS.get(label.strip().lower())
+            if field:
+                columns.setdefault(field, index)
+        
+        missing = [field for field in ('name', 'age', 'position') if field not in columns]
+        if missing:
+            raise ValueError(f"CSV header is missing column(s): {', '.join(missing)}")
+        
+        return self.import_staff(self._iter_csv_records(reader, columns))
+    
+    def _check_utf8(self, file: IO[bytes]):
+        """
+        Decode a whole seekable file once and rewind it.
+        
+        Raises:
+            ValueError: If the file is not valid UTF-8
+        """
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        try:
+            for chunk in iter(lambda: file.read(64 * 1024), b''):
+                decoder.decode(chunk)
+            decoder.decode(b'', final=True)
+        except UnicodeDecodeError:
+            raise ValueError("CSV file must be UTF-8 encoded")
+        finally:
+            file.seek(0)
+    
+    def _iter_csv_records(self, reader: Iterator[List[str]], columns: Dict[str, int]) -> Iterator[Dict[str, str]]:
+        """Map CSV rows to staff records, skipping blank lines."""
+        for values in reader:
+            if not any(value.strip() for value in values):
+                continue
+            yield {field: values[index].strip() if index < len(values) else "" for field, index in columns.items()}
+    
+    def _parse_staff_record(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Coerce and validate one import record.
+        
+        Args:
+            record: Mapping with name, age and position
+        
+        Returns:
+            Column values for the insert
+        
+        Raises:
+            ValueError: If the record is invalid
+        """
+        if not isinstance(record, dict):
+            raise ValueError("Record must be an object")
+        
+        name, age, position = record.get('name'), record.get('age'), record.get('position')
+        if name is not None and not isinstance(name, str):
+            raise ValueError("Name must be text")
+        if position is not None and not isinstance(position, str):
+            raise ValueError("Position must be text")
+        
+        if isinstance(age, str) and age.strip().lstrip('-').isdigit():
+            age = int(age.strip())
+        if isinstance(age, bool) or not isinstance(age, int):
+            raise ValueError(f"Age must be an integer: {age}")
+        
+        Staff.validate_fields(name, age, position)
+        if len(name) > self.MAX_FIELD_LENGTH or len(position) > self.MAX_FIELD_LENGTH:
+            raise ValueError(f"Name and position must be at most {self.MAX_FIELD_LENGTH} characters")
+        return {'name': name, 'age': age, 'position': position}
+    
+    def _insert_staff_batch(self, batch: List[Tuple[int, Dict[str, Any]]], report: Dict):
+        """
+        Insert one batch of validated records in a single transaction.
+        
+        Args:
+            batch: (row number, column values) pairs
+            report: Import report to update
+        """
+        try:
+            # IDs are allocated in VALUES order but RETURNING order is not
+            # guaranteed; asking SQLAlchemy to sort makes SQLite insert
+            # row by row, so sort the IDs instead
+            ids = sorted(self.db.execute(
+                insert(Staff).returning(Staff.id),
+                [values for _, values in batch]
+            ).scalars())
+            ChangeTracker(self.db).bump(ChangeTracker.STAFF)
+            self.db.commit()
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            for row_number, _ in batch:
+                self._add_import_error(report, row_number, f"Batch failed: {e.__class__.__name__}")
+            return
+        
+        for (row_number, _), staff_id in zip(batch, ids):
+            report['ids'][row_number - 1] = staff_id
+        report['created'] += len(ids)
+    
+    def _add_import_error(self, report: Dict, row_number: int, message: str):
+        """Record a row error, keeping at most MAX_REPORTED_ERRORS details."""
+        report['error_count'] += 1
+        if len(report['errors']) < self.MAX_REPORTED_ERRORS:
+            report['errors'].append({'row': row_number, 'error': message})
+    
     def delete_staff(self, staff_id: int) -> bool:
         """
         Delete (soft delete) a staff member.
@@ -46,6 +230,7 @@ class StaffService:
         staff = self.get_staff_by_id(staff_id)
         if staff:
             staff.soft_delete()
+            ChangeTracker(self.db).bump(ChangeTracker.STAFF)
             self.db.commit()
             return True
         return False
@@ -0,0 +1,132 @@
+"""
+Statistics Cache - Version-aware LRU cache in front of StatisticsService.
+Entries are keyed by (endpoint, start_date, end_date) and are only served
+while the data version they were computed at is still current.
+"""
+import os
+import threading
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from services.change_tracker import ChangeTracker
+from services.statistics_service import StatisticsService
+
+class StatisticsCache:
+    """
+    Thread-safe LRU cache whose entries carry the data version they were
+    computed at.
+    """
+    
+    def __init__(self, max_entries: int = 256):
+        """
+        Initialize StatisticsCache.
+        
+        Args:
+            max_entries: Maximum number of cached results
+        """
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[Hashable, Tuple[Tuple[int, ...], Any]]" = OrderedDict()
+        self.lock = threading.Lock()
+    
+    def get(self, key: Hashable, version: Tuple[int, ...]) -> Optional[Any]:
+        """
+        Get a cached result if it was computed at the given version.
+        
+        Args:
+            key: Cache key
+            version: Current data version
+        
+        Returns:
+            Cached result or None on a miss
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] != version:
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return entry[1]
+    
+    def put(self, key: Hashable, version: Tuple[int, ...], value: Any):
+        """
+        Store a result computed at the given version.
+        
+        Args:
+            key: Cache key
+            version: Data version the value was computed at
+            value: Result to cache
+        """
+        with self.lock:
+            self.entries[key] = (version, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+    
+    def clear(self):
+        """Remove all entries."""
+        with self.lock:
+            self.entries.clear()
+
+statistics_cache = StatisticsCache(max_entries=int(os.getenv('STATISTICS_CACHE_SIZE', 256)))
+
+class CachedStatisticsService:
+    """
+    StatisticsService with results cached per (endpoint, date range).
+    The data version is read first, so a result is never cached under a
+    version older than the data it was computed from.
+    """
+    
+    DEPENDS_ON = (ChangeTracker.ASSIGNMENT, ChangeTracker.STAFF)
+    
+    def __init__(self, db: Session, cache: StatisticsCache = statistics_cache):
+        """
+        Initialize CachedStatisticsService with database session.
+        
+        Args:
+            db: Database session
+            cache: Cache to use
+        """
+        self.service = StatisticsService(db)
+        self.tracker = ChangeTracker(db)
+        self.cache = cache
+    
+    def get_duty_statistics(self, start_date: date = None, end_date: date = None) -> Dict:
+        """Cached StatisticsService.get_duty_statistics."""
+        return self._cached('duty', start_date, end_date, self.service.get_duty_statistics)
+    
+    def get_staff_workload(self, start_date: date = None, end_date: date = None) -> List[Dict]:
+        """Cached StatisticsService.get_staff_workload."""
+        return self._cached('workload', start_date, end_date, self.service.get_staff_workload)
+    
+    def get_shift_distribution(self, start_date: date = None, end_date: date = None) -> Dict:
+        """Cached StatisticsService.get_shift_distribution."""
+        return self._cached('shifts', start_date, end_date, self.service.get_shift_distribution)
+    
+    def get_comprehensive_report(self, start_date: date = None, end_date: date = None) -> Dict:
+        """Cached StatisticsService.get_comprehensive_report."""
+        return self._cached('comprehensive', start_date, end_date, self.service.get_comprehensive_report)
+    
+    def _cached(self, endpoint: str, start_date: Optional[date], end_date: Optional[date], compute: Callable) -> Any:
+        """
+        Serve a result from the cache or compute and store it.
+        
+        Args:
+            endpoint: Endpoint name used in the cache key
+            start_date: Start date for analysis
+            end_date: End date for analysis
+            compute: StatisticsService method to call on a miss
+        
+        Returns:
+            Statistics result
+        """
+        version = self.tracker.version(*self.DEPENDS_ON)
+        key = (endpoint, start_date, end_date)
+        
+        result = self.cache.get(key, version)
+        if result is None:
+            result = compute(start_date, end_date)
+            self.cache.put(key, version, result)
+        return result
@@ -1,14 +1,16 @@
 from typing import Dict, List
+from collections import defaultdict
 from datetime import date
 from sqlalchemy.orm import Session
 from sqlalchemy import func
-from models.schedule_assignment import ScheduleAssignment
+from models.duty_rollup import DailyDutyRollup
 from models.staff import Staff
 
 class StatisticsService:
     """
     Service class for statistics and analytics.
     Provides insights into duty schedules and workload.
+    Reads the daily duty rollup instead of scanning raw assignments.
     """
     
     def __init__(self, db: Session):
@@ -31,25 +33,18 @@ class StatisticsService:
         Returns:
             Dictionary with duty statistics
         """
-        query = self.db.query(ScheduleAssignment)
-        
-        if start_date:
-            query = query.filter(ScheduleAssignment.duty_date >= start_date)
-        if end_date:
-            query = query.filter(ScheduleAssignment.duty_date <= end_date)
-        
-        total_assignments = query.count()
+        query = self._filter_dates(self.db.query(
+            DailyDutyRollup.status,
+            func.sum(DailyDutyRollup.assignment_count)
+        ), start_date, end_date)
         
         # Count by status
-        status_counts = query.with_entities(
-            ScheduleAssignment.status,
-            func.count(ScheduleAssignment.id)
-        ).group_by(ScheduleAssignment.status).all()
+        status_counts = query.group_by(DailyDutyRollup.status).all()
         
-        status_dist = {status: count for status, count in status_counts}
+        status_dist = {status: int(count) for status, count in status_counts}
         
         return {
-            'total_assignments': total_assignments,
+            'total_assignments': sum(status_dist.values()),
             'status_distribution': status_dist,
             'date_range': {
                 'start': start_date.isoformat() if start_date else None,
@@ -72,17 +67,14 @@ class StatisticsService:
             Staff.id,
             Staff.name,
             Staff.position,
-            func.count(ScheduleAssignment.id).label('shift_count')
+            func.sum(DailyDutyRollup.assignment_count).label('shift_count')
         ).join(
-            ScheduleAssignment, Staff.id == ScheduleAssignment.staff_id
+            DailyDutyRollup, Staff.id == DailyDutyRollup.staff_id
         ).filter(
             Staff.is_active == True
         )
         
-        if start_date:
-            query = query.filter(ScheduleAssignment.duty_date >= start_date)
-        if end_date:
-            query = query.filter(ScheduleAssignment.duty_date <= end_date)
+        query = self._filter_dates(query, start_date, end_date)
         
         workload = query.group_by(Staff.id, Staff.name, Staff.position).all()
         
@@ -91,7 +83,7 @@ class StatisticsService:
                 'staff_id': staff_id,
                 'name': name,
                 'position': position,
-                'shift_count': shift_count
+                'shift_count': int(shift_count)
             }
             for staff_id, name, position, shift_count in workload
         ]
@@ -107,26 +99,42 @@ class StatisticsService:
         Returns:
             Dictionary with shift type distribution
         """
-        query = self.db.query(
-            ScheduleAssignment.shift_type,
-            func.count(ScheduleAssignment.id)
-        )
-        
-        if start_date:
-            query = query.filter(ScheduleAssignment.duty_date >= start_date)
-        if end_date:
-            query = query.filter(ScheduleAssignment.duty_date <= end_date)
+        query = self._filter_dates(self.db.query(
+            DailyDutyRollup.shift_type,
+            func.sum(DailyDutyRollup.assignment_count)
+        ), start_date, end_date)
         
-        shift_counts = query.group_by(ScheduleAssignment.shift_type).all()
+        shift_counts = query.group_by(DailyDutyRollup.shift_type).all()
         
         return {
-            shift_type: count for shift_type, count in shift_counts
+            shift_type: int(count) for shift_type, count in shift_counts
         }
     
+    def _filter_dates(self, query, start_date: date = None, end_date: date = None):
+        """
+        Restrict a rollup query to a date range.
+        
+        Args:
+            query: Query over DailyDutyRollup
+            start_date: Start date (inclusive)
+            end_date: End date (inclusive)
+            
+        Returns:
+            Filtered query
+        """
+        if start_date:
+            query = query.filter(DailyDutyRollup.duty_date >= start_date)
+        if end_date:
+            query = query.filter(DailyDutyRollup.duty_date <= end_date)
+        return query
+    
     def get_comprehensive_report(self, start_date: date = None, end_date: date = None) -> Dict:
         """
         Get comprehensive statistics report.
         
+        All sections are computed from a single grouped query over the
+        rollup instead of one query per section.
+        
         Args:
             start_date: Start date for analysis
             end_date: End date for analysis
@@ -134,8 +142,57 @@ class StatisticsService:
         Returns:
             Dictionary with comprehensive statistics
         """
+        # Aggregate the rollup first, then join the (small) grouped result to staff
+        grouped = self._filter_dates(self.db.query(
+            DailyDutyRollup.staff_id,
+            DailyDutyRollup.shift_type,
+            DailyDutyRollup.status,
+            func.sum(DailyDutyRollup.assignment_count).label('assignment_count')
+        ), start_date, end_date).group_by(
+            DailyDutyRollup.staff_id,
+            DailyDutyRollup.shift_type,
+            DailyDutyRollup.status
+        ).subquery()
+        
+        rows = self.db.query(
+            grouped.c.staff_id,
+            Staff.name,
+            Staff.position,
+            Staff.is_active,
+            grouped.c.shift_type,
+            grouped.c.status,
+            grouped.c.assignment_count
+        ).outerjoin(
+            Staff, Staff.id == grouped.c.staff_id
+        ).all()
+        
+        status_dist = defaultdict(int)
+        shift_dist = defaultdict(int)
+        workload = {}
+        
+        for staff_id, name, position, is_active, shift_type, status, count in rows:
+            count = int(count)
+            status_dist[status] += count
+            shift_dist[shift_type] += count
+            if is_active:
+                if staff_id not in workload:
+                    workload[staff_id] = {
+                        'staff_id': staff_id,
+                        'name': name,
+                        'position': position,
+                        'shift_count': 0
+                    }
+                workload[staff_id]['shift_count'] += count
+        
         return {
-            'duty_statistics': self.get_duty_statistics(start_date, end_date),
-            'staff_workload': self.get_staff_workload(start_date, end_date),
-            'shift_distribution': self.get_shift_distribution(start_date, end_date)
+            'duty_statistics': {
+                'total_assignments': sum(status_dist.values()),
+                'status_distribution': dict(status_dist),
+                'date_range': {
+                    'start': start_date.isoformat() if start_date else None,
+                    'end': end_date.isoformat() if end_date else None
+                }
+            },
+            'staff_workload': [workload[staff_id] for staff_id in sorted(workload)],
+            'shift_distribution': dict(shift_dist)
         }
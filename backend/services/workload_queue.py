@@ -0,0 +1,172 @@
+"""
+Workload Queue - Incremental fair staff selection for the auto-scheduler.
+Keeps staff bucketed by workload so each shift is filled in O(k log S).
+"""
+import heapq
+from typing import Dict, List, Optional
+from models.staff import Staff
+
+class _FenwickSet:
+    """
+    Set of roster indices backed by a Fenwick (binary indexed) tree.
+    Supports insert, remove and "k-th smallest index" in O(log S).
+    """
+    
+    def __init__(self, size: int, members: Optional[List[int]] = None):
+        """
+        Initialize the set.
+        
+        Args:
+            size: Number of roster positions
+            members: Initial member indices (built in O(S))
+        """
+        self.size = size
+        self.count = 0
+        self.tree = [0] * (size + 1)
+        self.top_bit = 1 << (size.bit_length() - 1) if size else 0
+        
+        if members:
+            for index in members:
+                self.tree[index + 1] += 1
+            for i in range(1, size + 1):
+                parent = i + (i & -i)
+                if parent <= size:
+                    self.tree[parent] += self.tree[i]
+            self.count = len(members)
+    
+    def _update(self, index: int, delta: int):
+        i = index + 1
+        while i <= self.size:
+            self.tree[i] += delta
+            i += i & -i
+        self.count += delta
+    
+    def add(self, index: int):
+        """Insert a roster index."""
+        self._update(index, 1)
+    
+    def remove(self, index: int):
+        """Remove a roster index."""
+        self._update(index, -1)
+    
+    def kth(self, k: int) -> int:
+        """
+        Find the k-th smallest member (0-based).
+        
+        Args:
+            k: Rank of the member
+        
+        Returns:
+            Roster index of the member
+        """
+        position = 0
+        remaining = k + 1
+        bit = self.top_bit
+        while bit:
+            step = position + bit
+            if step <= self.size and self.tree[step] < remaining:
+                position = step
+                remaining -= self.tree[step]
+            bit >>= 1
+        return position
+
+class WorkloadQueue:
+    """
+    Bucket queue of staff keyed on workload.
+    
+    Each workload level holds its staff in roster order, and a min-heap of
+    levels gives the least-worked bucket. Selection follows the original
+    fairness rule: least-worked staff first in roster order, rotating through
+    the least-worked group when it has more members than needed.
+    """
+    
+    def __init__(self, staff_list: List[Staff], workload: Optional[Dict[int, int]] = None):
+        """
+        Initialize the queue.
+        
+        Args:
+            staff_list: Staff to select from, in roster order
+            workload: Starting workload per staff ID (defaults to zero)
+        """
+        self.staff_list = staff_list
+        self.loads = [workload.get(staff.id, 0) if workload else 0 for staff in staff_list]
+        self.buckets: Dict[int, _FenwickSet] = {}
+        self.levels: List[int] = []
+        
+        members_by_level: Dict[int, List[int]] = {}
+        for index, load in enumerate(self.loads):
+            members_by_level.setdefault(load, []).append(index)
+        for load, members in members_by_level.items():
+            self.buckets[load] = _FenwickSet(len(staff_list), members)
+            heapq.heappush(self.levels, load)
+    
+    def select(self, count: int, shift_day_index: int) -> List[Staff]:
+        """
+        Select staff for one shift and add one shift to their workload.
+        
+        Args:
+            count: Number of staff to select
+            shift_day_index: Index of current shift for rotation
+        
+        Returns:
+            List of selected Staff objects
+        """
+        min_level = self._min_level()
+        min_bucket = self.buckets[min_level]
+        
+        if min_bucket.count > count:
+            # Rotate through the least-worked group based on shift index
+            offset = shift_day_index % min_bucket.count
+            selected = [min_bucket.kth((offset + j) % min_bucket.count) for j in range(count)]
+        else:
+            selected = self._take_in_order(count)
+        
+        for index in selected:
+            self._move(index, self.loads[index] + 1)
+        
+        return [self.staff_list[index] for index in selected]
+    
+    def workload(self) -> Dict[int, int]:
+        """
+        Get the current workload per staff ID.
+        
+        Returns:
+            Dictionary mapping staff ID to number of shifts
+        """
+        return {staff.id: load for staff, load in zip(self.staff_list, self.loads)}
+    
+    def _min_level(self) -> int:
+        """Return the lowest non-empty workload level, dropping stale heap entries."""
+        while self.levels[0] not in self.buckets:
+            heapq.heappop(self.levels)
+        return self.levels[0]
+    
+    def _take_in_order(self, count: int) -> List[int]:
+        """Take up to `count` staff by (workload, roster position)."""
+        selected = []
+        popped = []
+        while len(selected) < count and self.levels:
+            level = heapq.heappop(self.levels)
+            bucket = self.buckets.get(level)
+            if bucket is None or level in popped:
+                continue
+            popped.append(level)
+            needed = min(count - len(selected), bucket.count)
+            selected.extend(bucket.kth(j) for j in range(needed))
+        for level in popped:
+            heapq.heappush(self.levels, level)
+        return selected
+    
+    def _move(self, index: int, new_level: int):
+        """Move a staff member from their current workload bucket to another."""
+        old_level = self.loads[index]
+        bucket = self.buckets[old_level]
+        bucket.remove(index)
+        if bucket.count == 0:
+            del self.buckets[old_level]
+        
+        if new_level not in self.buckets:
+            self.buckets[new_level] = _FenwickSet(len(self.staff_list))
+            heapq.heappush(self.levels, new_level)
+        self.buckets[new_level].add(index)
+        self.loads[index] = new_level